@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+
+
+class MetricAccumulator(ABC):
+    """
+    Base class for streaming (corpus level) metrics.
+    ------------------------------------------------
+    An accumulator only keeps additive counts, so:
+        -> update() is O(1) per audio
+        -> value is available at any time during a sweep
+        -> accumulators built in different worker processes
+           can be merged (merge / +) or shipped as plain dicts
+    """
+
+    # names of the additive counters kept by the subclass
+    FIELDS = ()
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self.count = 0
+
+    @abstractmethod
+    def update(self, *args, **kwargs):
+        pass
+
+    @property
+    @abstractmethod
+    def value(self) -> float:
+        pass
+
+    # ---------- MERGING ----------
+
+    def merge(self, other: "MetricAccumulator"):
+        """
+        Add the counters of another accumulator (same type) into this one.
+        """
+        if type(other) is not type(self):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}"
+            )
+
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.count += other.count
+
+        return self
+
+    def __add__(self, other: "MetricAccumulator"):
+        result = type(self)()
+        result.merge(self)
+        result.merge(other)
+        return result
+
+    # ---------- SERIALISATION ----------
+
+    def to_dict(self) -> dict:
+        state = {field: getattr(self, field) for field in self.FIELDS}
+        state["count"] = self.count
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        acc = cls()
+        for field in cls.FIELDS:
+            setattr(acc, field, state.get(field, 0))
+        acc.count = state.get("count", 0)
+        return acc
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)}" for f in self.FIELDS)
+        return f"{type(self).__name__}({fields}, count={self.count})"
@@ -0,0 +1,33 @@
+from analyser.base.metric_accumulator import MetricAccumulator
+
+
+class DERAccumulator(MetricAccumulator):
+    """
+    Corpus DER from per audio breakdowns.
+    -------------------------------------
+    DER = (Missed + FalseAlarm + Confusion) / TotalSpeech
+    with every term summed over all audios.
+    """
+
+    FIELDS = ("missed", "false_alarm", "confusion", "total_speech")
+
+    def update(self, breakdown):
+        """
+        :param breakdown: (missed, false_alarm, confusion, total_speech)
+                          as returned by DERCalculator.calculate()
+        """
+        missed, false_alarm, confusion, total_speech = breakdown
+
+        self.missed += missed
+        self.false_alarm += false_alarm
+        self.confusion += confusion
+        self.total_speech += total_speech
+        self.count += 1
+
+        return self
+
+    @property
+    def value(self) -> float:
+        if self.total_speech == 0:
+            return 0.0
+        return (self.missed + self.false_alarm + self.confusion) / self.total_speech
@@ -1,6 +1,9 @@
 from itertools import permutations
 from pathlib import Path
+from typing import Optional
+import numpy as np
 from analyser.der.der_io import DERIO
+from analyser.utils.rttm import SegmentTable
 
 
 class DERCalculator:
@@ -11,109 +14,130 @@ class DERCalculator:
 
     def __init__(self):
         """
-        ref_segments = list of dicts:
-        [{"spk":"F", "start":6.29, "end":8.24}, ...]
-
-        hyp_segments = list of dicts:
-        [{"spk":"SPEAKER_00", "start":6.93, "end":7.29}, ...]
+        ref / hyp = SegmentTables:
+        speakers ["F", "M", ...], starts [6.29, ...], ends [8.24, ...]
         """
 
         self.ref = None
         self.hyp = None
+        # (mapped_spk, mapped) of the best permutation, see calculate()
+        self.best_mapping = None
+
+    def load_inputs(self,ref_path:str ,hyp_path: str, file_id: Optional[str] = None):
+        """
+        ref: transcript_norm.txt or .rttm, hyp: whisperx .json or .rttm
+        (file_id picks one file out of multi-file RTTMs)
+        """
+        self.ref = DERIO.load_reference_table(ref_path, file_id)
+        self.hyp = DERIO.load_hypothesis_table(hyp_path, file_id)
 
-    def load_inputs(self,ref_path:str ,hyp_path: str):
-        self.ref = DERIO.load_reference(ref_path)
-        self.hyp= DERIO.load_hypothesis(hyp_path)
+    def load_tables(self, ref: SegmentTable, hyp: SegmentTable):
+        self.ref = ref
+        self.hyp = hyp
 
 
     # ---------- PUBLIC API ----------
 
     def calculate(self):
 
-        speakers_ref = sorted(list({s["spk"] for s in self.ref}))
-        speakers_hyp = sorted(list({s["spk"] for s in self.hyp}))
+        speakers_ref = sorted(set(self.ref.speakers.tolist()))
+        speakers_hyp = sorted(set(self.hyp.speakers.tolist()))
 
         # if hyp detects extra speakers, keep only first N
         speakers_hyp = speakers_hyp[:len(speakers_ref)]
 
+        # ref x hyp overlaps do not depend on the mapping: compute once
+        overlap = self._overlap_matrix(self.ref, self.hyp)
+
         best_der = 999
+        best_breakdown = None
+        self.best_mapping = None
 
 
         for perm in permutations(speakers_hyp):
 
             mapping = {hyp: ref for hyp, ref in zip(perm, speakers_ref)}
 
-            mapped_hyp = [
-                {
-                    "spk": mapping[h["spk"]],
-                    "start": h["start"],
-                    "end": h["end"]
-                }
-                for h in self.hyp
-                if h["spk"] in mapping
-            ]
+            mapped_spk = np.array([mapping.get(h) for h in self.hyp.speakers.tolist()], dtype=object)
+            mapped = np.array([m is not None for m in mapped_spk], dtype=bool)
 
-            der, breakdown = self._compute_der_score(self.ref, mapped_hyp)
+            der, breakdown = self._compute_der_score(overlap, mapped_spk, mapped)
 
             if der < best_der:
                 best_der = der
+                best_breakdown = breakdown
+                self.best_mapping = (mapped_spk, mapped)
+
 
+        return round(best_der, 4),best_breakdown
 
-        return round(best_der, 4),breakdown
 
 
+    def attribute(self):
+        """
+        Error seconds per reference segment under the best mapping of
+        calculate(): {"missed", "false_alarm", "confusion", "duration"}
+        arrays aligned with self.ref. Missed and confusion belong to the
+        segment they occur in; false alarm lies outside every segment
+        by definition and is charged to the segment closest in time to
+        the hyp turn producing it. Each column sums to the calculate()
+        breakdown.
+        """
+        if self.best_mapping is None:
+            raise RuntimeError("attribute() needs calculate() first")
+
+        mapped_spk, mapped = self.best_mapping
+        overlap = self._overlap_matrix(self.ref, self.hyp)
+
+        same = (self.ref.speakers[:, None] == mapped_spk[None, :]) & mapped[None, :]
+        other = ~same & mapped[None, :]
+        overlap_same = (overlap * same).sum(axis=1)
+        overlap_other = (overlap * other).sum(axis=1)
+
+        missed = np.maximum(0, self.ref.durations - overlap_same - overlap_other)
+
+        # interval join of every false alarm turn to its nearest ref segment
+        false_alarm = np.zeros(len(self.ref))
+        hyp_false = np.where(mapped, np.maximum(0, self.hyp.durations - overlap.sum(axis=0)), 0.0)
+        if len(self.ref):
+            gap = np.maximum(0.0, np.maximum(
+                self.ref.starts[:, None] - self.hyp.ends[None, :],
+                self.hyp.starts[None, :] - self.ref.ends[:, None]
+            ))
+            np.add.at(false_alarm, np.argmin(gap, axis=0), hyp_false)
+
+        return {
+            "missed": missed,
+            "false_alarm": false_alarm,
+            "confusion": overlap_other,
+            "duration": self.ref.durations,
+        }
 
     # ---------- CORE LOGIC ----------
 
-    def _compute_der_score(self, ref, hyp):
+    def _compute_der_score(self, overlap, mapped_spk, mapped):
 
         """
         DER = (Missed + FalseAlarm + Confusion) / TotalSpeech
+        hyp rows with mapped == False are ignored
         """
+        ref_dur = self.ref.durations
+        hyp_dur = self.hyp.durations
 
-        total_speech = sum(s["end"] - s["start"] for s in ref)
+        total_speech = float(ref_dur.sum())
 
-        missed = 0
-        false_alarm = 0
-        confusion = 0
+        same = (self.ref.speakers[:, None] == mapped_spk[None, :]) & mapped[None, :]
+        other = ~same & mapped[None, :]
 
-        for r in ref:
-            overlap_same = 0
-            overlap_other = 0
+        overlap_same = (overlap * same).sum(axis=1)
+        overlap_other = (overlap * other).sum(axis=1)
 
-            for h in hyp:
-
-                overlap = self._overlap(
-                    r["start"], r["end"],
-                    h["start"], h["end"]
-                )
-
-                if overlap <= 0:
-                    continue
-
-                if r["spk"] == h["spk"]:
-                    overlap_same += overlap
-                else:
-                    overlap_other += overlap
-
-            ref_duration = r["end"] - r["start"]
-
-            missed += max(0, ref_duration - overlap_same - overlap_other)
-            confusion += overlap_other
+        missed = float(np.maximum(0, ref_dur - overlap_same - overlap_other).sum())
+        confusion = float(overlap_other.sum())
 
         # False alarm = hyp speech outside any ref speech
-        for h in hyp:
-            hyp_dur = h["end"] - h["start"]
-
-            overlap_total = sum(
-                max(0, self._overlap(
-                    h["start"], h["end"],
-                    r["start"], r["end"]
-                ))
-                for r in ref
-            )
-
-            false_alarm += max(0, hyp_dur - overlap_total)
+        overlap_total = overlap[:, mapped].sum(axis=0)
+        false_alarm = float(np.maximum(0, hyp_dur[mapped] - overlap_total).sum())
 
         der = (missed + false_alarm + confusion) / total_speech
 
@@ -125,5 +149,10 @@ class DERCalculator:
 
     # ---------- HELPERS ----------
 
-    def _overlap(self, s1, e1, s2, e2):
-        return max(0.0, min(e1, e2) - max(s1, s2))
+    @staticmethod
+    def _overlap_matrix(ref: SegmentTable, hyp: SegmentTable) -> np.ndarray:
+        return np.maximum(
+            0.0,
+            np.minimum(ref.ends[:, None], hyp.ends[None, :])
+            - np.maximum(ref.starts[:, None], hyp.starts[None, :])
+        )
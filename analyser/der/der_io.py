@@ -1,20 +1,65 @@
 from pathlib import Path
+from typing import List, Optional
 import json
 
+from analyser.utils.rttm import RTTM, SegmentTable
+
 class DERIO:
 
     @staticmethod
-    def load_reference(txt_path: Path):
+    def load_reference(txt_path: Path, file_id: Optional[str] = None):
         """
         Loads reference diarization segments.
         Returns list of dicts:
         [
-        {"speaker": "F", "start": 6.29, "end": 8.23},
+        {"spk": "F", "start": 6.29, "end": 8.23},
         ...
         ]
         """
-        ref_segments = []
+        return DERIO.load_reference_table(txt_path, file_id).to_records()
 
+    @staticmethod
+    def load_hypothesis(json_path: Path, file_id: Optional[str] = None):
+        """
+        Loads whisperx json diarization segments.
+        Assumes each segment has speaker + word timestamps.
+        """
+        return DERIO.load_hypothesis_table(json_path, file_id).to_records()
+
+    # ---------- SEGMENT TABLES ----------
+
+    @staticmethod
+    def load_reference_table(ref_path: Path, file_id: Optional[str] = None) -> SegmentTable:
+        """
+        IEMOCAP transcript_norm.txt or RTTM (speaker = gender F / M)
+        """
+        ref_path = Path(ref_path)
+        if ref_path.suffix.lower() == ".rttm":
+            return DERIO._rttm_table(ref_path, file_id)
+
+        file_ids, starts, ends, speakers = [], [], [], []
+
+        for utt_id, start, end in DERIO._transcript_rows(ref_path):
+            spk_code = utt_id.split("_")[-1]     # F000 → F
+            speakers.append(spk_code[0])         # take gender only
+            file_ids.append(utt_id.rsplit("_", 1)[0])
+            starts.append(start)
+            ends.append(end)
+
+        return SegmentTable(file_ids, starts, ends, speakers)
+
+    @staticmethod
+    def load_reference_ids(txt_path: Path) -> List[str]:
+        """
+        Utterance id of every row of load_reference_table (same order)
+        """
+        return [utt_id for utt_id, _, _ in DERIO._transcript_rows(txt_path)]
+
+    @staticmethod
+    def _transcript_rows(txt_path: Path):
+        """
+        (utt_id, start, end) of the timed lines of a transcript_norm.txt
+        """
         with open(txt_path, "r") as f:
             for line in f:
                 parts = line.strip().split()
@@ -28,50 +73,26 @@ class DERIO:
                 if start == 0 and end == 0:
                     continue
 
-                spk_code = parts[0].split("_")[-1]   # F000 → F
-                speaker = spk_code[0]                # take gender only
-
-                ref_segments.append({
-                    "speaker": speaker,
-                    "start": start,
-                    "end": end
-                })
-
-        return ref_segments
-
+                yield parts[0], start, end
 
     @staticmethod
-    def load_hypothesis(json_path: Path):
+    def load_hypothesis_table(hyp_path: Path, file_id: Optional[str] = None) -> SegmentTable:
         """
-        Loads whisperx json diarization segments.
-        Assumes each segment has speaker + word timestamps.
+        whisperx result json or RTTM (e.g. an external diarization)
         """
-        hyp_segments = []
-
-        with open(json_path, "r") as f:
-            data = json.load(f)
-
-        for seg in data["segments"]:
-            speaker = seg.get("speaker", None)
+        hyp_path = Path(hyp_path)
+        if hyp_path.suffix.lower() == ".rttm":
+            return DERIO._rttm_table(hyp_path, file_id)
 
-            if not speaker:
-                continue
+        return RTTM.from_whisperx(hyp_path, file_id)
 
-            # use word-level timestamps if available
-            if "words" in seg and seg["words"]:
-                start = seg["words"][0]["start"]
-                end = seg["words"][-1]["end"]
-            else:
-                start = seg["start"]
-                end = seg["end"]
-
-            if start ==0 and end == 0:
-                continue
-
-            hyp_segments.append({
-                "speaker": speaker,
-                "start": float(start),
-                "end": float(end)
-            })
-
-        return hyp_segments
+    @staticmethod
+    def _rttm_table(rttm_path: Path, file_id: Optional[str]) -> SegmentTable:
+        table = RTTM.read(rttm_path)
+        if file_id is not None:
+            return table.for_file(file_id)
+
+        files = table.files()
+        if len(files) > 1:
+            raise ValueError(f"{rttm_path} holds {len(files)} files, pass file_id")
+        return table
@@ -1,48 +1,19 @@
-import json
 from pathlib import Path
 
 
 class DERPreprocessor:
 
-    @staticmethod
-    def load_reference(ref_path: Path):
-        """
-        Loads reference txt format:
-        speaker   start   end   text
-        """
-
-        segments = []
-
-        with open(ref_path) as f:
-            for line in f:
-                p = line.strip().split()
-
-                spk = p[0]
-                start = float(p[1])
-                end = float(p[2])
-
-                if start == 0 and end == 0:
-                    continue
-
-                segments.append({
-                    "spk": spk[7],   # F/M
-                    "start": start,
-                    "end": end
-                })
-
-        return segments
-
-
-
     @staticmethod
     def load_hypothesis(json_path: Path):
 
-        with open(json_path) as f:
-            data = json.load(f)
+        from analyser.utils.hypothesis_file import HypothesisFile
 
         segments = []
 
-        for seg in data["segments"]:
+        with HypothesisFile.open(json_path) as hypothesis:
+            hyp_segments = hypothesis.segments()
+
+        for seg in hyp_segments:
 
             if not seg["words"]:
                 continue
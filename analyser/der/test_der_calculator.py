@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from analyser.der.der_calculator import DERCalculator
+from analyser.der.der_io import DERIO
+from analyser.utils.rttm import SegmentTable
+
+DIALOG = "Ses01F_impro01"
+
+
+def _random_hypothesis(reference, seed):
+    """
+    Reference turns jittered, some relabelled, dropped or extra, and a
+    third speaker label
+    """
+    rng = np.random.default_rng(seed)
+    keep = rng.random(len(reference)) > 0.15
+    starts = reference.starts[keep] + rng.normal(0, 0.4, keep.sum())
+    ends = np.maximum(starts + 0.1, reference.ends[keep] + rng.normal(0, 0.4, keep.sum()))
+    names = {"F": "SPEAKER_00", "M": "SPEAKER_01"}
+    speakers = [names[s] if rng.random() > 0.1 else rng.choice(["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"])
+                for s in reference.speakers[keep]]
+
+    extra = rng.uniform(0, reference.ends.max() + 20, size=(5, 1)) + [0, 1.5]
+    return SegmentTable(["d"] * (len(starts) + 5),
+                        np.r_[starts, extra[:, 0]], np.r_[ends, extra[:, 1]],
+                        speakers + ["SPEAKER_01"] * 5)
+
+
+def _attributed(reference, hypothesis):
+    calculator = DERCalculator()
+    calculator.load_tables(reference, hypothesis)
+    der, breakdown = calculator.calculate()
+    return calculator, breakdown, calculator.attribute()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_attribution_columns_sum_to_breakdown(seed, dataset_dir):
+    reference = DERIO.load_reference_table(dataset_dir / DIALOG / "transcript_norm.txt")
+    calculator, breakdown, errors = _attributed(reference, _random_hypothesis(reference, seed))
+
+    missed, false_alarm, confusion, total = breakdown
+    assert errors["missed"].sum() == pytest.approx(missed)
+    assert errors["false_alarm"].sum() == pytest.approx(false_alarm)
+    assert errors["confusion"].sum() == pytest.approx(confusion)
+    assert errors["duration"].sum() == pytest.approx(total)
+    assert all(len(column) == len(reference) for column in errors.values())
+
+
+def test_false_alarm_goes_to_nearest_segment():
+    reference = SegmentTable(["d"] * 2, [0.0, 10.0], [2.0, 12.0], ["F", "M"])
+    hypothesis = SegmentTable(["d"] * 3, [0.0, 10.0, 8.0], [2.0, 12.0, 9.0], ["A", "B", "B"])
+    _, breakdown, errors = _attributed(reference, hypothesis)
+
+    assert breakdown[1] == pytest.approx(1.0)
+    assert errors["false_alarm"].tolist() == [0.0, 1.0]
+    assert errors["missed"].tolist() == [0.0, 0.0]
+
+
+def test_attribute_needs_calculate():
+    with pytest.raises(RuntimeError):
+        DERCalculator().attribute()
@@ -0,0 +1,68 @@
+from analyser.wer.wer_accumulator import WERAccumulator
+from analyser.der.der_accumulator import DERAccumulator
+from analyser.rtf.rtf_accumulator import RTFAccumulator
+
+
+class OverallAccumulator:
+    """
+    Bundles the WER / DER / RTF accumulators of one config.
+    -------------------------------------------------------
+    Updated once per audio; snapshot() gives the running
+    overall scores at any point of the sweep. cpWER is summed
+    the same way as WER, over the audios that have it.
+    """
+
+    def __init__(self):
+        self.wer = WERAccumulator()
+        self.der = DERAccumulator()
+        self.rtf = RTFAccumulator()
+        self.cpwer = WERAccumulator()
+
+    def update(self, wer_breakdown, der_breakdown, processing_time, audio_duration,
+               cpwer_breakdown=None):
+        self.wer.update(wer_breakdown)
+        self.der.update(der_breakdown)
+        self.rtf.update(processing_time, audio_duration)
+        if cpwer_breakdown is not None:
+            self.cpwer.update(cpwer_breakdown)
+        return self
+
+    def merge(self, other: "OverallAccumulator"):
+        self.wer.merge(other.wer)
+        self.der.merge(other.der)
+        self.rtf.merge(other.rtf)
+        self.cpwer.merge(other.cpwer)
+        return self
+
+    @property
+    def count(self) -> int:
+        return self.rtf.count
+
+    def snapshot(self) -> dict:
+        """
+        Running overall values (rounded like the Excel sheet).
+        """
+        return {
+            "audios": self.count,
+            "WER": round(self.wer.value, 4),
+            "DER": round(self.der.value, 4),
+            "RTF": round(self.rtf.value, 4),
+            "cpWER": round(self.cpwer.value, 4),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "wer": self.wer.to_dict(),
+            "der": self.der.to_dict(),
+            "rtf": self.rtf.to_dict(),
+            "cpwer": self.cpwer.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        acc = cls()
+        acc.wer = WERAccumulator.from_dict(state.get("wer", {}))
+        acc.der = DERAccumulator.from_dict(state.get("der", {}))
+        acc.rtf = RTFAccumulator.from_dict(state.get("rtf", {}))
+        acc.cpwer = WERAccumulator.from_dict(state.get("cpwer", {}))
+        return acc
@@ -0,0 +1,22 @@
+from analyser.base.metric_accumulator import MetricAccumulator
+
+
+class RTFAccumulator(MetricAccumulator):
+    """
+    Corpus RTF = total processing time / total audio time
+    """
+
+    FIELDS = ("processing_time", "audio_duration")
+
+    def update(self, processing_time: float, audio_duration: float):
+        self.processing_time += processing_time
+        self.audio_duration += audio_duration
+        self.count += 1
+
+        return self
+
+    @property
+    def value(self) -> float:
+        if self.audio_duration == 0:
+            return 0.0
+        return self.processing_time / self.audio_duration
@@ -0,0 +1,25 @@
+from pathlib import Path
+from dataset.audio_info import AudioInfo
+
+
+class RTFCalculator:
+    """
+    Computes Real Time Factor (RTF)
+    RTF = processing_time / audio_duration
+    """
+
+    def calculate(self, audio_path: Path, processing_time: float):
+        """
+        Returns (rtf, audio_duration)
+        """
+        info = AudioInfo(str(audio_path))
+
+        if not info.analyze():
+            raise ValueError(f"Could not read audio duration: {audio_path}")
+
+        if not info.duration:
+            return 0.0, 0.0
+
+        rtf = processing_time / info.duration
+
+        return round(rtf, 4), info.duration
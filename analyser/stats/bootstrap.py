@@ -0,0 +1,287 @@
+import csv
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# metric -> (numerator columns, denominator column) of a results store job row
+METRIC_COLUMNS = {
+    "wer": (("substitutions", "deletions", "insertions"), "ref_words"),
+    "cpwer": (("cp_substitutions", "cp_deletions", "cp_insertions"), "ref_words"),
+    "der": (("missed", "false_alarm", "confusion"), "total_speech"),
+    "rtf": (("processing_time",), "audio_duration"),
+}
+
+
+class ErrorCounts:
+    """
+    Per audio error counts of several configs on the same audios.
+    -------------------------------------------------------------
+    numerators / denominators : (configs x audios) float arrays
+    The corpus metric of a config is sum(numerator) / sum(denominator),
+    exactly like WERAccumulator / DERAccumulator / RTFAccumulator.
+    """
+
+    def __init__(self, metric: str, config_ids: List[str], audio_ids: List[str],
+                 numerators: np.ndarray, denominators: np.ndarray):
+        self.metric = metric
+        self.config_ids = list(config_ids)
+        self.audio_ids = list(audio_ids)
+        self.numerators = np.asarray(numerators, dtype=np.float64)
+        self.denominators = np.asarray(denominators, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows: List[dict], metric: str = "wer",
+                  config_ids: Optional[Sequence[str]] = None) -> "ErrorCounts":
+        """
+        From results store job rows (done only). Keeps the audios every
+        selected config has finished, so all comparisons are paired.
+        Rows of several sweeps name their configs sweep/config (like
+        ParetoReport), the same config id in two sweeps stays two configs.
+        """
+        num_columns, den_column = METRIC_COLUMNS[metric]
+
+        rows = key_by_sweep(rows)
+
+        by_config = {}
+        for row in rows:
+            if row["status"] != "done" or row[den_column] is None:
+                continue
+            # rows stored before cpWER existed have no cp counts
+            if any(row.get(c) is None for c in num_columns):
+                continue
+            if config_ids is not None and row["config_id"] not in config_ids:
+                continue
+            numerator = sum(row[c] for c in num_columns)
+            by_config.setdefault(row["config_id"], {})[row["audio_id"]] = (numerator, row[den_column])
+
+        configs = [c for c in (config_ids or sorted(by_config)) if c in by_config]
+        if not configs:
+            raise ValueError(f"No finished jobs with {metric} counts")
+
+        audios = sorted(set.intersection(*(set(by_config[c]) for c in configs)))
+        dropped = {c: len(by_config[c]) - len(audios) for c in configs if len(by_config[c]) > len(audios)}
+        if dropped:
+            logger.warning("Only the %d audios shared by every config are compared (dropped per config: %s)",
+                           len(audios), dropped)
+
+        counts = np.array([[by_config[c][a] for a in audios] for c in configs], dtype=np.float64)
+        counts = counts.reshape(len(configs), len(audios), 2)
+        return cls(metric, configs, audios, counts[:, :, 0], counts[:, :, 1])
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Corpus metric per config
+        """
+        return _ratio(self.numerators.sum(axis=1), self.denominators.sum(axis=1))
+
+
+class Bootstrap:
+    """
+    Vectorized resampling over audios for every config at once.
+    -----------------------------------------------------------
+    A replicate is a vector of per audio multiplicities (bootstrap)
+    or swap flags (permutation), so the resampled sums of all configs
+    are one (replicates x audios) @ (audios x configs) product instead
+    of a Python loop per config, pair and replicate.
+
+    The same replicates are used for every config, which makes the
+    bootstrap paired: a difference between two configs is resampled
+    on the same audios.
+    """
+
+    def __init__(self, num_replicates: int = 10000, seed: int = 0, chunk: int = 2000):
+        self.num_replicates = num_replicates
+        self.seed = seed
+        # replicates per matrix product, bounds memory on big sweeps
+        self.chunk = chunk
+
+    # ---------- PUBLIC API ----------
+
+    def resample(self, counts: ErrorCounts) -> np.ndarray:
+        """
+        (replicates x configs) corpus metrics on bootstrap resamples
+        """
+        rng = np.random.default_rng(self.seed)
+        num_audios = len(counts.audio_ids)
+
+        out = []
+        for size in self._chunks():
+            picks = rng.integers(0, num_audios, size=(size, num_audios))
+            rows = np.repeat(np.arange(size), num_audios)
+            weights = np.bincount(rows * num_audios + picks.ravel(),
+                                  minlength=size * num_audios).reshape(size, num_audios)
+            out.append(_ratio(weights @ counts.numerators.T, weights @ counts.denominators.T))
+        return np.vstack(out)
+
+    def intervals(self, counts: ErrorCounts, alpha: float = 0.05,
+                  replicates: Optional[np.ndarray] = None) -> List[dict]:
+        """
+        Percentile bootstrap interval of every config's corpus metric
+        """
+        replicates = self.resample(counts) if replicates is None else replicates
+        low, high = np.percentile(replicates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+
+        return [
+            {"config_id": cfg_id, "metric": counts.metric, "value": float(value),
+             "low": float(lo), "high": float(hi), "audios": len(counts.audio_ids)}
+            for cfg_id, value, lo, hi in zip(counts.config_ids, counts.values, low, high)
+        ]
+
+    def paired_tests(self, counts: ErrorCounts, alpha: float = 0.05,
+                     replicates: Optional[np.ndarray] = None) -> List[dict]:
+        """
+        Every config pair (a, b), delta = metric(a) - metric(b):
+            -> paired bootstrap interval of delta and two sided p value
+               (replicates recentred on the null)
+            -> paired permutation p value (per audio swap of a / b)
+            -> Holm adjusted permutation p over all pairs
+        """
+        replicates = self.resample(counts) if replicates is None else replicates
+        flips = self._permutation_sums(counts)
+        observed = counts.values
+        totals_num = counts.numerators.sum(axis=1)
+        totals_den = counts.denominators.sum(axis=1)
+        num_configs = len(counts.config_ids)
+
+        results = []
+        for i in range(num_configs - 1):
+            j = np.arange(i + 1, num_configs)
+            delta = observed[i] - observed[j]
+
+            boot = replicates[:, [i]] - replicates[:, j]
+            low, high = np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+            p_boot = (np.abs(boot - delta) >= np.abs(delta) - 1e-12).mean(axis=0)
+
+            # swapping a / b on the flagged audios moves those counts across
+            p_num, p_den = flips
+            num_i = totals_num[i] - p_num[:, [i]] + p_num[:, j]
+            den_i = totals_den[i] - p_den[:, [i]] + p_den[:, j]
+            num_j = totals_num[j] - p_num[:, j] + p_num[:, [i]]
+            den_j = totals_den[j] - p_den[:, j] + p_den[:, [i]]
+            perm = _ratio(num_i, den_i) - _ratio(num_j, den_j)
+            hits = (np.abs(perm) >= np.abs(delta) - 1e-12).sum(axis=0)
+            p_perm = (hits + 1) / (len(perm) + 1)
+
+            for k, other in enumerate(j):
+                results.append({
+                    "config_a": counts.config_ids[i],
+                    "config_b": counts.config_ids[other],
+                    "metric": counts.metric,
+                    "delta": float(delta[k]),
+                    "low": float(low[k]),
+                    "high": float(high[k]),
+                    "p_bootstrap": float(p_boot[k]),
+                    "p_permutation": float(p_perm[k]),
+                })
+
+        for row, adjusted in zip(results, _holm([r["p_permutation"] for r in results])):
+            row["p_holm"] = adjusted
+        return results
+
+    # ---------- HELPERS ----------
+
+    def _chunks(self):
+        left = self.num_replicates
+        while left > 0:
+            size = min(self.chunk, left)
+            yield size
+            left -= size
+
+    def _permutation_sums(self, counts: ErrorCounts):
+        """
+        Per replicate, the sums of every config's counts over the
+        audios flagged for a swap: (replicates x configs) twice
+        """
+        rng = np.random.default_rng(self.seed + 1)
+        num_audios = len(counts.audio_ids)
+
+        nums, dens = [], []
+        for size in self._chunks():
+            flags = rng.integers(0, 2, size=(size, num_audios)).astype(np.float64)
+            nums.append(flags @ counts.numerators.T)
+            dens.append(flags @ counts.denominators.T)
+        return np.vstack(nums), np.vstack(dens)
+
+
+def _ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def _holm(p_values: List[float]) -> List[float]:
+    p = np.asarray(p_values, dtype=np.float64)
+    if len(p) == 0:
+        return []
+    order = np.argsort(p)
+    adjusted = np.minimum(1.0, np.maximum.accumulate(p[order] * (len(p) - np.arange(len(p)))))
+    out = np.empty_like(adjusted)
+    out[order] = adjusted
+    return out.tolist()
+
+
+def key_by_sweep(rows: List[dict]) -> List[dict]:
+    """
+    Rows of several sweeps with config_id = sweep/config, so a config
+    id reused by two sweeps stays two configs (rows of one sweep, or
+    already keyed, come back unchanged)
+    """
+    if len({row.get("sweep_id") for row in rows}) < 2:
+        return rows
+    return [row if row["config_id"].startswith(f"{row['sweep_id']}/")
+            else dict(row, config_id=f"{row['sweep_id']}/{row['config_id']}") for row in rows]
+
+
+def compare_configs(rows: List[dict],
+                    metric: str = "wer",
+                    config_ids: Optional[Sequence[str]] = None,
+                    num_replicates: int = 10000,
+                    alpha: float = 0.05,
+                    seed: int = 0) -> Dict[str, List[dict]]:
+    """
+    Intervals + pairwise tests of a sweep from results store rows
+    """
+    counts = ErrorCounts.from_rows(rows, metric, config_ids)
+    bootstrap = Bootstrap(num_replicates, seed)
+    replicates = bootstrap.resample(counts)
+    return {
+        "intervals": bootstrap.intervals(counts, alpha, replicates),
+        "pairs": bootstrap.paired_tests(counts, alpha, replicates),
+    }
+
+
+def write_csv(rows: List[dict], csv_path):
+    if not rows:
+        return
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+    from results.results_store import ResultsStore
+
+    parser = argparse.ArgumentParser(description="Bootstrap intervals / paired tests of a sweep")
+    parser.add_argument("store", help="results.sqlite")
+    parser.add_argument("--sweep-id", default=None)
+    parser.add_argument("--metric", default="wer", choices=sorted(METRIC_COLUMNS))
+    parser.add_argument("--replicates", type=int, default=10000)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--out-prefix", default="stats")
+    args = parser.parse_args()
+
+    report = compare_configs(ResultsStore(args.store).get_jobs(sweep_id=args.sweep_id),
+                             args.metric, num_replicates=args.replicates, alpha=args.alpha)
+    write_csv(report["intervals"], f"{args.out_prefix}_{args.metric}_intervals.csv")
+    write_csv(report["pairs"], f"{args.out_prefix}_{args.metric}_pairs.csv")
+
+    for row in report["intervals"]:
+        print(f"{row['config_id']}: {row['value']:.4f} [{row['low']:.4f}, {row['high']:.4f}]")
@@ -0,0 +1,262 @@
+import base64
+import html
+import io
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from analyser.stats.bootstrap import ErrorCounts, key_by_sweep, write_csv
+
+logger = logging.getLogger(__name__)
+
+
+# lower is better for all of them
+ACCURACY_KEYS = ("wer", "der")
+
+
+class ParetoReport:
+    """
+    Accuracy vs cost trade-off of the configs in the results store.
+    ---------------------------------------------------------------
+    Every config is a point (WER, DER, RTF, peak RSS), with the corpus
+    metrics computed like the Excel overall columns over the audios
+    every selected config has finished (paired, see ErrorCounts).
+    A config is dominated when another one is at least as good on
+    every objective and strictly better on one; the rest is the
+    Pareto frontier. Peak RSS is only an objective when every config
+    has it (recorded per job by every execution path; rows from older
+    runs may lack it, which drops the objective with a warning).
+
+    Rows copied from another config (alias_of, see ConfigPlanner) are
+    left out: they are the same run under another name.
+    """
+
+    def __init__(self, rows: List[dict], config_ids: Optional[Sequence[str]] = None):
+        """
+        :param rows: ResultsStore.get_jobs() rows of one or more sweeps;
+                     with several sweeps configs are named sweep/config
+        """
+        rows = key_by_sweep([row for row in rows if not row.get("alias_of")])
+
+        self.points = self._points(rows, config_ids)
+        self.objectives = list(ACCURACY_KEYS) + ["rtf"]
+        missing = [p["config_id"] for p in self.points if p["peak_rss_mb"] is None]
+        if not missing:
+            self.objectives.append("peak_rss_mb")
+        else:
+            logger.warning("Peak RSS objective dropped: no peak RSS stored for %d config(s) (%s)",
+                           len(missing), ", ".join(missing[:5]) + (", ..." if len(missing) > 5 else ""))
+        self._mark_dominated()
+
+    @classmethod
+    def from_store(cls, store, sweep_ids: Optional[Sequence[str]] = None,
+                   config_ids: Optional[Sequence[str]] = None) -> "ParetoReport":
+        if not sweep_ids:
+            return cls(store.get_jobs(status="done"), config_ids)
+        rows = [row for sweep_id in sweep_ids for row in store.get_jobs(sweep_id, status="done")]
+        return cls(rows, config_ids)
+
+    # ---------- PUBLIC API ----------
+
+    def frontier(self) -> List[dict]:
+        """
+        Non dominated configs, cheapest (RTF) first
+        """
+        return sorted((p for p in self.points if p["pareto"]), key=lambda p: p["rtf"])
+
+    def cheapest_within(self, max_wer: Optional[float] = None,
+                        max_der: Optional[float] = None) -> Optional[dict]:
+        """
+        Lowest RTF config meeting the accuracy budget (None if none does)
+        """
+        fits = [p for p in self.points
+                if (max_wer is None or p["wer"] <= max_wer) and (max_der is None or p["der"] <= max_der)]
+        return min(fits, key=lambda p: (p["rtf"], p["wer"], p["der"])) if fits else None
+
+    def write(self, out_dir, max_wer: Optional[float] = None,
+              max_der: Optional[float] = None) -> Dict[str, Path]:
+        """
+        pareto.csv (every config) + pareto.html (plots + table)
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        csv_path = out_dir / "pareto.csv"
+        write_csv([self._csv_row(p) for p in sorted(self.points, key=lambda p: p["rtf"])], csv_path)
+
+        html_path = out_dir / "pareto.html"
+        html_path.write_text(self._html(max_wer, max_der), encoding="utf-8")
+
+        logger.info("Pareto report: %d configs, %d on the frontier -> %s",
+                    len(self.points), len(self.frontier()), html_path)
+        return {"csv": csv_path, "html": html_path}
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _points(rows: List[dict], config_ids) -> List[dict]:
+        values = {}
+        shared = None
+        for metric in ("wer", "der", "rtf"):
+            counts = ErrorCounts.from_rows(rows, metric, config_ids)
+            values[metric] = dict(zip(counts.config_ids, counts.values.tolist()))
+            shared = set(counts.audio_ids) if shared is None else shared & set(counts.audio_ids)
+            config_ids = counts.config_ids
+
+        peaks, audios = {}, {}
+        for row in rows:
+            cfg_id = row["config_id"]
+            if cfg_id not in values["rtf"] or row["audio_id"] not in shared:
+                continue
+            audios[cfg_id] = audios.get(cfg_id, 0) + 1
+            if row["peak_rss_mb"] is not None:
+                peaks[cfg_id] = max(peaks.get(cfg_id, 0.0), row["peak_rss_mb"])
+
+        return [{
+            "config_id": cfg_id,
+            "wer": values["wer"][cfg_id],
+            "der": values["der"][cfg_id],
+            "rtf": values["rtf"][cfg_id],
+            "peak_rss_mb": peaks.get(cfg_id),
+            "audios": audios.get(cfg_id, 0),
+        } for cfg_id in config_ids]
+
+    def _mark_dominated(self):
+        """
+        All pairs at once: i dominates j when i <= j everywhere and
+        i < j somewhere
+        """
+        values = np.array([[p[k] for k in self.objectives] for p in self.points], dtype=np.float64)
+        no_worse = (values[:, None, :] <= values[None, :, :]).all(axis=2)
+        better = (values[:, None, :] < values[None, :, :]).any(axis=2)
+        dominates = no_worse & better
+
+        for j, point in enumerate(self.points):
+            dominators = np.flatnonzero(dominates[:, j])
+            point["pareto"] = len(dominators) == 0
+            # the cheapest config that beats it, as the suggested swap
+            point["dominated_by"] = (min((self.points[i] for i in dominators), key=lambda p: p["rtf"])["config_id"]
+                                     if len(dominators) else None)
+
+    @staticmethod
+    def _csv_row(point: dict) -> dict:
+        return {
+            "config_id": point["config_id"],
+            "wer": round(point["wer"], 4),
+            "der": round(point["der"], 4),
+            "rtf": round(point["rtf"], 4),
+            "peak_rss_mb": round(point["peak_rss_mb"], 1) if point["peak_rss_mb"] is not None else "",
+            "audios": point["audios"],
+            "pareto": point["pareto"],
+            "dominated_by": point["dominated_by"] or "",
+        }
+
+    def _plot(self, metric: str, cost: str) -> str:
+        """
+        One accuracy vs cost scatter with the 2-D frontier as a step
+        line, as a base64 PNG
+        """
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        points = [p for p in self.points if p[cost] is not None]
+        x = np.array([p[cost] for p in points])
+        y = np.array([p[metric] for p in points])
+        on_front = np.array([p["pareto"] for p in points], dtype=bool)
+
+        # 2-D frontier of this pair: running minimum along the cost axis
+        order = np.lexsort((y, x))
+        best = np.minimum.accumulate(y[order])
+        keep = np.r_[True, best[1:] < best[:-1]]
+
+        fig, ax = plt.subplots(figsize=(7, 4.5))
+        ax.scatter(x[~on_front], y[~on_front], s=18, c="#bbbbbb", label="dominated")
+        ax.scatter(x[on_front], y[on_front], s=28, c="#d62728", label="Pareto (all objectives)")
+        ax.step(x[order][keep], best[keep], where="post", c="#1f77b4", lw=1, label=f"{metric.upper()} / {cost} frontier")
+        for p in points:
+            if p["pareto"]:
+                ax.annotate(p["config_id"], (p[cost], p[metric]), fontsize=7,
+                            xytext=(3, 3), textcoords="offset points")
+        ax.set_xlabel("RTF" if cost == "rtf" else "peak RSS (MB)")
+        ax.set_ylabel(metric.upper())
+        ax.grid(alpha=0.3)
+        ax.legend(fontsize=8)
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=110)
+        plt.close(fig)
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    def _html(self, max_wer, max_der) -> str:
+        costs = ["rtf"] + (["peak_rss_mb"] if "peak_rss_mb" in self.objectives else [])
+        plots = "".join(
+            f'<img src="data:image/png;base64,{self._plot(metric, cost)}">'
+            for cost in costs for metric in ACCURACY_KEYS
+        )
+
+        answer = ""
+        if max_wer is not None or max_der is not None:
+            pick = self.cheapest_within(max_wer, max_der)
+            budget = ", ".join(f"{name} &le; {value}" for name, value in
+                               (("WER", max_wer), ("DER", max_der)) if value is not None)
+            answer = (f"<p><b>Cheapest config with {budget}:</b> "
+                      + (f"{html.escape(pick['config_id'])} (WER {pick['wer']:.4f}, "
+                         f"DER {pick['der']:.4f}, RTF {pick['rtf']:.4f})" if pick else "none")
+                      + "</p>")
+
+        header = "".join(f"<th>{name}</th>" for name in
+                         ("config", "WER", "DER", "RTF", "peak RSS MB", "audios", "dominated by"))
+        body = []
+        for p in sorted(self.points, key=lambda p: (not p["pareto"], p["rtf"])):
+            row = self._csv_row(p)
+            cells = [row["config_id"], row["wer"], row["der"], row["rtf"],
+                     row["peak_rss_mb"], row["audios"], row["dominated_by"]]
+            style = "" if p["pareto"] else ' class="dominated"'
+            body.append(f"<tr{style}>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in cells) + "</tr>")
+
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Accuracy vs speed</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+td, th {{ border: 1px solid #ddd; padding: 3px 8px; text-align: right; }}
+td:first-child {{ text-align: left; }}
+tr.dominated {{ color: #999; }}
+img {{ max-width: 48%; margin: 0.5em; }}
+</style></head><body>
+<h1>Accuracy vs speed</h1>
+<p>{len(self.points)} configs, {len(self.frontier())} on the Pareto frontier of
+{", ".join(self.objectives)} (lower is better).</p>
+{answer}
+{plots}
+<table><tr>{header}</tr>
+{"".join(body)}
+</table></body></html>
+"""
+
+
+if __name__ == "__main__":
+    import argparse
+    from results.results_store import ResultsStore
+
+    parser = argparse.ArgumentParser(description="Pareto frontier of accuracy vs speed / memory")
+    parser.add_argument("store", help="results.sqlite")
+    parser.add_argument("--sweep-id", action="append", default=None,
+                        help="sweep to include (repeatable; default every sweep)")
+    parser.add_argument("--max-wer", type=float, default=None)
+    parser.add_argument("--max-der", type=float, default=None)
+    parser.add_argument("--out-dir", default="pareto_report")
+    args = parser.parse_args()
+
+    report = ParetoReport.from_store(ResultsStore(args.store), args.sweep_id)
+    report.write(args.out_dir, args.max_wer, args.max_der)
+
+    for point in report.frontier():
+        print(f"{point['config_id']}: WER {point['wer']:.4f} DER {point['der']:.4f} RTF {point['rtf']:.4f}")
+    if args.max_wer is not None or args.max_der is not None:
+        pick = report.cheapest_within(args.max_wer, args.max_der)
+        print("cheapest within budget:", pick["config_id"] if pick else "none")
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from analyser.stats.bootstrap import Bootstrap, ErrorCounts, _holm, compare_configs
+
+
+def _rows(config_id, errors, ref_words=100, status="done"):
+    return [{"config_id": config_id, "audio_id": f"a{k}", "status": status,
+             "substitutions": e, "deletions": 0, "insertions": 0, "ref_words": ref_words}
+            for k, e in enumerate(errors)]
+
+
+def _counts(num_configs=3, num_audios=12, seed=0):
+    rng = np.random.default_rng(seed)
+    numerators = rng.integers(0, 30, size=(num_configs, num_audios)).astype(float)
+    denominators = np.tile(rng.integers(50, 200, size=num_audios).astype(float), (num_configs, 1))
+    return ErrorCounts("wer", [f"c{i}" for i in range(num_configs)],
+                       [f"a{k}" for k in range(num_audios)], numerators, denominators)
+
+
+def test_from_rows_keeps_shared_audios_and_corpus_ratio():
+    rows = _rows("x", [10, 20, 30]) + _rows("y", [5, 5])
+    rows += _rows("y", [1], status="failed")
+    counts = ErrorCounts.from_rows(rows, "wer")
+
+    assert counts.config_ids == ["x", "y"]
+    assert counts.audio_ids == ["a0", "a1"]
+    np.testing.assert_allclose(counts.values, [30 / 200, 10 / 200])
+
+    with pytest.raises(ValueError):
+        ErrorCounts.from_rows(rows, "wer", ["z"])
+
+
+def test_rows_of_several_sweeps_stay_apart():
+    rows = [dict(row, sweep_id="s1") for row in _rows("x", [10, 20])]
+    rows += [dict(row, sweep_id="s2") for row in _rows("x", [30, 40])]
+    counts = ErrorCounts.from_rows(rows, "wer")
+
+    assert counts.config_ids == ["s1/x", "s2/x"]
+    np.testing.assert_allclose(counts.values, [30 / 200, 70 / 200])
+
+
+def test_cpwer_skips_rows_without_cp_counts():
+    rows = _rows("x", [10, 20]) + _rows("y", [10, 20])
+    for row, cp_errors in zip(rows, [12, None, 15, 25]):
+        row.update(cp_substitutions=cp_errors, cp_deletions=0, cp_insertions=0)
+    counts = ErrorCounts.from_rows(rows, "cpwer")
+
+    assert counts.audio_ids == ["a0"]
+    np.testing.assert_allclose(counts.values, [12 / 100, 15 / 100])
+
+
+def test_resample_matches_a_loop_per_replicate():
+    counts = _counts()
+    bootstrap = Bootstrap(num_replicates=50, seed=3, chunk=50)
+    replicates = bootstrap.resample(counts)
+
+    picks = np.random.default_rng(3).integers(0, len(counts.audio_ids), size=(50, len(counts.audio_ids)))
+    expected = np.array([[counts.numerators[c, p].sum() / counts.denominators[c, p].sum()
+                          for c in range(len(counts.config_ids))] for p in picks])
+    np.testing.assert_allclose(replicates, expected)
+
+
+def test_chunking_does_not_change_the_shape():
+    counts = _counts()
+    assert Bootstrap(num_replicates=45, chunk=10).resample(counts).shape == (45, 3)
+
+
+def test_permutation_sums_match_a_loop():
+    counts = _counts()
+    bootstrap = Bootstrap(num_replicates=40, seed=5, chunk=40)
+    nums, dens = bootstrap._permutation_sums(counts)
+
+    flags = np.random.default_rng(6).integers(0, 2, size=(40, len(counts.audio_ids))).astype(bool)
+    np.testing.assert_allclose(nums, [[counts.numerators[c, f].sum() for c in range(3)] for f in flags])
+    np.testing.assert_allclose(dens, [[counts.denominators[c, f].sum() for c in range(3)] for f in flags])
+
+
+def test_holm_matches_step_down_definition():
+    p = [0.01, 0.04, 0.03, 0.2]
+    order = np.argsort(p)
+    expected, running = [0.0] * len(p), 0.0
+    for rank, index in enumerate(order):
+        running = max(running, min(1.0, p[index] * (len(p) - rank)))
+        expected[index] = running
+    assert _holm(p) == pytest.approx(expected)
+    assert _holm([]) == []
+
+
+def test_paired_tests_separate_real_and_null_differences():
+    errors = np.random.default_rng(1).integers(5, 15, size=30).tolist()
+    rows = _rows("base", errors) + _rows("same", errors) + _rows("worse", [e + 10 for e in errors])
+    report = compare_configs(rows, "wer", num_replicates=2000, seed=0)
+
+    pairs = {(r["config_a"], r["config_b"]): r for r in report["pairs"]}
+    assert pairs[("base", "same")]["delta"] == 0.0
+    assert pairs[("base", "same")]["p_permutation"] == 1.0
+    assert pairs[("base", "worse")]["delta"] == pytest.approx(-0.1)
+    assert pairs[("base", "worse")]["p_holm"] < 0.01
+    assert pairs[("base", "worse")]["high"] < 0
+
+    for interval in report["intervals"]:
+        assert interval["low"] <= interval["value"] <= interval["high"]
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from analyser.stats.pareto import ParetoReport
+from results.results_store import ResultsStore
+
+
+def _row(config_id, audio_id, wer, der, rtf, peak=None, sweep_id="s", alias_of=None):
+    return {"sweep_id": sweep_id, "config_id": config_id, "audio_id": audio_id, "status": "done",
+            "substitutions": wer * 100, "deletions": 0, "insertions": 0, "ref_words": 100,
+            "missed": der * 10, "false_alarm": 0, "confusion": 0, "total_speech": 10,
+            "processing_time": rtf * 10, "audio_duration": 10, "peak_rss_mb": peak, "alias_of": alias_of}
+
+
+def _rows(points, audios=("a1", "a2")):
+    return [_row(cfg, audio, *values) for cfg, values in points.items() for audio in audios]
+
+
+def test_dominance_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = {f"c{i}": tuple(rng.choice([0.1, 0.2, 0.3], size=3)) + (float(rng.integers(100, 400)),)
+              for i in range(25)}
+    report = ParetoReport(_rows(points))
+    assert report.objectives == ["wer", "der", "rtf", "peak_rss_mb"]
+
+    def dominates(a, b):
+        return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+    for cfg, values in points.items():
+        beaten_by = [other for other, v in points.items() if dominates(v, values)]
+        point = next(p for p in report.points if p["config_id"] == cfg)
+        assert point["pareto"] == (not beaten_by)
+        if beaten_by:
+            assert point["dominated_by"] in beaten_by
+            assert points[point["dominated_by"]][2] == min(points[c][2] for c in beaten_by)
+
+    frontier = report.frontier()
+    assert [p["rtf"] for p in frontier] == sorted(p["rtf"] for p in frontier)
+
+
+def test_cheapest_within_budget():
+    report = ParetoReport(_rows({"big": (0.1, 0.1, 0.9), "mid": (0.2, 0.1, 0.5), "small": (0.4, 0.3, 0.1)}))
+
+    assert report.cheapest_within(max_wer=0.25)["config_id"] == "mid"
+    assert report.cheapest_within(max_wer=0.25, max_der=0.05) is None
+    assert report.cheapest_within()["config_id"] == "small"
+    # no peak RSS recorded: three objectives only
+    assert report.objectives == ["wer", "der", "rtf"]
+
+
+def test_missing_peak_rss_drops_objective_with_warning(caplog):
+    rows = _rows({"a": (0.1, 0.1, 0.5, 300.0), "b": (0.2, 0.2, 0.2)})
+    with caplog.at_level("WARNING"):
+        report = ParetoReport(rows)
+
+    assert "peak_rss_mb" not in report.objectives
+    assert "Peak RSS objective dropped" in caplog.text and "b" in caplog.text
+
+
+def test_aliases_excluded_and_sweeps_prefixed():
+    rows = _rows({"a": (0.1, 0.1, 0.5)})
+    rows += [_row("b", audio, 0.1, 0.1, 0.5, alias_of="a") for audio in ("a1", "a2")]
+    rows += [_row("a", audio, 0.2, 0.2, 0.2, sweep_id="t") for audio in ("a1", "a2")]
+
+    report = ParetoReport(rows)
+    assert sorted(p["config_id"] for p in report.points) == ["s/a", "t/a"]
+
+
+def test_only_shared_audios_are_compared():
+    rows = _rows({"a": (0.1, 0.1, 0.5), "b": (0.2, 0.2, 0.2)}) + [_row("a", "a3", 0.9, 0.9, 0.9)]
+    points = {p["config_id"]: p for p in ParetoReport(rows).points}
+    assert points["a"]["wer"] == pytest.approx(0.1)
+    assert points["a"]["audios"] == 2
+
+
+def test_from_store_and_write(tmp_path):
+    pytest.importorskip("matplotlib")
+    store = ResultsStore(tmp_path / "results.sqlite")
+    for cfg, (wer, der, rtf) in {"fast": (0.3, 0.2, 0.1), "slow": (0.1, 0.1, 0.8)}.items():
+        for audio in ("a1", "a2"):
+            row = _row(cfg, audio, wer, der, rtf)
+            store.mark_done("s", cfg, audio, attempts=1, wer=wer, der=der, rtf=rtf,
+                            **{k: row[k] for k in ("substitutions", "deletions", "insertions", "ref_words",
+                                                  "missed", "false_alarm", "confusion", "total_speech",
+                                                  "processing_time", "audio_duration")})
+
+    report = ParetoReport.from_store(store, ["s"])
+    written = report.write(tmp_path / "out", max_wer=0.2)
+
+    lines = written["csv"].read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("config_id,wer,der,rtf")
+    assert [line.split(",")[0] for line in lines[1:]] == ["fast", "slow"]
+    page = written["html"].read_text(encoding="utf-8")
+    assert "Cheapest config with WER &le; 0.2:</b> slow" in page
+    assert page.count("data:image/png;base64,") == 2
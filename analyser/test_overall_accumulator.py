@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from analyser.der.der_accumulator import DERAccumulator
+from analyser.overall_accumulator import OverallAccumulator
+from analyser.rtf.rtf_accumulator import RTFAccumulator
+from analyser.wer.wer_accumulator import WERAccumulator
+
+AUDIOS = [
+    # wer breakdown, der breakdown, processing time, duration, cpwer breakdown
+    ((3, 1, 2, 50), (1.0, 0.5, 0.25, 20.0), 4.0, 30.0, (4, 2, 3, 50)),
+    ((0, 0, 0, 10), (0.0, 0.0, 0.0, 5.0), 1.0, 6.0, None),
+    ((5, 4, 1, 40), (2.0, 1.0, 1.0, 25.0), 6.0, 40.0, (6, 5, 2, 40)),
+]
+
+
+def _accumulate(audios):
+    acc = OverallAccumulator()
+    for audio in audios:
+        acc.update(*audio)
+    return acc
+
+
+def test_corpus_values():
+    snapshot = _accumulate(AUDIOS).snapshot()
+
+    assert snapshot["audios"] == 3
+    assert snapshot["WER"] == round(16 / 100, 4)
+    assert snapshot["DER"] == round(5.75 / 50, 4)
+    assert snapshot["RTF"] == round(11 / 76, 4)
+    # cpWER only over the audios that have it
+    assert snapshot["cpWER"] == round(22 / 90, 4)
+
+
+def test_merge_equals_streaming():
+    merged = _accumulate(AUDIOS[:1]).merge(_accumulate(AUDIOS[1:]))
+    assert merged.snapshot() == _accumulate(AUDIOS).snapshot()
+
+    total = WERAccumulator().update((1, 2, 3, 10)) + WERAccumulator().update((1, 0, 0, 10))
+    assert (total.errors, total.ref_words, total.count) == (7, 20, 2)
+
+
+def test_dict_round_trip_through_json():
+    acc = _accumulate(AUDIOS)
+    restored = OverallAccumulator.from_dict(json.loads(json.dumps(acc.to_dict())))
+    assert restored.snapshot() == acc.snapshot()
+
+    # states written before cpWER existed
+    state = acc.to_dict()
+    del state["cpwer"]
+    assert OverallAccumulator.from_dict(state).cpwer.count == 0
+
+
+def test_empty_and_mismatched():
+    assert OverallAccumulator().snapshot() == {"audios": 0, "WER": 0.0, "DER": 0.0, "RTF": 0.0, "cpWER": 0.0}
+    with pytest.raises(TypeError):
+        DERAccumulator().merge(RTFAccumulator())
@@ -0,0 +1,251 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+class HypothesisFile:
+    """
+    Compact WhisperX result (one per config / audio)
+    ------------------------------------------------
+    <base>.npz, compressed, holding only what the analysers read,
+    as flat arrays:
+
+        schema_version                      int
+        language                            utf-8 text
+        speakers                            utf-8, "\\n" joined names
+        seg_start / seg_end                 float64
+        seg_speaker                         int16 code into speakers, -1 = none
+        seg_text                            utf-8, "\\n" joined
+        word_seg                            int32 segment of each word
+        word_start / word_end               float64, NaN = not aligned
+        word_speaker                        int16, -1 = none
+        word_text                           utf-8, "\\n" joined
+
+    Scores, per char data and the top level "word_segments" copy of
+    every word are left out. Arrays are decompressed on first access,
+    so reading the texts for WER never touches the word timings; the
+    .npz stays open until close() (use `with HypothesisFile.open(p)`),
+    arrays already read remain usable after it.
+
+    A plain WhisperX JSON is read through the same interface, and
+    with debug_json the full JSON is written next to the .npz.
+    """
+
+    SCHEMA_VERSION = 1
+    SUFFIX = ".npz"
+
+    def __init__(self, path, data):
+        self.path = Path(path)
+        # np.load(.npz) mapping, or packed arrays of a JSON result
+        self._data = data
+        self._cache = {}
+
+    # ---------- WRITE ----------
+
+    @classmethod
+    def write(cls, result: dict, output_folder, base_name: str = "result",
+              debug_json: bool = False) -> Path:
+        """
+        Writes <base>.npz (+ <base>.json with debug_json); returns the .npz path
+        """
+        folder = Path(output_folder)
+        path = folder / f"{base_name}{cls.SUFFIX}"
+
+        # write + rename: a reader never sees half a file
+        tmp = folder / f".{base_name}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **cls._pack(result))
+        os.replace(tmp, path)
+
+        json_path = folder / f"{base_name}.json"
+        if debug_json:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+        elif json_path.exists():
+            # a stale debug copy would not match the new result
+            json_path.unlink()
+        return path
+
+    # ---------- READ ----------
+
+    @classmethod
+    def find(cls, output_folder, base_name: str) -> Path:
+        """
+        <base>.npz if present, else the <base>.json of older runs
+        """
+        path = Path(output_folder) / f"{base_name}{cls.SUFFIX}"
+        if path.exists():
+            return path
+        return Path(output_folder) / f"{base_name}.json"
+
+    @classmethod
+    def open(cls, path) -> "HypothesisFile":
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Hypothesis not found: {path}")
+
+        if path.suffix.lower() == cls.SUFFIX:
+            data = np.load(path)
+            version = int(data["schema_version"])
+            if version > cls.SCHEMA_VERSION:
+                data.close()
+                raise ValueError(f"{path}: schema version {version} is newer than "
+                                 f"this reader ({cls.SCHEMA_VERSION})")
+            return cls(path, data)
+
+        return cls(path, cls._pack(json.loads(path.read_text(encoding="utf-8"))))
+
+    def close(self):
+        """
+        Releases the .npz file handle (Windows cannot replace or delete
+        an open file, e.g. when the job is rerun)
+        """
+        if hasattr(self._data, "close"):
+            self._data.close()
+
+    def __enter__(self) -> "HypothesisFile":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def language(self):
+        return self._text("language")[0] or None
+
+    @property
+    def speakers(self) -> List[str]:
+        return [name for name in self._text("speakers") if name]
+
+    def segment_texts(self) -> List[str]:
+        return self._text("seg_text")
+
+    def segment_spans(self):
+        return self._array("seg_start"), self._array("seg_end")
+
+    def segment_speakers(self) -> List:
+        """
+        Speaker name per segment (None without diarization)
+        """
+        return self._names(self._array("seg_speaker"))
+
+    def word_texts(self) -> List[str]:
+        return self._text("word_text")
+
+    def word_segments(self) -> np.ndarray:
+        """
+        Segment index of every word (words are in reading order)
+        """
+        return self._array("word_seg")
+
+    def word_spans(self):
+        return self._array("word_start"), self._array("word_end")
+
+    def word_speakers(self) -> List:
+        return self._names(self._array("word_speaker"))
+
+    def segments(self) -> List[Dict]:
+        """
+        WhisperX style segment dicts (start, end, text, speaker, words)
+        for code that walks the result; slower than the array accessors
+        """
+        starts, ends = self.segment_spans()
+        seg_speakers = self.segment_speakers()
+        word_seg = self.word_segments()
+        word_start, word_end = self.word_spans()
+        word_speakers = self.word_speakers()
+        word_texts = self.word_texts()
+
+        segments = []
+        for k, text in enumerate(self.segment_texts()):
+            segment = {"start": float(starts[k]), "end": float(ends[k]), "text": text, "words": []}
+            if seg_speakers[k] is not None:
+                segment["speaker"] = seg_speakers[k]
+            segments.append(segment)
+
+        for w, seg in enumerate(word_seg.tolist()):
+            word = {"word": word_texts[w]}
+            if not np.isnan(word_start[w]):
+                word["start"], word["end"] = float(word_start[w]), float(word_end[w])
+            if word_speakers[w] is not None:
+                word["speaker"] = word_speakers[w]
+            segments[seg]["words"].append(word)
+
+        return segments
+
+    def to_dict(self) -> dict:
+        result = {"segments": self.segments()}
+        if self.language:
+            result["language"] = self.language
+        return result
+
+    # ---------- HELPERS ----------
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._cache:
+            self._cache[name] = self._data[name]
+        return self._cache[name]
+
+    def _text(self, name: str) -> List[str]:
+        if name not in self._cache:
+            self._cache[name] = self._unjoin(self._data[name])
+        return self._cache[name]
+
+    def _names(self, codes: np.ndarray) -> List:
+        names = self._text("speakers")
+        return [names[c] if c >= 0 else None for c in codes.tolist()]
+
+    @classmethod
+    def _pack(cls, result: dict) -> Dict[str, np.ndarray]:
+        speakers = {}
+
+        def code(name):
+            return speakers.setdefault(name, len(speakers)) if name else -1
+
+        seg_start, seg_end, seg_speaker, seg_text = [], [], [], []
+        word_seg, word_start, word_end, word_speaker, word_text = [], [], [], [], []
+
+        for k, segment in enumerate(result.get("segments", [])):
+            seg_start.append(segment.get("start", np.nan))
+            seg_end.append(segment.get("end", np.nan))
+            seg_speaker.append(code(segment.get("speaker")))
+            seg_text.append(segment.get("text", ""))
+
+            for word in segment.get("words") or []:
+                word_seg.append(k)
+                word_start.append(word.get("start", np.nan))
+                word_end.append(word.get("end", np.nan))
+                word_speaker.append(code(word.get("speaker")))
+                word_text.append(word.get("word", ""))
+
+        return {
+            "schema_version": np.array(cls.SCHEMA_VERSION, dtype=np.int16),
+            "language": cls._join([result.get("language") or ""]),
+            "speakers": cls._join(list(speakers)),
+            "seg_start": np.array(seg_start, dtype=np.float64),
+            "seg_end": np.array(seg_end, dtype=np.float64),
+            "seg_speaker": np.array(seg_speaker, dtype=np.int16),
+            "seg_text": cls._join(seg_text),
+            "word_seg": np.array(word_seg, dtype=np.int32),
+            "word_start": np.array(word_start, dtype=np.float64),
+            "word_end": np.array(word_end, dtype=np.float64),
+            "word_speaker": np.array(word_speaker, dtype=np.int16),
+            "word_text": cls._join(word_text),
+        }
+
+    @staticmethod
+    def _join(texts: List[str]) -> np.ndarray:
+        """
+        Strings as one utf-8 byte array; a leading count keeps [] and
+        [""] apart
+        """
+        body = "\n".join(t.replace("\n", " ") for t in texts)
+        return np.frombuffer(f"{len(texts)}\n{body}".encode("utf-8"), dtype=np.uint8)
+
+    @staticmethod
+    def _unjoin(packed: np.ndarray) -> List[str]:
+        count, _, body = packed.tobytes().decode("utf-8").partition("\n")
+        return body.split("\n") if int(count) else []
@@ -0,0 +1,142 @@
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SegmentTable:
+    """
+    Array backed speaker segments (one row per turn)
+    -----------------------------------------------
+    file_ids / speakers : object arrays of str
+    starts / ends       : float64 arrays, seconds
+    """
+
+    def __init__(self, file_ids, starts, ends, speakers):
+        self.file_ids = np.asarray(file_ids, dtype=object)
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.speakers = np.asarray(speakers, dtype=object)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def empty(cls) -> "SegmentTable":
+        return cls([], [], [], [])
+
+    @classmethod
+    def concat(cls, tables: Iterable["SegmentTable"]) -> "SegmentTable":
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        return cls(np.concatenate([t.file_ids for t in tables]),
+                   np.concatenate([t.starts for t in tables]),
+                   np.concatenate([t.ends for t in tables]),
+                   np.concatenate([t.speakers for t in tables]))
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self.ends - self.starts
+
+    def files(self) -> List[str]:
+        return sorted(set(self.file_ids.tolist()))
+
+    def for_file(self, file_id: str) -> "SegmentTable":
+        keep = self.file_ids == file_id
+        return SegmentTable(self.file_ids[keep], self.starts[keep],
+                            self.ends[keep], self.speakers[keep])
+
+    def to_records(self) -> List[dict]:
+        """
+        [{"spk", "start", "end"}, ...] as used by DERCalculator
+        """
+        return [{"spk": s, "start": a, "end": b}
+                for s, a, b in zip(self.speakers.tolist(), self.starts.tolist(), self.ends.tolist())]
+
+
+class RTTM:
+    """
+    RTTM read / write on SegmentTables
+    ----------------------------------
+    SPEAKER <file> 1 <start> <dur> <NA> <NA> <speaker> <NA> <NA>
+    """
+
+    # ---------- READ ----------
+
+    @staticmethod
+    def parse(text: str) -> SegmentTable:
+        lines = [line for line in text.splitlines()
+                 if line.split()[:1] == ["SPEAKER"] and len(line.split()) >= 8]
+        if not lines:
+            return SegmentTable.empty()
+
+        # typed column reads: no per field Python floats / object casts
+        names = np.loadtxt(lines, dtype=str, usecols=(1, 7), comments=None, ndmin=2)
+        times = np.loadtxt(lines, dtype=np.float64, usecols=(3, 4), comments=None, ndmin=2)
+        return SegmentTable(names[:, 0], times[:, 0], times[:, 0] + times[:, 1], names[:, 1])
+
+    @classmethod
+    def read(cls, rttm_path) -> SegmentTable:
+        return cls.parse(Path(rttm_path).read_text(encoding="utf-8"))
+
+    # ---------- WRITE ----------
+
+    @staticmethod
+    def format(table: SegmentTable) -> str:
+        lines = [
+            f"SPEAKER {f} 1 {s:.3f} {d:.3f} <NA> <NA> {spk} <NA> <NA>\n"
+            for f, s, d, spk in zip(table.file_ids.tolist(), table.starts.tolist(),
+                                    table.durations.tolist(), table.speakers.tolist())
+        ]
+        return "".join(lines)
+
+    @classmethod
+    def write(cls, table: SegmentTable, rttm_path):
+        """
+        Whole table in one buffered write
+        """
+        Path(rttm_path).write_text(cls.format(table), encoding="utf-8")
+
+    # ---------- WHISPERX JSON ----------
+
+    @staticmethod
+    def from_whisperx(json_path, file_id: Optional[str] = None,
+                      default_speaker: Optional[str] = None) -> SegmentTable:
+        """
+        Hypothesis turns of a whisperx result, .npz or .json (word span
+        of each segment, segment span without aligned words). Segments
+        without speaker are dropped unless `default_speaker` is given.
+        """
+        from analyser.utils.hypothesis_file import HypothesisFile
+
+        json_path = Path(json_path)
+        file_id = file_id or json_path.stem
+        with HypothesisFile.open(json_path) as hypothesis:
+            starts, ends = (a.copy() for a in hypothesis.segment_spans())
+            segment_speakers = hypothesis.segment_speakers()
+            word_seg = hypothesis.word_segments()
+            word_start, word_end = hypothesis.word_spans()
+
+        # first / last aligned word of each segment
+        timed = np.flatnonzero(~np.isnan(word_start))
+        if len(timed):
+            segs = word_seg[timed]
+            first = np.unique(segs, return_index=True)
+            last = np.unique(segs[::-1], return_index=True)
+            starts[first[0]] = word_start[timed[first[1]]]
+            ends[last[0]] = word_end[timed[::-1][last[1]]]
+
+        speakers = np.array([s or default_speaker for s in segment_speakers], dtype=object)
+        keep = (speakers != None) & ~((starts == 0) & (ends == 0))  # noqa: E711
+
+        return SegmentTable([file_id] * int(keep.sum()), starts[keep], ends[keep], speakers[keep])
+
+    @classmethod
+    def export_sweep(cls, hypotheses: Iterable[Tuple[str, Path]], rttm_path):
+        """
+        One multi-file RTTM from [(file_id, whisperx json), ...]
+        """
+        table = SegmentTable.concat(cls.from_whisperx(path, file_id) for file_id, path in hypotheses)
+        cls.write(table, rttm_path)
+        return table
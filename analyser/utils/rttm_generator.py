@@ -1,30 +1,30 @@
-import json
 from pathlib import Path
+from typing import Optional
+
+from analyser.utils.hypothesis_file import HypothesisFile
+from analyser.utils.rttm import RTTM, SegmentTable
 
 
 class JSONtoRTTMConverter:
 
-    def convert(self, json_path: Path, rttm_path: Path):
+    def convert(self, json_path: Path, rttm_path: Path, file_id: Optional[str] = None):
         """
-        Convert WhisperX diarization JSON → RTTM
+        Convert WhisperX diarization result (.npz / .json) → RTTM
+        (file id = file name unless given)
         """
 
-        data = json.loads(json_path.read_text(encoding="utf-8"))
-
-        with rttm_path.open("w", encoding="utf-8") as f:
-            for seg in data["segments"]:
-
-                if "speaker" not in seg:
-                    # fallback if diarization disabled
-                    speaker = "SPEAKER_00"
-                else:
-                    speaker = seg["speaker"]
-
-                start = float(seg["start"])
-                dur = float(seg["end"]) - float(seg["start"])
-
-                line = (
-                    f"SPEAKER file1 1 {start:.3f} {dur:.3f} "
-                    f"<NA> <NA> {speaker} <NA> <NA>\n"
-                )
-                f.write(line)
+        json_path = Path(json_path)
+        file_id = file_id or json_path.stem
+        with HypothesisFile.open(json_path) as hypothesis:
+            starts, ends = hypothesis.segment_spans()
+            # fallback if diarization disabled
+            speakers = [spk or "SPEAKER_00" for spk in hypothesis.segment_speakers()]
+
+        table = SegmentTable(
+            [file_id] * len(speakers),
+            starts,
+            ends,
+            speakers
+        )
+        RTTM.write(table, Path(rttm_path))
+        return table
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from analyser.utils.hypothesis_file import HypothesisFile
+from analyser.utils.rttm import RTTM
+from analyser.wer.wer_io import WERIO
+
+RESULT = {
+    "language": "en",
+    "segments": [
+        {"start": 0.5, "end": 2.0, "text": " hello there", "speaker": "SPEAKER_01",
+         "words": [{"word": "hello", "start": 0.5, "end": 0.9, "speaker": "SPEAKER_01", "score": 0.9},
+                   {"word": "there", "start": 1.0, "end": 2.0}]},
+        {"start": 2.5, "end": 3.0, "text": " 42", "words": [{"word": "42"}]},
+        {"start": 3.5, "end": 4.0, "text": " uh\nhuh", "speaker": "SPEAKER_00", "words": []},
+    ],
+}
+
+
+def _open_files(path: Path):
+    return [fd for fd in os.listdir("/proc/self/fd")
+            if os.path.realpath(f"/proc/self/fd/{fd}") == str(path.resolve())]
+
+
+def test_npz_and_json_read_the_same(tmp_path):
+    npz_path = HypothesisFile.write(RESULT, tmp_path, "a", debug_json=True)
+    json_path = tmp_path / "a.json"
+    assert HypothesisFile.find(tmp_path, "a") == npz_path
+
+    with HypothesisFile.open(npz_path) as npz, HypothesisFile.open(json_path) as js:
+        assert npz.to_dict() == js.to_dict()
+        assert npz.speakers == ["SPEAKER_01", "SPEAKER_00"]
+        assert npz.segment_speakers() == ["SPEAKER_01", None, "SPEAKER_00"]
+        assert npz.segment_texts()[2] == " uh huh"
+        starts, _ = npz.word_spans()
+        assert np.isnan(starts[2])
+
+
+def test_empty_result(tmp_path):
+    with HypothesisFile.open(HypothesisFile.write({"segments": []}, tmp_path, "empty")) as hypothesis:
+        assert hypothesis.segments() == [] and hypothesis.language is None
+
+
+def test_rewrite_drops_stale_debug_json(tmp_path):
+    HypothesisFile.write(RESULT, tmp_path, "a", debug_json=True)
+    HypothesisFile.write(RESULT, tmp_path, "a")
+    assert not (tmp_path / "a.json").exists()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_readers_close_the_npz(tmp_path):
+    path = HypothesisFile.write(RESULT, tmp_path, "a")
+
+    with HypothesisFile.open(path) as hypothesis:
+        texts = hypothesis.segment_texts()
+        assert _open_files(path)
+    assert not _open_files(path)
+    assert texts == hypothesis.segment_texts()    # read arrays outlive close()
+
+    WERIO().load_hypothesis_by_speaker(path)
+    WERIO().load_hypothesis_from_json(path)
+    RTTM.from_whisperx(path)
+    assert not _open_files(path)
+
+    # a rerun can replace the file
+    HypothesisFile.write(RESULT, tmp_path, "a")
+
+
+def test_newer_schema_is_refused(tmp_path):
+    path = tmp_path / "new.npz"
+    np.savez(path, schema_version=np.array(HypothesisFile.SCHEMA_VERSION + 1))
+    with pytest.raises(ValueError):
+        HypothesisFile.open(path)
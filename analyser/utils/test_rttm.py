@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from analyser.utils.hypothesis_file import HypothesisFile
+from analyser.utils.rttm import RTTM, SegmentTable
+
+RESULT = {"segments": [
+    {"start": 0.0, "end": 3.0, "text": "a b", "speaker": "SPEAKER_00",
+     "words": [{"word": "a"}, {"word": "b", "start": 0.8, "end": 1.4}, {"word": "c", "start": 1.5, "end": 2.6}]},
+    {"start": 3.0, "end": 4.0, "text": "d", "speaker": "SPEAKER_01", "words": [{"word": "d"}]},
+    {"start": 4.0, "end": 5.0, "text": "e", "words": [{"word": "e", "start": 4.2, "end": 4.5}]},
+]}
+
+
+def test_parse_format_round_trip(dataset_dir):
+    text = (dataset_dir / "Ses01F_impro01" / "Ses01F_impro01.rttm").read_text(encoding="utf-8")
+    table = RTTM.parse(text)
+
+    assert len(table) == sum(1 for line in text.splitlines() if line.startswith("SPEAKER"))
+    again = RTTM.parse(RTTM.format(table))
+    np.testing.assert_allclose(again.starts, table.starts, atol=1e-3)
+    np.testing.assert_allclose(again.ends, table.ends, atol=2e-3)
+    assert again.speakers.tolist() == table.speakers.tolist()
+
+
+def test_parse_skips_other_lines_and_keeps_long_ids():
+    file_id = "x" * 80
+    text = (f"SPEAKER {file_id} 1 1.5 2.0 <NA> <NA> 7 <NA> <NA>\n"
+            "LEXEME f 1 0.0 1.0 word <NA> spk <NA> <NA>\n"
+            "SPEAKER short 1 2.0\n\n")
+    table = RTTM.parse(text)
+
+    assert table.file_ids.tolist() == [file_id]
+    assert table.speakers.tolist() == ["7"]
+    np.testing.assert_allclose(table.ends, [3.5])
+    assert len(RTTM.parse("")) == 0
+
+
+def test_from_whisperx_uses_word_spans(tmp_path):
+    path = HypothesisFile.write(RESULT, tmp_path, "dlg")
+
+    table = RTTM.from_whisperx(path)
+    assert table.file_ids.tolist() == ["dlg", "dlg"]
+    assert table.speakers.tolist() == ["SPEAKER_00", "SPEAKER_01"]
+    # first / last aligned word; segment span when no word is aligned
+    assert table.starts.tolist() == [0.8, 3.0] and table.ends.tolist() == [2.6, 4.0]
+
+    with_default = RTTM.from_whisperx(path, default_speaker="SPEAKER_00")
+    assert with_default.starts.tolist()[-1] == 4.2
+
+
+def test_export_sweep_concatenates_files(tmp_path):
+    paths = [(f"dlg{k}", HypothesisFile.write(RESULT, tmp_path, f"dlg{k}")) for k in range(3)]
+    RTTM.export_sweep(paths, tmp_path / "all.rttm")
+
+    table = RTTM.read(tmp_path / "all.rttm")
+    assert table.files() == ["dlg0", "dlg1", "dlg2"]
+    assert len(table.for_file("dlg1")) == 2
+    assert len(SegmentTable.concat([table, SegmentTable.empty()])) == 6
+
+
+def test_der_reference_from_rttm_or_transcript(dataset_dir):
+    """
+    The dialog RTTM and transcript_norm.txt give the same reference
+    and therefore the same DER
+    """
+    from analyser.der.der_calculator import DERCalculator
+    from analyser.der.der_io import DERIO
+
+    folder = dataset_dir / "Ses01F_impro01"
+    from_rttm = DERIO.load_reference_table(folder / "Ses01F_impro01.rttm")
+    from_txt = DERIO.load_reference_table(folder / "transcript_norm.txt")
+    order = np.argsort(from_txt.starts, kind="stable")
+    np.testing.assert_allclose(np.sort(from_rttm.starts), from_txt.starts[order], atol=1e-3)
+    assert sorted(from_rttm.speakers.tolist()) == sorted(from_txt.speakers.tolist())
+
+    scores = []
+    for ref in (folder / "Ses01F_impro01.rttm", folder / "transcript_norm.txt"):
+        calculator = DERCalculator()
+        calculator.load_inputs(ref, folder / "Ses01F_impro01.rttm")
+        scores.append(calculator.calculate()[0])
+    assert scores[0] == pytest.approx(scores[1], abs=1e-3)
@@ -0,0 +1,132 @@
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from analyser.wer.wer_alignment import DEL, INS, MATCH, SUB, WordAlignment
+
+
+class AlignmentQueries:
+    """
+    Error analysis over stored word alignments.
+    -------------------------------------------
+    Every alignment of the selection is concatenated into flat arrays
+    (one entry per edit op, words mapped to one shared vocabulary), so
+    each query is a handful of NumPy operations over the whole sweep.
+    """
+
+    def __init__(self, rows: List[dict]):
+        """
+        :param rows: ResultsStore.get_alignments() rows
+        """
+        ops, ref_words, hyp_words, turn_distance, configs = [], [], [], [], []
+
+        for row in rows:
+            alignment = WordAlignment.from_bytes(row["ops"], row["ref_idx"], row["hyp_idx"])
+            ref_tokens = np.array(json.loads(row["ref_tokens"]) + [""], dtype=object)
+            hyp_tokens = np.array(json.loads(row["hyp_tokens"]) + [""], dtype=object)
+
+            # index -1 (no word) picks the trailing ""
+            ops.append(alignment.ops)
+            ref_words.append(ref_tokens[alignment.ref_idx])
+            hyp_words.append(hyp_tokens[alignment.hyp_idx])
+            configs.append(np.full(len(alignment), row["config_id"], dtype=object))
+
+            distance = np.full(len(alignment), -1, dtype=np.int64)
+            if row["ref_speakers"] is not None:
+                speakers = np.frombuffer(row["ref_speakers"], dtype=np.int32)
+                per_word = self._turn_distance(speakers)
+                if len(per_word):
+                    distance = per_word[np.minimum(alignment.anchors(), len(per_word) - 1)]
+            turn_distance.append(distance)
+
+        def flat(parts, dtype):
+            return np.concatenate(parts) if parts else np.array([], dtype=dtype)
+
+        self.ops = flat(ops, np.int8)
+        self.config_ids = flat(configs, object)
+        self.turn_distance = flat(turn_distance, np.int64)
+        vocab, codes = np.unique(
+            np.concatenate([flat(ref_words, object), flat(hyp_words, object)]).astype(str),
+            return_inverse=True
+        )
+        self.vocab = vocab.tolist()
+        self.ref_codes, self.hyp_codes = codes[:len(self.ops)], codes[len(self.ops):]
+
+    @classmethod
+    def from_store(cls, store, sweep_id: Optional[str] = None,
+                   config_id: Optional[str] = None) -> "AlignmentQueries":
+        return cls(store.get_alignments(sweep_id, config_id))
+
+    # ---------- PUBLIC API ----------
+
+    def top_substitutions(self, k: int = 20) -> List[tuple]:
+        """
+        [(ref word, hyp word, count), ...] most frequent first
+        """
+        keep = self.ops == SUB
+        pairs = self.ref_codes[keep] * len(self.vocab) + self.hyp_codes[keep]
+        return [(self.vocab[code // len(self.vocab)], self.vocab[code % len(self.vocab)], count)
+                for code, count in self._top(pairs, k)]
+
+    def most_deleted(self, k: int = 20) -> List[tuple]:
+        """
+        [(ref word, count), ...]
+        """
+        return [(self.vocab[code], count)
+                for code, count in self._top(self.ref_codes[self.ops == DEL], k)]
+
+    def most_inserted(self, k: int = 20) -> List[tuple]:
+        return [(self.vocab[code], count)
+                for code, count in self._top(self.hyp_codes[self.ops == INS], k)]
+
+    def errors_near_turns(self, window: int = 2) -> Dict[str, dict]:
+        """
+        S / D / I rates of words within `window` reference words of a
+        speaker change ("near") against the rest ("far"). Alignments
+        without speaker info are left out.
+        """
+        known = self.turn_distance >= 0
+        near = known & (self.turn_distance <= window)
+
+        result = {}
+        for name, mask in (("near", near), ("far", known & ~near)):
+            counts = np.bincount(self.ops[mask], minlength=4)
+            ref_words = int(counts[MATCH] + counts[SUB] + counts[DEL])
+            errors = int(counts[SUB] + counts[DEL] + counts[INS])
+            result[name] = {
+                "ref_words": ref_words,
+                "substitutions": int(counts[SUB]),
+                "deletions": int(counts[DEL]),
+                "insertions": int(counts[INS]),
+                "error_rate": errors / ref_words if ref_words else 0.0,
+            }
+        return result
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _top(codes: np.ndarray, k: int) -> List[tuple]:
+        values, counts = np.unique(codes, return_counts=True)
+        order = np.lexsort((values, -counts))[:k]
+        return [(int(values[i]), int(counts[i])) for i in order]
+
+    @staticmethod
+    def _turn_distance(speakers: np.ndarray) -> np.ndarray:
+        """
+        Words between each reference word and the closest speaker change
+        (0 = first or last word of a turn)
+        """
+        if len(speakers) == 0:
+            return np.array([], dtype=np.int64)
+
+        changes = np.flatnonzero(speakers[1:] != speakers[:-1]) + 1
+        if len(changes) == 0:
+            return np.full(len(speakers), np.iinfo(np.int64).max // 2, dtype=np.int64)
+
+        # turn edges: last word before and first word after every change
+        edges = np.sort(np.concatenate([changes - 1, changes]))
+        positions = np.arange(len(speakers))
+        right = np.clip(np.searchsorted(edges, positions), 0, len(edges) - 1)
+        left = np.clip(right - 1, 0, len(edges) - 1)
+        return np.minimum(np.abs(edges[right] - positions), np.abs(positions - edges[left]))
@@ -0,0 +1,98 @@
+import numpy as np
+
+from analyser.base.analyser_base import AnalyserBase
+from analyser.wer.wer_alignment import HirschbergAligner
+from analyser.wer.wer_io import WERIO
+from analyser.wer.wer_preprocessor import WERPreprocessor
+
+
+class CPWERCalculator(AnalyserBase):
+    """
+    Concatenated minimum permutation WER (cpWER).
+    ---------------------------------------------
+    Reference utterances are concatenated per speaker (F / M from the
+    utterance id), hypothesis words per diarization label (SPEAKER_xx).
+    Every (reference speaker, hypothesis speaker) pair is scored by
+    edit distance, unpaired speakers cost all their words (deletions /
+    insertions), and the speaker mapping with the lowest total is
+    found by Hungarian matching (linear_sum_assignment) instead of
+    trying every permutation. So diarization errors show up as word
+    errors: words given to the wrong speaker are deleted there and
+    inserted elsewhere.
+    """
+
+    def __init__(self, output_dir: str):
+        super().__init__(output_dir)
+        self.reference = None
+        self.hypothesis = None
+        self.cpwer_value = None
+        self.breakdown = None
+        self.mapping = None
+
+    def load_inputs(self, ref_path: str, hyp_path: str):
+        io = WERIO()
+
+        self.reference = {}
+        for utt_id, text in io.load_reference_utterances(ref_path):
+            self.reference.setdefault(io.utterance_speaker(utt_id), []).append(text)
+        self.reference = {spk: " ".join(texts) for spk, texts in self.reference.items()}
+
+        self.hypothesis = io.load_hypothesis_by_speaker(hyp_path)
+
+    def preprocess(self):
+        preprocessor = WERPreprocessor()
+        self.reference = {spk: preprocessor.normalize_reference(t).split()
+                          for spk, t in self.reference.items()}
+        self.hypothesis = {spk: preprocessor.normalize_hypothesis(t).split()
+                           for spk, t in self.hypothesis.items()}
+        self.hypothesis = {spk: words for spk, words in self.hypothesis.items() if words}
+
+    def calculate(self):
+        """
+        cpWER; breakdown = (S, D, I, N) summed over the matched pairs
+        """
+        from scipy.optimize import linear_sum_assignment
+
+        ref_speakers = sorted(self.reference)
+        hyp_speakers = sorted(self.hypothesis)
+        size = max(len(ref_speakers), len(hyp_speakers))
+        aligner = HirschbergAligner()
+
+        # padded square cost: row / column beyond the real speakers = nobody
+        cost = np.zeros((size, size), dtype=np.int64)
+        for r, ref_spk in enumerate(ref_speakers):
+            cost[r, len(hyp_speakers):] = len(self.reference[ref_spk])
+            for h, hyp_spk in enumerate(hyp_speakers):
+                cost[r, h] = aligner.distance(self.reference[ref_spk], self.hypothesis[hyp_spk])
+        for h, hyp_spk in enumerate(hyp_speakers):
+            cost[len(ref_speakers):, h] = len(self.hypothesis[hyp_spk])
+
+        rows, cols = linear_sum_assignment(cost)
+
+        sub = dele = ins = 0
+        self.mapping = {}
+        for r, h in zip(rows, cols):
+            ref_words = self.reference[ref_speakers[r]] if r < len(ref_speakers) else []
+            hyp_words = self.hypothesis[hyp_speakers[h]] if h < len(hyp_speakers) else []
+            if r < len(ref_speakers) and h < len(hyp_speakers):
+                self.mapping[ref_speakers[r]] = hyp_speakers[h]
+            s, d, i, _ = aligner.align(ref_words, hyp_words).breakdown()
+            sub, dele, ins = sub + s, dele + d, ins + i
+
+        num_ref = sum(len(words) for words in self.reference.values())
+        self.breakdown = (sub, dele, ins, num_ref)
+        self.cpwer_value = (sub + dele + ins) / num_ref if num_ref else 0.0
+        return self.cpwer_value
+
+    def get_breakdown(self):
+        return self.breakdown
+
+    def save_result(self):
+        path = self.output_dir / "cpwer.txt"
+        with open(path, "w") as f:
+            f.write(f"cpWER: {self.cpwer_value:.4f}\n")
+            if self.breakdown is not None:
+                s, d, i, n = self.breakdown
+                f.write(f"S: {s} D: {d} I: {i} N: {n}\n")
+            for ref_spk, hyp_spk in (self.mapping or {}).items():
+                f.write(f"{ref_spk} -> {hyp_spk}\n")
@@ -0,0 +1,34 @@
+import numpy as np
+
+from analyser.wer.alignment_queries import AlignmentQueries
+from analyser.wer.wer_calculator import WERCalculator
+from results.results_store import ResultsStore
+
+XX_DIALOG = "Ses03F_impro06"
+
+
+def test_turn_distance():
+    speakers = np.array([0, 0, 0, 0, 1, 1, 0], dtype=np.int32)
+    assert AlignmentQueries._turn_distance(speakers).tolist() == [3, 2, 1, 0, 0, 0, 0]
+
+
+def test_errors_near_turns_counts_real_turns_only(dataset_dir, oracle_hypothesis, tmp_path):
+    calculator = WERCalculator(str(tmp_path))
+    calculator.load_inputs(dataset_dir / XX_DIALOG / "transcript_norm.txt", oracle_hypothesis(XX_DIALOG))
+    calculator.preprocess()
+    calculator.calculate(with_alignment=True)
+
+    store = ResultsStore(tmp_path / "results.sqlite")
+    store.save_alignment("s", "c", XX_DIALOG, calculator.alignment,
+                         calculator.reference_text.split(), calculator.hypothesis_text.split(),
+                         calculator.reference_speakers())
+    near = AlignmentQueries.from_store(store, "s").errors_near_turns(window=0)["near"]
+
+    # turn edges of the F / M sequence (FXX / MXX utterances are no new speakers)
+    genders = []
+    for utt_id, text in calculator.reference_utterances:
+        genders.extend(utt_id.rsplit("_", 1)[-1][0] * len(text.split()))
+    genders = np.array(genders)
+    changes = np.flatnonzero(genders[1:] != genders[:-1]) + 1
+    assert near["ref_words"] == len(np.unique(np.concatenate([changes - 1, changes])))
+    assert near["error_rate"] == 0.0
@@ -0,0 +1,53 @@
+from itertools import permutations
+
+import pytest
+
+from analyser.wer.cpwer_calculator import CPWERCalculator
+from analyser.wer.wer_alignment import HirschbergAligner
+
+# Ses03F_impro06 has FXX / MXX overlap utterances, Ses01F_impro01 has none
+XX_DIALOG = "Ses03F_impro06"
+PLAIN_DIALOG = "Ses01F_impro01"
+
+
+@pytest.mark.parametrize("audio_id", [PLAIN_DIALOG, XX_DIALOG])
+def test_reference_against_itself_is_zero(audio_id, dataset_dir, oracle_hypothesis, tmp_path):
+    calculator = CPWERCalculator(str(tmp_path))
+    calculator.load_inputs(dataset_dir / audio_id / "transcript_norm.txt", oracle_hypothesis(audio_id))
+    calculator.preprocess()
+
+    assert sorted(calculator.reference) == ["F", "M"]
+    assert calculator.calculate() == 0.0
+    s, d, i, n = calculator.get_breakdown()
+    assert (s, d, i) == (0, 0, 0) and n > 0
+    assert calculator.mapping == {"F": "SPEAKER_00", "M": "SPEAKER_01"}
+
+
+def _brute_force(reference, hypothesis):
+    """
+    Lowest total edit distance over every speaker mapping
+    """
+    aligner = HirschbergAligner()
+    refs, hyps = list(reference.values()), list(hypothesis.values())
+    size = max(len(refs), len(hyps))
+    refs += [[]] * (size - len(refs))
+    hyps += [[]] * (size - len(hyps))
+    return min(sum(aligner.distance(r, hyps[p]) for r, p in zip(refs, perm))
+               for perm in permutations(range(size)))
+
+
+@pytest.mark.parametrize("hypothesis", [
+    {"SPEAKER_00": "b c d", "SPEAKER_01": "a b c x"},
+    {"SPEAKER_00": "a b c d b c"},
+    {"SPEAKER_00": "a b", "SPEAKER_01": "c", "SPEAKER_02": "b c d z"},
+])
+def test_hungarian_matches_brute_force(hypothesis, tmp_path):
+    calculator = CPWERCalculator(str(tmp_path))
+    calculator.reference = {"F": "a b c".split(), "M": "b c d".split()}
+    calculator.hypothesis = {spk: text.split() for spk, text in hypothesis.items()}
+
+    calculator.calculate()
+    s, d, i, n = calculator.get_breakdown()
+
+    assert n == 6
+    assert s + d + i == _brute_force(calculator.reference, calculator.hypothesis)
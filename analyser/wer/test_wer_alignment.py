@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from analyser.wer.wer_alignment import DEL, INS, MATCH, SUB, HirschbergAligner, WordAlignment
+from analyser.wer.wer_calculator import WERCalculator
+
+
+def _full_dp(ref_words, hyp_words, tmp_path):
+    """
+    Edit distance and breakdown of the full table (WERCalculator)
+    """
+    calculator = WERCalculator(str(tmp_path))
+    calculator.reference_text = " ".join(ref_words)
+    calculator.hypothesis_text = " ".join(hyp_words)
+    calculator.calculate()
+    sub, dele, ins, n = calculator.breakdown
+    return sub + dele + ins, calculator.breakdown
+
+
+def _noisy(rng, words, rate=0.3):
+    out = []
+    for word in words:
+        roll = rng.random()
+        if roll < rate / 3:
+            continue
+        out.append(rng.choice(["x", "y", "z"]) if roll < 2 * rate / 3 else word)
+        if roll > 1 - rate / 3:
+            out.append("w")
+    return out
+
+
+def _assert_valid(alignment, ref_words, hyp_words):
+    ref_used = alignment.ref_idx[alignment.ref_idx >= 0]
+    hyp_used = alignment.hyp_idx[alignment.hyp_idx >= 0]
+    assert ref_used.tolist() == list(range(len(ref_words)))
+    assert hyp_used.tolist() == list(range(len(hyp_words)))
+    for op, r, h in zip(alignment.ops, alignment.ref_idx, alignment.hyp_idx):
+        if op == MATCH:
+            assert ref_words[r] == hyp_words[h]
+        elif op == SUB:
+            assert ref_words[r] != hyp_words[h]
+        elif op == DEL:
+            assert h == -1
+        else:
+            assert op == INS and r == -1
+
+
+@pytest.mark.parametrize("block_cells", [1, 16, 20000])
+def test_hirschberg_distance_equals_full_dp(block_cells, tmp_path):
+    rng = np.random.default_rng(block_cells)
+    aligner = HirschbergAligner(block_cells=block_cells)
+    for _ in range(30):
+        ref = rng.choice(list("abcdefg"), size=rng.integers(0, 40)).tolist()
+        hyp = _noisy(rng, ref)
+        distance, _ = _full_dp(ref, hyp, tmp_path) if ref else (len(hyp), None)
+
+        alignment = aligner.align(ref, hyp)
+        _assert_valid(alignment, ref, hyp)
+        assert alignment.errors == distance
+        assert aligner.distance(ref, hyp) == distance
+
+
+def test_single_block_breakdown_equals_full_dp(tmp_path):
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        ref = rng.choice(list("abcde"), size=rng.integers(1, 30)).tolist()
+        hyp = _noisy(rng, ref)
+        _, breakdown = _full_dp(ref, hyp, tmp_path)
+        # one table, same preference order as WERCalculator._backtrace
+        assert HirschbergAligner(block_cells=10 ** 6).align(ref, hyp).breakdown() == breakdown
+
+
+def test_dialog_alignment_matches_full_dp(dataset_dir, tmp_path):
+    words = " ".join(line.split("\t")[-1] for line in
+                     (dataset_dir / "Ses01F_impro01" / "transcript_norm.txt")
+                     .read_text(encoding="utf-8").splitlines()).split()
+    hyp = _noisy(np.random.default_rng(1), words, rate=0.2)
+    distance, _ = _full_dp(words, hyp, tmp_path)
+
+    alignment = HirschbergAligner(block_cells=500).align(words, hyp)
+    _assert_valid(alignment, words, hyp)
+    assert alignment.errors == distance
+
+
+def test_empty_sides_and_serialisation():
+    assert len(WordAlignment.compute([], [])) == 0
+    assert WordAlignment.compute(["a", "b"], []).breakdown() == (0, 2, 0, 2)
+    assert WordAlignment.compute([], ["a"]).breakdown() == (0, 0, 1, 0)
+
+    alignment = WordAlignment.compute("a b c d".split(), "a x c d e".split())
+    restored = WordAlignment.from_bytes(*alignment.to_bytes())
+    assert restored.ops.tolist() == alignment.ops.tolist()
+    assert restored.anchors().tolist() == alignment.anchors().tolist()
+    assert alignment.breakdown() == (1, 0, 1, 4)
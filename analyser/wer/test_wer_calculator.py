@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from analyser.wer.wer_calculator import WERCalculator
+from analyser.wer.wer_io import WERIO
+
+# Ses03F_impro06 has FXX / MXX overlap utterances, Ses01F_impro01 has none
+XX_DIALOG = "Ses03F_impro06"
+PLAIN_DIALOG = "Ses01F_impro01"
+
+
+@pytest.mark.parametrize("utt_id, speaker", [
+    ("Ses01F_impro01_F000", "F"),
+    ("Ses01F_impro01_M012", "M"),
+    ("Ses03F_impro06_FXX0", "F"),
+    ("Ses03F_impro06_MXX1", "M"),
+])
+def test_utterance_speaker_is_gender_letter(utt_id, speaker):
+    assert WERIO.utterance_speaker(utt_id) == speaker
+
+
+@pytest.mark.parametrize("audio_id", [PLAIN_DIALOG, XX_DIALOG])
+def test_reference_speakers_only_f_and_m(audio_id, dataset_dir, oracle_hypothesis, tmp_path):
+    calculator = WERCalculator(str(tmp_path))
+    calculator.load_inputs(dataset_dir / audio_id / "transcript_norm.txt", oracle_hypothesis(audio_id))
+    calculator.preprocess()
+
+    codes, names = calculator.reference_speakers()
+
+    assert sorted(names) == ["F", "M"]
+    assert len(codes) == len(calculator.reference_text.split())
+    assert set(np.unique(codes).tolist()) == {0, 1}
+
+
+@pytest.mark.parametrize("with_alignment", [False, True])
+def test_oracle_hypothesis_scores_zero(with_alignment, dataset_dir, oracle_hypothesis, tmp_path):
+    calculator = WERCalculator(str(tmp_path))
+    calculator.load_inputs(dataset_dir / XX_DIALOG / "transcript_norm.txt", oracle_hypothesis(XX_DIALOG))
+    calculator.preprocess()
+
+    assert calculator.calculate(with_alignment=with_alignment) == 0.0
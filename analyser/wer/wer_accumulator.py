@@ -0,0 +1,37 @@
+from analyser.base.metric_accumulator import MetricAccumulator
+
+
+class WERAccumulator(MetricAccumulator):
+    """
+    Corpus WER from per audio error counts.
+    ---------------------------------------
+    WER = (S + D + I) / N summed over all audios,
+    instead of aligning one giant concatenated transcript.
+    """
+
+    FIELDS = ("substitutions", "deletions", "insertions", "ref_words")
+
+    def update(self, breakdown):
+        """
+        :param breakdown: (substitutions, deletions, insertions, ref_words)
+                          as returned by WERCalculator.get_breakdown()
+        """
+        s, d, i, n = breakdown
+
+        self.substitutions += s
+        self.deletions += d
+        self.insertions += i
+        self.ref_words += n
+        self.count += 1
+
+        return self
+
+    @property
+    def errors(self) -> int:
+        return self.substitutions + self.deletions + self.insertions
+
+    @property
+    def value(self) -> float:
+        if self.ref_words == 0:
+            return 0.0
+        return self.errors / self.ref_words
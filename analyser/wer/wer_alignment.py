@@ -0,0 +1,185 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+MATCH, SUB, DEL, INS = 0, 1, 2, 3
+OP_NAMES = ("match", "sub", "del", "ins")
+
+
+class WordAlignment:
+    """
+    Word alignment of a reference and a hypothesis as compact arrays.
+    ----------------------------------------------------------------
+    One entry per edit operation, in reading order:
+        ops     : int8  MATCH / SUB / DEL / INS
+        ref_idx : int32 reference token index (-1 for INS)
+        hyp_idx : int32 hypothesis token index (-1 for DEL)
+    Tokens are kept separately (ref_tokens / hyp_tokens) so the
+    arrays stay numeric.
+    """
+
+    def __init__(self, ops, ref_idx, hyp_idx):
+        self.ops = np.asarray(ops, dtype=np.int8)
+        self.ref_idx = np.asarray(ref_idx, dtype=np.int32)
+        self.hyp_idx = np.asarray(hyp_idx, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.ops)
+
+    @classmethod
+    def compute(cls, ref_words: Sequence[str], hyp_words: Sequence[str]) -> "WordAlignment":
+        return HirschbergAligner().align(ref_words, hyp_words)
+
+    def breakdown(self) -> Tuple[int, int, int, int]:
+        """
+        (substitutions, deletions, insertions, N) like WERCalculator
+        """
+        counts = np.bincount(self.ops, minlength=4)
+        return int(counts[SUB]), int(counts[DEL]), int(counts[INS]), int((self.ref_idx >= 0).sum())
+
+    @property
+    def errors(self) -> int:
+        return int((self.ops != MATCH).sum())
+
+    def anchors(self) -> np.ndarray:
+        """
+        Reference position of every op; an insertion takes the index of
+        the reference word before it (0 at the very start)
+        """
+        return np.maximum(np.maximum.accumulate(self.ref_idx), 0) if len(self) else self.ref_idx
+
+    # ---------- SERIALISATION ----------
+
+    def to_bytes(self) -> Tuple[bytes, bytes, bytes]:
+        return self.ops.tobytes(), self.ref_idx.tobytes(), self.hyp_idx.tobytes()
+
+    @classmethod
+    def from_bytes(cls, ops: bytes, ref_idx: bytes, hyp_idx: bytes) -> "WordAlignment":
+        return cls(np.frombuffer(ops, dtype=np.int8),
+                   np.frombuffer(ref_idx, dtype=np.int32),
+                   np.frombuffer(hyp_idx, dtype=np.int32))
+
+
+class HirschbergAligner:
+    """
+    Levenshtein word alignment in linear memory.
+    --------------------------------------------
+    Hirschberg: the forward cost row of the top half of the reference
+    and the backward row of the bottom half give the hypothesis split
+    point of an optimal path; both halves are then aligned recursively.
+    Memory is O(len(hyp)) per level instead of the O(N x M) table, at
+    about twice the DP work.
+
+    A DP row is computed in NumPy: deletions / substitutions from the
+    previous row elementwise, insertions along the row as a running
+    minimum (row[j] = j + cummin(cand[k] - k)). Subproblems up to
+    `block_cells` cells are solved with a full table and backtrace.
+
+    The edit distance always equals the full DP's; among alignments of
+    equal cost the S / D / I split may differ from the table backtrace.
+    """
+
+    def __init__(self, block_cells: int = 20000):
+        self.block_cells = block_cells
+
+    def distance(self, ref_words: Sequence[str], hyp_words: Sequence[str]) -> int:
+        """
+        Edit distance only (one forward pass, no backtrace)
+        """
+        ref, hyp = self._encode(ref_words, hyp_words)
+        return int(self._last_row(ref, hyp)[-1])
+
+    def align(self, ref_words: Sequence[str], hyp_words: Sequence[str]) -> WordAlignment:
+        ref, hyp = self._encode(ref_words, hyp_words)
+
+        ops, ref_idx, hyp_idx = [], [], []
+        # explicit stack: long dialogs would exceed the recursion limit
+        stack = [(0, len(ref), 0, len(hyp))]
+        pieces = []
+        while stack:
+            r0, r1, h0, h1 = stack.pop()
+            n, m = r1 - r0, h1 - h0
+
+            if n == 0 or m == 0 or n * m <= self.block_cells or n == 1:
+                pieces.append((r0, self._solve_block(ref[r0:r1], hyp[h0:h1], r0, h0)))
+                continue
+
+            mid = r0 + n // 2
+            forward = self._last_row(ref[r0:mid], hyp[h0:h1])
+            backward = self._last_row(ref[mid:r1][::-1], hyp[h0:h1][::-1])[::-1]
+            split = h0 + int(np.argmin(forward + backward))
+
+            # bottom half first on the stack: top half is popped first
+            stack.append((mid, r1, split, h1))
+            stack.append((r0, mid, h0, split))
+
+        for _, (o, r, h) in pieces:
+            ops.append(o)
+            ref_idx.append(r)
+            hyp_idx.append(h)
+
+        if not ops:
+            return WordAlignment([], [], [])
+        return WordAlignment(np.concatenate(ops), np.concatenate(ref_idx), np.concatenate(hyp_idx))
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _encode(ref_words, hyp_words):
+        vocab = {}
+        ref = np.array([vocab.setdefault(w, len(vocab)) for w in ref_words], dtype=np.int64)
+        hyp = np.array([vocab.setdefault(w, len(vocab)) for w in hyp_words], dtype=np.int64)
+        return ref, hyp
+
+    @staticmethod
+    def _last_row(ref: np.ndarray, hyp: np.ndarray) -> np.ndarray:
+        """
+        Edit distances of ref against every prefix of hyp
+        """
+        steps = np.arange(len(hyp) + 1)
+        row = steps.copy()
+        for word in ref:
+            cand = np.empty_like(row)
+            cand[0] = row[0] + 1
+            cand[1:] = np.minimum(row[1:] + 1, row[:-1] + (hyp != word))
+            row = steps + np.minimum.accumulate(cand - steps)
+        return row
+
+    @staticmethod
+    def _solve_block(ref: np.ndarray, hyp: np.ndarray, r0: int, h0: int):
+        """
+        Full table + backtrace for a small subproblem (same preference
+        order as WERCalculator._backtrace)
+        """
+        n, m = len(ref), len(hyp)
+        steps = np.arange(m + 1)
+        table = np.empty((n + 1, m + 1), dtype=np.int64)
+        table[0] = steps
+        for i in range(1, n + 1):
+            cand = np.empty(m + 1, dtype=np.int64)
+            cand[0] = table[i - 1, 0] + 1
+            cand[1:] = np.minimum(table[i - 1, 1:] + 1, table[i - 1, :-1] + (hyp != ref[i - 1]))
+            table[i] = steps + np.minimum.accumulate(cand - steps)
+
+        ops: List[int] = []
+        ref_idx: List[int] = []
+        hyp_idx: List[int] = []
+        i, j = n, m
+        while i > 0 or j > 0:
+            if i > 0 and j > 0 and ref[i - 1] == hyp[j - 1] and table[i, j] == table[i - 1, j - 1]:
+                ops.append(MATCH); ref_idx.append(r0 + i - 1); hyp_idx.append(h0 + j - 1)
+                i, j = i - 1, j - 1
+            elif i > 0 and j > 0 and table[i, j] == table[i - 1, j - 1] + 1:
+                ops.append(SUB); ref_idx.append(r0 + i - 1); hyp_idx.append(h0 + j - 1)
+                i, j = i - 1, j - 1
+            elif i > 0 and table[i, j] == table[i - 1, j] + 1:
+                ops.append(DEL); ref_idx.append(r0 + i - 1); hyp_idx.append(-1)
+                i -= 1
+            else:
+                ops.append(INS); ref_idx.append(-1); hyp_idx.append(h0 + j - 1)
+                j -= 1
+
+        return (np.array(ops[::-1], dtype=np.int8),
+                np.array(ref_idx[::-1], dtype=np.int32),
+                np.array(hyp_idx[::-1], dtype=np.int32))
@@ -1,4 +1,7 @@
+import numpy as np
+
 from analyser.base.analyser_base import AnalyserBase
+from analyser.wer.wer_alignment import WordAlignment
 from analyser.wer.wer_io import WERIO
 from analyser.wer.wer_preprocessor import WERPreprocessor
 
@@ -13,33 +16,47 @@ class WERCalculator(AnalyserBase):
         self.reference_text = None
         self.hypothesis_text = None
         self.wer_value = None
+        self.breakdown = None
+        self.alignment = None
+        self.reference_utterances = None
 
     def load_inputs(self, ref_path: str, hyp_path: str):
-        self.reference_text = WERIO.load_reference(ref_path)
-        self.hypothesis_text = WERIO.load_hypothesis_from_json(hyp_path)
+        io = WERIO()
+        self.reference_utterances = io.load_reference_utterances(ref_path)
+        self.reference_text = " ".join(text for _, text in self.reference_utterances)
+        self.hypothesis_text = io.load_hypothesis_from_json(hyp_path)
 
     def preprocess(self):
         """
         Preprocessing
         """
-        self.reference_text = WERPreprocessor.normalize_reference(self.reference_text)
-        self.hypothesis_text = WERPreprocessor.normalize_hypothesis(self.hypothesis_text)
+        preprocessor = WERPreprocessor()
+        self.reference_text = preprocessor.normalize_reference(self.reference_text)
+        self.hypothesis_text = preprocessor.normalize_hypothesis(self.hypothesis_text)
 
-    def calculate(self):
+    def calculate(self, with_alignment: bool = False):
         """
         Calculate WER using edit distance.
+        with_alignment: linear memory Hirschberg alignment instead of the
+        full table, kept in self.alignment (breakdown taken from it)
         """
         ref_words = self.reference_text.split()
         hyp_words = self.hypothesis_text.split()
 
+        if with_alignment:
+            self.alignment = WordAlignment.compute(ref_words, hyp_words)
+            self.breakdown = self.alignment.breakdown()
+            self.wer_value = self.alignment.errors / len(ref_words) if ref_words else 0.0
+            return self.wer_value
+
         N = len(ref_words)
         if N ==0:
             self.wer_value = 0.0
-            return
+            self.breakdown = (0, 0, len(hyp_words), 0)
+            return self.wer_value
         
         #DP edit distance
         dp = [[0] *(len(hyp_words)+1)for _ in range(len(ref_words)+1)]
-        print("your dp is : ", dp)
         for i in range(len(ref_words)+1):
             dp[i][0] = i
         for j in range(len(hyp_words)+1):
@@ -56,56 +73,69 @@ class WERCalculator(AnalyserBase):
                         dp[i-1][j-1]    #substitution
                         )
         self.wer_value = dp[len(ref_words)][len(hyp_words)]/N
+        self.breakdown = self._backtrace(dp, ref_words, hyp_words)
         return self.wer_value
-        
-    def get_ref_token(self):
-        return self.reference_text
 
-    def get_hyp_token(self):
-        return self.hypothesis_text
-        
-class WERcalculator_overall:
+    def _backtrace(self, dp, ref_words, hyp_words):
+        """
+        Walk back through the DP table and count the edit operations.
+        Returns (substitutions, deletions, insertions, N)
+        """
+        i, j = len(ref_words), len(hyp_words)
+        sub = dele = ins = 0
 
-    def __init__(self,ref,hyp):
-        self.ref = ref
-        self.hyp = hyp
-        self.wer = 0.0
+        while i > 0 or j > 0:
+            if i > 0 and j > 0 and ref_words[i-1] == hyp_words[j-1] and dp[i][j] == dp[i-1][j-1]:
+                i, j = i - 1, j - 1
+            elif i > 0 and j > 0 and dp[i][j] == dp[i-1][j-1] + 1:
+                sub += 1
+                i, j = i - 1, j - 1
+            elif i > 0 and dp[i][j] == dp[i-1][j] + 1:
+                dele += 1
+                i -= 1
+            else:
+                ins += 1
+                j -= 1
 
-    def preprocess(self):
-        self.ref = WERPreprocessor.normalize_reference(self.ref)
-        self.hyp = WERPreprocessor.normalize_hypothesis(self.hyp)
+        return sub, dele, ins, len(ref_words)
 
-    def calculate(self):
+    def reference_speakers(self):
         """
-        Calculate WER using edit distance only for overall calculation.
+        (speaker code per reference token, speaker names) from the
+        utterance ids (Ses01F_impro01_F000 -> F); None when the tokens
+        cannot be matched to utterances
         """
-        ref_words = self.ref.split()
-        hyp_words = self.hyp.split()
+        if not self.reference_utterances:
+            return None
 
-        N = len(ref_words)
-        if N ==0:
-            self.wer = 0.0
-            return
+        normalizer = WERPreprocessor()
+        names, codes = [], []
+        for utt_id, text in self.reference_utterances:
+            speaker = WERIO.utterance_speaker(utt_id)
+            if speaker not in names:
+                names.append(speaker)
+            codes.extend([names.index(speaker)] * len(normalizer.normalize_reference(text).split()))
+
+        if len(codes) != len(self.reference_text.split()):
+            return None
+        return np.array(codes, dtype=np.int32), names
+
+    def get_breakdown(self):
+        """
+        (substitutions, deletions, insertions, N) of the last calculate()
+        """
+        return self.breakdown
         
-        #DP edit distance
-        dp = [[0] *(len(hyp_words)+1)for _ in range(len(ref_words)+1)]
-        print("your dp is : ", dp)
-        for i in range(len(ref_words)+1):
-            dp[i][0] = i
-        for j in range(len(hyp_words)+1):
-            dp[0][j] = j
+    def save_result(self):
+        path = self.output_dir / "wer.txt"
+        with open(path, "w") as f:
+            f.write(f"WER: {self.wer_value:.4f}\n")
+            if self.breakdown is not None:
+                s, d, i, n = self.breakdown
+                f.write(f"S: {s} D: {d} I: {i} N: {n}\n")
 
+    def get_ref_token(self):
+        return self.reference_text
 
-        for i in range (1,len(ref_words)+1):
-            for j in range(1,len(hyp_words)+1):
-                if ref_words[i-1] ==hyp_words[j-1]:
-                    dp[i][j] = dp[i-1][j-1]
-                else:
-                    dp[i][j] = 1+min(
-                        dp[i-1][j],     #deletion
-                        dp[i][j-1],     #insertion
-                        dp[i-1][j-1]    #substitution
-                        )
-        self.wer = dp[len(ref_words)][len(hyp_words)]/N
-        return self.wer
-    
+    def get_hyp_token(self):
+        return self.hypothesis_text
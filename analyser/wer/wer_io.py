@@ -1,6 +1,9 @@
-import json
 from pathlib import Path
+
+import numpy as np
+
 from analyser.base.file_manager import FileManager
+from analyser.utils.hypothesis_file import HypothesisFile
 
 
 class WERIO:
@@ -8,7 +11,22 @@ class WERIO:
     Loads reference TXT and hypothesis JSON.
     """
 
+    @staticmethod
+    def utterance_speaker(utt_id: str) -> str:
+        """
+        Reference speaker of an IEMOCAP utterance: the gender letter of
+        its tag, as in DERIO (Ses01F_impro01_F000 -> F; the FXX0 / MXX0
+        tags of unscripted overlaps are the same F / M speakers)
+        """
+        return utt_id.rsplit("_", 1)[-1][0]
+
     def load_reference(self, txt_path: Path) -> str:
+        return " ".join(text for _, text in self.load_reference_utterances(txt_path))
+
+    def load_reference_utterances(self, txt_path: Path) -> list:
+        """
+        [(utterance id, text), ...] in file order
+        """
         FileManager.validate_file(txt_path)
 
         texts = []
@@ -22,7 +40,7 @@ class WERIO:
             if "\t" in line:
                 parts = line.split("\t")
                 if len(parts) >= 4:
-                    texts.append(parts[-1])
+                    texts.append((parts[0], parts[-1]))
                     continue
 
             # 2️⃣ Fallback: split by spaces (last token(s) as text)
@@ -30,29 +48,57 @@ class WERIO:
             if len(parts) >= 4:
                 # assume first 3 are: utt_id, start, end
                 text = " ".join(parts[3:])
-                texts.append(text)
+                texts.append((parts[0], text))
+
+        return texts
 
-        return " ".join(texts)
 
+    def load_hypothesis_by_speaker(self, json_path: Path) -> dict:
+        """
+        {speaker: text} of a WhisperX result: words grouped by the speaker
+        assign_word_speakers put on them (segment speaker for words
+        without one, UNKNOWN without diarization), in reading order
+        """
+        FileManager.validate_file(json_path)
+
+        with HypothesisFile.open(json_path) as hypothesis:
+            seg_speakers = hypothesis.segment_speakers()
+            seg_texts = hypothesis.segment_texts()
+            word_seg = hypothesis.word_segments()
+            word_speakers = hypothesis.word_speakers()
+            word_texts = hypothesis.word_texts()
+        has_words = np.bincount(word_seg, minlength=len(seg_speakers)) > 0
+
+        words = {}
+        w = 0
+        for k, text in enumerate(seg_texts):
+            fallback = seg_speakers[k] or "UNKNOWN"
+            if has_words[k]:
+                while w < len(word_seg) and word_seg[w] == k:
+                    words.setdefault(word_speakers[w] or fallback, []).append(word_texts[w])
+                    w += 1
+            elif text.strip():
+                words.setdefault(fallback, []).append(text.strip())
+
+        return {speaker: " ".join(w) for speaker, w in words.items()}
 
     def load_hypothesis_from_json(self, json_path: Path) -> str:
-            """
-            Load WhisperX JSON and extract hypothesis text.
-            """
-            FileManager.validate_file(json_path)
+        """
+        Load WhisperX JSON and extract hypothesis text.
+        """
+        FileManager.validate_file(json_path)
 
-            data = json.loads(json_path.read_text(encoding="utf-8"))
+        # WhisperX result (.npz / .json): one text per segment
+        texts = []
 
-            # WhisperX JSON structure:
-            # data["segments"] -> list of segments
-            # each segment has "text"
-            texts = []
+        with HypothesisFile.open(json_path) as hypothesis:
+            segment_texts = hypothesis.segment_texts()
 
-            for segment in data.get("segments", []):
-                text = segment.get("text", "").strip()
-                if text:
-                    texts.append(text)
+        for text in segment_texts:
+            text = text.strip()
+            if text:
+                texts.append(text)
 
-            # concatenate all segments into one string
-            return " ".join(texts)
+        # concatenate all segments into one string
+        return " ".join(texts)
 
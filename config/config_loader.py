@@ -1,5 +1,8 @@
 import pandas as pd
 from pathlib import Path
+from typing import Optional
+
+from config.sweep_spec import SweepSpec
 
 
 class ConfigLoader:
@@ -9,6 +12,9 @@ class ConfigLoader:
     config from a clean Excel file.
     One row = one configuration
     Blank cells = use default values.
+
+    A .yaml / .yml / .toml file is read as a SweepSpec instead and
+    its configs are generated on the fly.
     """
 
     def __init__(self, excel_path: str):
@@ -17,22 +23,36 @@ class ConfigLoader:
         ----------------------------------
 
         :param self: Object itself
-        :param excel_path: Path for Config.xlsx
+        :param excel_path: Path for Config.xlsx (or a sweep spec)
         :type excel_path: string
         """
         self.excel_path = Path(excel_path)
         if not self.excel_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.excel_path}")
 
-    def load_configs(self, start_id: str, end_id: str):
+        self.spec = None
+        if self.excel_path.suffix.lower() in SweepSpec.SUFFIXES:
+            self.spec = SweepSpec.load(self.excel_path)
+
+    def load_configs(self, start_id: Optional[str] = None, end_id: Optional[str] = None):
         """
         Loads the Configuration in range start, end:
         -------------------------------------------
 
-        :param start_id: Starting configuration
-        :param end_id: Ending configuration
+        :param start_id: Starting configuration (None = first)
+        :param end_id: Ending configuration (None = last)
+        """
+        return list(self.iter_configs(start_id, end_id))
+
+    def iter_configs(self, start_id: Optional[str] = None, end_id: Optional[str] = None):
         """
+        Same as load_configs, one config at a time
+        """
+        if self.spec is not None:
+            return self._spec_range(self.spec.iter_configs(), start_id, end_id)
+        return iter(self._excel_configs(start_id, end_id))
 
+    def _excel_configs(self, start_id, end_id):
         df = pd.read_excel(self.excel_path)
 
         if "config_id" not in df.columns:
@@ -40,6 +60,9 @@ class ConfigLoader:
 
         df = df.set_index("config_id")
 
+        start_id = df.index[0] if start_id is None else start_id
+        end_id = df.index[-1] if end_id is None else end_id
+
         if start_id not in df.index:
             raise ValueError(f"Start config not found: {start_id}")
 
@@ -68,6 +91,30 @@ class ConfigLoader:
 
         return configs
 
+    @staticmethod
+    def _spec_range(configs, start_id, end_id):
+        """
+        Generated configs from start_id to end_id (either order),
+        without generating past the second one
+        """
+        bounds = {b for b in (start_id, end_id) if b is not None}
+        inside = start_id is None
+        seen = set()
+
+        for cfg in configs:
+            cfg_id = cfg["config_id"]
+            if cfg_id in bounds:
+                seen.add(cfg_id)
+                inside = True
+            if inside:
+                yield cfg
+            if end_id is not None and seen == bounds:
+                return
+
+        missing = bounds - seen
+        if missing:
+            raise ValueError(f"Config not found in sweep spec: {sorted(missing)}")
+
     
 # if __name__ == "__main__":
 #     a = ConfigLoader(r"S:\Sambhav's Project\Config.xlsx")
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import numbers
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def effective_config(params: dict) -> dict:
+    """
+    What a spreadsheet row actually runs with: defaults filled in,
+    Excel types normalised, keys the models ignore dropped, values in
+    one canonical form (5 / 5.0 / "5" -> 5.0, " large-v2 " -> "large-v2")
+    """
+    from whisperx_core.config_applier import ConfigApplier
+    from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+    config = ConfigApplier.normalize(WhisperXConfigurator().configure(params))
+
+    canonical = {}
+    for key, value in config.items():
+        if key in ConfigApplier.UNSUPPORTED:
+            continue
+        if isinstance(value, bool) or key in ConfigApplier.INT_KEYS:
+            canonical[key] = value
+        elif isinstance(value, numbers.Real):
+            canonical[key] = float(value)
+        elif isinstance(value, str):
+            canonical[key] = _number_or_text(value.strip())
+        else:
+            canonical[key] = value
+    return canonical
+
+
+def config_hash(params: dict) -> str:
+    raw = json.dumps(effective_config(params), sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _number_or_text(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class ConfigPlanner:
+    """
+    Runs every distinct effective config once.
+    ------------------------------------------
+    Blank cells fall back to WhisperXConfigurator.DEFAULTS, so rows
+    that leave a cell empty and rows that restate its default value
+    (or only change ConfigApplier.UNSUPPORTED keys, with a warning)
+    resolve to the same config. Those rows are collapsed onto the
+    first of them (the representative), which carries the others as
+    "aliases"; the ExperimentManager copies the representative's
+    results to every alias.
+    """
+
+    def __init__(self):
+        self.groups = []
+
+    # ---------- PUBLIC API ----------
+
+    def plan(self, configs: List[Dict]) -> List[Dict]:
+        """
+        Unique configs (first row of each group, sheet order), each
+        with "config_hash" and "aliases" (config_ids run by it)
+        """
+        from whisperx_core.config_applier import ConfigApplier
+
+        by_hash = {}
+        for cfg in configs:
+            by_hash.setdefault(config_hash(cfg["params"]), []).append(cfg)
+
+        default_hash = config_hash({})
+        planned, self.groups = [], []
+        for digest, members in by_hash.items():
+            # a repeated config_id is the same row again, not an alias:
+            # copying a config onto itself would mark its own rows alias_of
+            first = {}
+            for m in members:
+                first.setdefault(m["config_id"], m)
+            members = list(first.values())
+
+            # keys whose values differ inside the group but never reach the models
+            ignored = [key for key in ConfigApplier.UNSUPPORTED
+                       if len({str(m["params"].get(key)) for m in members}) > 1]
+            representative = dict(members[0],
+                                  config_hash=digest,
+                                  aliases=[m["config_id"] for m in members[1:]])
+            planned.append(representative)
+            self.groups.append({
+                "config_hash": digest,
+                "config_ids": [m["config_id"] for m in members],
+                "is_default": digest == default_hash,
+                "ignored": ignored,
+            })
+
+        self._report(len(configs))
+        return planned
+
+    def collapsed(self) -> List[Dict]:
+        """
+        Groups of more than one row, from the last plan()
+        """
+        return [g for g in self.groups if len(g["config_ids"]) > 1]
+
+    # ---------- HELPERS ----------
+
+    def _report(self, num_rows: int):
+        for group in self.collapsed():
+            if group["ignored"]:
+                logger.warning("[DEDUP] %s collapsed onto %s: %s has no counterpart in the "
+                               "installed whisperx and cannot tell them apart",
+                               ", ".join(group["config_ids"][1:]), group["config_ids"][0],
+                               ", ".join(group["ignored"]))
+            logger.info("[DEDUP] %s run once as %s (effective config %s%s)",
+                        ", ".join(group["config_ids"][1:]), group["config_ids"][0],
+                        group["config_hash"], ", = defaults" if group["is_default"] else "")
+        for group in self.groups:
+            if group["is_default"] and len(group["config_ids"]) == 1:
+                logger.info("[DEDUP] %s only restates the defaults", group["config_ids"][0])
+
+        logger.info("Config plan: %d rows -> %d distinct effective configs",
+                    num_rows, len(self.groups))
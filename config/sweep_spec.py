@@ -0,0 +1,219 @@
+import itertools
+import json
+import logging
+import math
+import random
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from config.config_planner import config_hash
+
+logger = logging.getLogger(__name__)
+
+
+class SweepSpec:
+    """
+    Declarative sweep: configs generated from a YAML / TOML file.
+    ------------------------------------------------------------
+    One sweep, or several under `sweeps:` (generated one after the
+    other):
+
+        name: vad_grid                  # config id prefix
+        base:                           # fixed params of every config
+          whisper_model: large-v2
+        axes:                           # blocks, crossed with each other
+          - grid:                       # cartesian product
+              beam_size: [1, 5]
+              Clustering_threshold: {start: 0.5, stop: 0.9, num: 5}
+          - zip:                        # lockstep, equal lengths
+              vad_onset: [0.5, 0.6, 0.7]
+              vad_offset: [0.3, 0.4, 0.5]
+          - random:                     # seeded samples
+              samples: 20
+              seed: 0
+              params:
+                vad_onset: {uniform: [0.3, 0.9]}
+                beam_size: {choice: [1, 2, 5]}
+        when:                           # conditional params, in order
+          - if: {whisper_model: [small, medium]}
+            set: {compute_type: int8}
+        exclude:                        # drop matching combinations
+          - {beam_size: 1, whisper_model: large-v2}
+
+    Values are WhisperXConfigurator keys; a list in `if` / `exclude`
+    matches any of its values. Configs are produced lazily, so a grid
+    of 5 x 20 x 20 is never held as rows anywhere. The id of a config
+    is <name>_<hash of its effective config> (ConfigPlanner), stable
+    across runs and independent of the position in the grid.
+    """
+
+    SUFFIXES = (".yaml", ".yml", ".toml")
+
+    def __init__(self, spec: dict):
+        self.sweeps = spec.get("sweeps") or [spec]
+        for sweep in self.sweeps:
+            self._validate(sweep)
+
+    @classmethod
+    def load(cls, path) -> "SweepSpec":
+        path = Path(path)
+        suffix = path.suffix.lower()
+
+        if suffix == ".toml":
+            import tomllib
+            with open(path, "rb") as f:
+                spec = tomllib.load(f)
+        elif suffix in (".yaml", ".yml"):
+            import yaml
+            spec = yaml.safe_load(path.read_text(encoding="utf-8"))
+        else:
+            raise ValueError(f"Unsupported sweep spec: {path} (expected {cls.SUFFIXES})")
+
+        if not isinstance(spec, dict):
+            raise ValueError(f"Sweep spec must be a mapping: {path}")
+        return cls(spec)
+
+    # ---------- PUBLIC API ----------
+
+    def iter_configs(self) -> Iterator[Dict]:
+        """
+        {"config_id", "params"} per generated config, sheet order.
+        Combinations that resolve to an already generated config
+        (repeated random samples or zip rows, 5 / 5.0 / "5") are
+        skipped: the id is the effective config, so they are one run
+        """
+        seen = set()
+        for sweep in self.sweeps:
+            name = sweep.get("name", "sweep")
+            base = dict(sweep.get("base", {}))
+            blocks = [self._expand(block) for block in sweep.get("axes", [])]
+
+            for combination in itertools.product(*blocks):
+                params = dict(base)
+                for values in combination:
+                    params.update(values)
+                params = self._apply_conditions(params, sweep.get("when", []))
+
+                if any(self._matches(params, rule) for rule in sweep.get("exclude", [])):
+                    continue
+
+                config_id = f"{name}_{config_hash(params)}"
+                if config_id in seen:
+                    continue
+                seen.add(config_id)
+                yield {"config_id": config_id, "params": params}
+
+    def size(self) -> int:
+        """
+        Upper bound of the number of configs (before exclude and
+        duplicates)
+        """
+        total = 0
+        for sweep in self.sweeps:
+            total += math.prod(len(self._expand(block)) for block in sweep.get("axes", []))
+        return total
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _validate(sweep: dict):
+        from whisperx_core.config_applier import ConfigApplier
+
+        for block in sweep.get("axes", []):
+            if not isinstance(block, dict) or len(block) != 1:
+                raise ValueError(f"Axis block needs exactly one of grid / zip / random: {block}")
+            kind, body = next(iter(block.items()))
+            if kind not in ("grid", "zip", "random"):
+                raise ValueError(f"Unknown axis block '{kind}'")
+            keys = body.get("params", {}) if kind == "random" else body
+            ignored = sorted(set(keys) & set(ConfigApplier.UNSUPPORTED))
+            if ignored:
+                raise ValueError(f"Cannot sweep {ignored}: no counterpart in the installed "
+                                 "whisperx, every value would run the same config")
+
+    def _expand(self, block: dict) -> List[Dict]:
+        """
+        One axis block -> list of partial param dicts (small: the
+        product of blocks is what gets big, and that stays lazy)
+        """
+        kind, body = next(iter(block.items()))
+
+        if kind == "grid":
+            keys = list(body)
+            values = [self._values(body[k]) for k in keys]
+            return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+        if kind == "zip":
+            keys = list(body)
+            values = [self._values(body[k]) for k in keys]
+            if len({len(v) for v in values}) > 1:
+                raise ValueError(f"zip axes need equal lengths: { {k: len(v) for k, v in zip(keys, values)} }")
+            return [dict(zip(keys, combo)) for combo in zip(*values)]
+
+        rng = random.Random(body.get("seed", 0))
+        params = body["params"]
+        return [{k: self._sample(rng, k, params[k]) for k in params}
+                for _ in range(int(body["samples"]))]
+
+    @staticmethod
+    def _values(axis) -> list:
+        """
+        [a, b, c] | scalar | {start, stop, num} (inclusive linspace)
+        | {start, stop, step}
+        """
+        if isinstance(axis, list):
+            return axis
+        if not isinstance(axis, dict):
+            return [axis]
+
+        start, stop = float(axis["start"]), float(axis["stop"])
+        if "num" in axis:
+            num = int(axis["num"])
+            if num == 1:
+                return [start]
+            return [round(start + i * (stop - start) / (num - 1), 10) for i in range(num)]
+
+        step = float(axis["step"])
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+
+    @staticmethod
+    def _sample(rng: random.Random, key: str, dist):
+        if not isinstance(dist, dict) or len(dist) != 1:
+            raise ValueError(f"Random param '{key}' needs one of uniform / loguniform / randint / choice")
+        kind, args = next(iter(dist.items()))
+
+        if kind == "uniform":
+            return round(rng.uniform(*args), 6)
+        if kind == "loguniform":
+            low, high = args
+            return round(math.exp(rng.uniform(math.log(low), math.log(high))), 6)
+        if kind == "randint":
+            return rng.randint(*args)
+        if kind == "choice":
+            return rng.choice(args)
+        raise ValueError(f"Unknown distribution '{kind}' for '{key}'")
+
+    def _apply_conditions(self, params: dict, rules: list) -> dict:
+        for rule in rules:
+            if self._matches(params, rule["if"]):
+                params = dict(params, **rule["set"])
+        return params
+
+    @staticmethod
+    def _matches(params: dict, condition: dict) -> bool:
+        from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+        for key, expected in condition.items():
+            value = params.get(key, WhisperXConfigurator.DEFAULTS.get(key))
+            options = expected if isinstance(expected, list) else [expected]
+            if not any(_same(value, option) for option in options):
+                return False
+        return True
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) \
+            and not isinstance(a, bool) and not isinstance(b, bool):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return json.dumps(a) == json.dumps(b)
@@ -0,0 +1,56 @@
+from config.config_planner import ConfigPlanner, config_hash, effective_config
+
+
+def test_blank_and_restated_defaults_share_a_hash():
+    from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+    defaults = {"beam_size": WhisperXConfigurator.DEFAULTS["beam_size"]}
+    assert config_hash({}) == config_hash(defaults)
+    assert config_hash({"beam_size": 5}) == config_hash({"beam_size": "5"}) == config_hash({"beam_size": 5.0})
+
+
+def test_planner_never_aliases_a_config_to_itself():
+    configs = [{"config_id": "a", "params": {"beam_size": 5}},
+               {"config_id": "a", "params": {"beam_size": 5.0}},
+               {"config_id": "b", "params": {"beam_size": "5"}}]
+
+    planned = ConfigPlanner().plan(configs)
+
+    assert len(planned) == 1
+    assert planned[0]["config_id"] == "a"
+    assert planned[0]["aliases"] == ["b"]
+
+
+def test_effective_config_canonical_values():
+    config = effective_config({"vad_onset": "0.5", "whisper_model": " large-v2 ", "beam_size": "3"})
+    assert config["vad_onset"] == 0.5
+    assert config["whisper_model"] == "large-v2"
+    assert config["beam_size"] == 3
+    assert "seg_stich_threshold" not in config
+
+
+def test_ignored_keys_and_distinct_configs():
+    configs = [{"config_id": "base", "params": {}},
+               {"config_id": "stitch", "params": {"seg_stich_threshold": 0.3}},
+               {"config_id": "onset", "params": {"vad_onset": 0.5}},
+               {"config_id": "onset_str", "params": {"vad_onset": "0.50"}}]
+
+    planner = ConfigPlanner()
+    planned = planner.plan(configs)
+
+    assert [(c["config_id"], c["aliases"]) for c in planned] == [("base", ["stitch"]), ("onset", ["onset_str"])]
+    groups = planner.collapsed()
+    assert [g["config_ids"] for g in groups] == [["base", "stitch"], ["onset", "onset_str"]]
+    assert [g["is_default"] for g in groups] == [True, False]
+    assert [g["ignored"] for g in groups] == [["seg_stich_threshold"], []]
+
+
+def test_rows_differing_in_unsupported_keys_are_collapsed_with_a_warning(caplog):
+    configs = [{"config_id": "s1", "params": {"seg_stich_threshold": 0.1}},
+               {"config_id": "s2", "params": {"seg_stich_threshold": 0.5}}]
+
+    with caplog.at_level("WARNING"):
+        planned = ConfigPlanner().plan(configs)
+
+    assert [(c["config_id"], c["aliases"]) for c in planned] == [("s1", ["s2"])]
+    assert "seg_stich_threshold" in caplog.text
@@ -0,0 +1,62 @@
+import pytest
+
+from config.sweep_spec import SweepSpec
+
+
+def _ids(spec):
+    return [cfg["config_id"] for cfg in SweepSpec(spec).iter_configs()]
+
+
+def test_grid_is_cartesian_product():
+    configs = list(SweepSpec({
+        "name": "g",
+        "axes": [{"grid": {"beam_size": [1, 5], "Clustering_threshold": {"start": 0.5, "stop": 0.7, "num": 3}}}],
+    }).iter_configs())
+
+    assert len(configs) == 6
+    assert len({cfg["config_id"] for cfg in configs}) == 6
+    assert all(cfg["config_id"].startswith("g_") for cfg in configs)
+    assert [cfg["params"]["Clustering_threshold"] for cfg in configs[:3]] == [0.5, 0.6, 0.7]
+
+
+def test_zip_needs_equal_lengths():
+    with pytest.raises(ValueError):
+        _ids({"axes": [{"zip": {"vad_onset": [0.5, 0.6], "vad_offset": [0.3]}}]})
+
+
+def test_exclude_and_when():
+    configs = list(SweepSpec({
+        "axes": [{"grid": {"whisper_model": ["small", "large-v2"], "beam_size": [1, 5]}}],
+        "when": [{"if": {"whisper_model": "small"}, "set": {"compute_type": "int8"}}],
+        "exclude": [{"beam_size": 1, "whisper_model": "large-v2"}],
+    }).iter_configs())
+
+    assert len(configs) == 3
+    for cfg in configs:
+        assert (cfg["params"].get("compute_type") == "int8") == (cfg["params"]["whisper_model"] == "small")
+
+
+def test_ids_are_stable():
+    spec = {"axes": [{"random": {"samples": 5, "seed": 3, "params": {"vad_onset": {"uniform": [0.3, 0.9]}}}}]}
+    assert _ids(spec) == _ids(spec)
+
+
+@pytest.mark.parametrize("spec", [
+    # repeated random choices
+    {"name": "r", "axes": [{"random": {"samples": 6, "seed": 0, "params": {"beam_size": {"choice": [1, 5]}}}}]},
+    # repeated zip rows
+    {"name": "z", "axes": [{"zip": {"beam_size": [1, 5, 1], "vad_onset": [0.5, 0.6, 0.5]}}]},
+    # grid values equal after normalisation
+    {"name": "n", "axes": [{"grid": {"beam_size": [5, 5.0, "5"]}}]},
+])
+def test_no_duplicate_config_ids(spec):
+    ids = _ids(spec)
+    assert len(ids) == len(set(ids))
+    assert len(ids) <= 2
+
+
+def test_unsupported_keys_cannot_be_swept():
+    with pytest.raises(ValueError, match="seg_stich_threshold"):
+        SweepSpec({"axes": [{"grid": {"seg_stich_threshold": [0.1, 0.5]}}]})
+    with pytest.raises(ValueError, match="seg_stich_threshold"):
+        SweepSpec({"axes": [{"random": {"samples": 2, "params": {"seg_stich_threshold": {"uniform": [0, 1]}}}}]})
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+import pytest
+
+DATASET_DIR = Path(__file__).resolve().parent / "Dataset_IEMOCAP"
+
+
+@pytest.fixture
+def dataset_dir():
+    return DATASET_DIR
+
+
+@pytest.fixture
+def oracle_hypothesis(tmp_path):
+    """
+    Writes the reference transcript of a dialog as a WhisperX result
+    (one segment per utterance, SPEAKER_00 = F, SPEAKER_01 = M) and
+    returns its path: scoring it must give no errors
+    """
+    def write(audio_id: str) -> Path:
+        segments = []
+        for line in (DATASET_DIR / audio_id / "transcript_norm.txt").read_text(encoding="utf-8").splitlines():
+            parts = line.split("\t")
+            if len(parts) < 4:
+                continue
+            utt_id, start, end, text = parts[0], float(parts[1]), float(parts[2]), parts[-1]
+            speaker = "SPEAKER_00" if utt_id.rsplit("_", 1)[-1].startswith("F") else "SPEAKER_01"
+            tokens = text.split()
+            step = (end - start) / max(len(tokens), 1)
+            segments.append({
+                "start": start, "end": end, "text": text, "speaker": speaker,
+                "words": [{"word": token, "start": start + k * step, "end": start + (k + 1) * step,
+                           "speaker": speaker} for k, token in enumerate(tokens)],
+            })
+
+        path = tmp_path / f"{audio_id}.json"
+        path.write_text(json.dumps({"segments": segments, "language": "en"}), encoding="utf-8")
+        return path
+
+    return write
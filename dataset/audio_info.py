@@ -5,9 +5,12 @@ to cheack
         ->sample rate
         ->corruption
 """
+import logging
 import os
 import soundfile as sf
 
+logger = logging.getLogger(__name__)
+
 class AudioInfo:
     """
     Reads and store basic information about audio file.
@@ -41,11 +44,11 @@ class AudioInfo:
         """
 
         if not os.path.exists(self.audio_path):
-            print("Audio file doesnt exist on disk")
+            logger.warning("Audio file doesnt exist on disk: %s", self.audio_path)
             return False
         elif not self.is_supported_formate():
-            print(f"[Audio_info] unsupported file formate for: {self.audio_path}")
-            print(f"[AudioInfo] Supported formates: {self.SUPPORTED_EXTENSIONS}")
+            logger.warning("unsupported file formate for: %s (supported: %s)",
+                           self.audio_path, self.SUPPORTED_EXTENSIONS)
             return False
         
 
@@ -59,7 +62,7 @@ class AudioInfo:
 
             return True
         except Exception as e:
-            print(f"[Audio_info] Failed to read audio file: {e}")
+            logger.warning("Failed to read audio file %s: %s", self.audio_path, e)
             return False
         
     def pretty_print(self):
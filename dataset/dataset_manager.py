@@ -1,4 +1,15 @@
+import hashlib
+import json
+import random
+import re
+from collections import Counter
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dataset.duration_cache import DurationCache
+
 
 class DatasetManager:
     """
@@ -8,8 +19,12 @@ class DatasetManager:
     return audio file paths in a clean way.
     """
 
-    def __init__(self, dataset_root: str):
+    # Ses01F_impro01, Ses03M_script02_1, ...
+    NAME_PATTERN = re.compile(r"^Ses(?P<session>\d+)(?P<gender>[FM])_(?P<kind>impro|script)")
+
+    def __init__(self, dataset_root: str, durations: Optional[DurationCache] = None):
         self.dataset_root = Path(dataset_root)
+        self.durations = durations
         
 
     def list_audio_ids(self):
@@ -46,6 +61,114 @@ class DatasetManager:
         """
         return [self.get_audio_info(aid) for aid in self.list_audio_ids()]
 
+    def describe(self, audio_id: str) -> dict:
+        """
+        Strata of one dialog: session, impro / script, gender of the
+        session's recorded actor (F / M in the name) and duration (s)
+        """
+        match = self.NAME_PATTERN.match(audio_id)
+        return {
+            "audio_id": audio_id,
+            "session": f"Ses{match['session']}" if match else None,
+            "kind": match["kind"] if match else None,
+            "gender": match["gender"] if match else None,
+            "duration": self.get_duration(audio_id),
+        }
+
+    def get_duration(self, audio_id: str) -> Optional[float]:
+        """
+        Wav duration (via the DurationCache when given), else the end
+        of the last reference turn
+        """
+        folder = self.dataset_root / audio_id
+
+        wav_files = list(folder.glob("*.wav"))
+        if wav_files:
+            if self.durations is not None:
+                return self.durations.get(wav_files[0])
+            from dataset.audio_info import AudioInfo
+            info = AudioInfo(str(wav_files[0]))
+            return info.duration if info.analyze() else None
+
+        from analyser.utils.rttm import RTTM
+        for rttm_path in folder.glob("*.rttm"):
+            table = RTTM.read(rttm_path)
+            if len(table):
+                return float(table.ends.max())
+        return None
+
+    def select_subset(self,
+                      fraction: Optional[float] = None,
+                      minutes: Optional[float] = None,
+                      seed: int = 0,
+                      strata: Sequence[str] = ("session", "kind", "gender")) -> dict:
+        """
+        Reproducible stratified subset for quick config screening
+        ---------------------------------------------------------
+        Dialogs are put in a balanced order: starting from a seeded
+        shuffle, the next dialog is always the one whose strata
+        (session, impro / script, gender and duration tercile) are
+        furthest below their share of the dataset. Every prefix of
+        that order is therefore close to proportional on all strata
+        at once, and the subset is the prefix whose audio minutes come
+        closest to the budget (`minutes`, or `fraction` of the whole
+        dataset).
+
+        Returns {"subset_id", "audio_ids", "minutes", "spec"}; the
+        subset_id changes whenever the selected dialogs change.
+        """
+        if (fraction is None) == (minutes is None):
+            raise ValueError("select_subset needs exactly one of fraction / minutes")
+
+        described = [self.describe(aid) for aid in self.list_audio_ids()]
+        described = [d for d in described if d["duration"]]
+        if not described:
+            raise ValueError(f"No dialog with a known duration in {self.dataset_root}")
+
+        by_duration = sorted(described, key=lambda d: d["duration"])
+        for rank, d in enumerate(by_duration):
+            d["duration_bin"] = 3 * rank // len(by_duration)
+
+        keys = list(strata) + ["duration_bin"]
+        share = {key: Counter(d[key] for d in described) for key in keys}
+        counts = {key: Counter() for key in keys}
+
+        remaining = sorted(described, key=lambda d: d["audio_id"])
+        random.Random(seed).shuffle(remaining)
+
+        ordered = []
+        while remaining:
+            # ties keep the shuffled order
+            best = min(remaining, key=lambda d: max(
+                (counts[key][d[key]] + 1) / share[key][d[key]] for key in keys
+            ))
+            remaining.remove(best)
+            ordered.append(best)
+            for key in keys:
+                counts[key][best[key]] += 1
+
+        total_minutes = sum(d["duration"] for d in described) / 60.0
+        budget = minutes if minutes is not None else fraction * total_minutes
+
+        cumulative = np.cumsum([d["duration"] for d in ordered]) / 60.0
+        size = int(np.argmin(np.abs(cumulative - budget))) + 1
+        picked, picked_minutes = ordered[:size], float(cumulative[size - 1])
+
+        audio_ids = sorted(d["audio_id"] for d in picked)
+        digest = hashlib.sha1(json.dumps(audio_ids).encode("utf-8")).hexdigest()[:8]
+
+        return {
+            "subset_id": f"subset-{digest}",
+            "audio_ids": audio_ids,
+            "minutes": round(picked_minutes, 2),
+            "spec": {
+                "fraction": fraction,
+                "minutes": minutes,
+                "seed": seed,
+                "strata": list(strata),
+                "dataset_minutes": round(total_minutes, 2),
+            },
+        }
 
-a = DatasetManager(r"S:\Sambhav's Project\Dataset_IEMOCAP")
-print(a.get_all_audio_files())
\ No newline at end of file
+    def get_subset_audio_files(self, subset: dict) -> List[Dict]:
+        return [self.get_audio_info(aid) for aid in subset["audio_ids"]]
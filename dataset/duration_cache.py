@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from dataset.audio_info import AudioInfo
+
+logger = logging.getLogger(__name__)
+
+
+class DurationCache:
+    """
+    Audio durations kept in a JSON file.
+    ------------------------------------
+    Keyed by wav path, with size + mtime so a replaced file is read
+    again. Reading the header of every dialog is cheap, but not on
+    a network share at the start of every sweep.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = Path(cache_file)
+        self.entries = {}
+        self.dirty = False
+
+        if self.cache_file.exists():
+            try:
+                self.entries = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning("Ignoring unreadable duration cache: %s", self.cache_file)
+
+    def get(self, wav_path) -> Optional[float]:
+        """
+        Duration in seconds, None when the file cannot be read
+        """
+        path = os.path.normpath(str(wav_path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamp = [stat.st_size, int(stat.st_mtime)]
+
+        entry = self.entries.get(path)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["duration"]
+
+        info = AudioInfo(path)
+        if not info.analyze():
+            return None
+
+        self.entries[path] = {"stamp": stamp, "duration": info.duration}
+        self.dirty = True
+        return info.duration
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps(self.entries, indent=1), encoding="utf-8")
+        self.dirty = False
@@ -0,0 +1,93 @@
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+
+class EmotionLabels:
+    """
+    IEMOCAP per utterance emotion annotations of one dialog.
+    --------------------------------------------------------
+    emotions/<dialog>_e<k>_cat.txt   one file per evaluator:
+        Ses01F_impro01_F000 :Frustration; :Anger; ()
+    attributes/<dialog>_e<k>_atr.txt activation / valence / dominance:
+        Ses01F_impro01_F000 :act 4; :val 3; :dom 2; ()
+
+    An utterance gets the majority category over all evaluators'
+    votes (ties: alphabetical), the share of evaluators naming it
+    ("agreement") and the mean of each attribute.
+    """
+
+    CATEGORY_LINE = re.compile(r"^(?P<utt>\S+)\s+(?P<labels>(?::[^;]+;\s*)+)")
+    ATTRIBUTE = re.compile(r":(act|val|dom)\s+([\d.]+);")
+
+    def __init__(self, dialog_dir):
+        self.dialog_dir = Path(dialog_dir)
+
+    # ---------- PUBLIC API ----------
+
+    def load(self) -> Dict[str, dict]:
+        """
+        {utt_id: {"emotion", "agreement", "activation", "valence",
+        "dominance"}}; missing values are None
+        """
+        votes = self._categories()
+        attributes = self._attributes()
+
+        labels = {}
+        for utt_id in sorted(set(votes) | set(attributes)):
+            emotion, agreement = self._majority(votes.get(utt_id, []))
+            values = attributes.get(utt_id, {})
+            labels[utt_id] = {
+                "emotion": emotion,
+                "agreement": agreement,
+                "activation": self._mean(values.get("act")),
+                "valence": self._mean(values.get("val")),
+                "dominance": self._mean(values.get("dom")),
+            }
+        return labels
+
+    # ---------- HELPERS ----------
+
+    def _categories(self) -> Dict[str, list]:
+        """
+        {utt_id: [one label list per evaluator]}
+        """
+        votes = {}
+        for path in sorted((self.dialog_dir / "emotions").glob("*_cat.txt")):
+            for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+                match = self.CATEGORY_LINE.match(line.strip())
+                if match is None:
+                    continue
+                names = [name.strip() for name in match.group("labels").split(";")]
+                votes.setdefault(match.group("utt"), []).append(
+                    [name.lstrip(":").strip() for name in names if name.lstrip(":").strip()]
+                )
+        return votes
+
+    def _attributes(self) -> Dict[str, dict]:
+        values = {}
+        for path in sorted((self.dialog_dir / "attributes").glob("*_atr.txt")):
+            for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+                parts = line.split(None, 1)
+                if len(parts) < 2:
+                    continue
+                per_utt = values.setdefault(parts[0], {})
+                for name, value in self.ATTRIBUTE.findall(parts[1]):
+                    per_utt.setdefault(name, []).append(float(value))
+        return values
+
+    @staticmethod
+    def _majority(evaluations: list):
+        if not evaluations:
+            return None, None
+
+        counts = Counter(label for labels in evaluations for label in set(labels))
+        emotion = min(counts, key=lambda label: (-counts[label], label))
+        return emotion, round(counts[emotion] / len(evaluations), 4)
+
+    @staticmethod
+    def _mean(values):
+        return round(float(np.mean(values)), 4) if values else None
@@ -0,0 +1,62 @@
+from collections import Counter
+
+import pytest
+
+from dataset.dataset_manager import DatasetManager
+from results.results_store import ResultsStore
+
+
+@pytest.fixture
+def manager(dataset_dir):
+    return DatasetManager(str(dataset_dir))
+
+
+def test_describe_reads_strata_from_name(manager):
+    described = manager.describe("Ses03M_script02_1")
+    assert (described["session"], described["kind"], described["gender"]) == ("Ses03", "script", "M")
+    # no wav here: duration from the reference RTTM
+    assert described["duration"] > 0
+
+
+def test_subset_is_reproducible_and_near_budget(manager):
+    subset = manager.select_subset(fraction=0.2, seed=7)
+    assert subset == manager.select_subset(fraction=0.2, seed=7)
+    assert subset["subset_id"] != manager.select_subset(fraction=0.2, seed=8)["subset_id"]
+
+    dataset_minutes = subset["spec"]["dataset_minutes"]
+    longest = max(manager.get_duration(aid) for aid in manager.list_audio_ids()) / 60.0
+    assert abs(subset["minutes"] - 0.2 * dataset_minutes) <= longest
+
+    by_minutes = manager.select_subset(minutes=30, seed=7)
+    assert abs(by_minutes["minutes"] - 30) <= longest
+
+
+def test_subset_keeps_strata_proportions(manager):
+    audio_ids = manager.list_audio_ids()
+    subset = manager.select_subset(fraction=0.25, seed=0)
+
+    for key in ("session", "kind", "gender"):
+        full = Counter(manager.describe(aid)[key] for aid in audio_ids)
+        picked = Counter(manager.describe(aid)[key] for aid in subset["audio_ids"])
+        for value, count in full.items():
+            expected = count * len(subset["audio_ids"]) / len(audio_ids)
+            assert abs(picked[value] - expected) <= 2, (key, value)
+
+
+def test_subset_needs_exactly_one_budget(manager):
+    with pytest.raises(ValueError):
+        manager.select_subset()
+    with pytest.raises(ValueError):
+        manager.select_subset(fraction=0.1, minutes=10)
+
+
+def test_subset_store_round_trip(manager, tmp_path):
+    subset = manager.select_subset(minutes=20, seed=1)
+    store = ResultsStore(tmp_path / "results.sqlite")
+    store.save_subset(subset)
+    store.save_subset(subset)
+
+    stored = store.get_subset(subset["subset_id"])
+    assert stored["audio_ids"] == subset["audio_ids"]
+    assert stored["spec"] == subset["spec"]
+    assert store.get_subset("subset-missing") is None
@@ -0,0 +1,40 @@
+import numpy as np
+import soundfile as sf
+
+from dataset.duration_cache import DurationCache
+
+
+def _wav(path, seconds, sample_rate=16000):
+    sf.write(str(path), np.zeros(int(seconds * sample_rate), dtype=np.float32), sample_rate)
+    return path
+
+
+def test_duration_is_read_once_and_persisted(tmp_path, monkeypatch):
+    wav = _wav(tmp_path / "a.wav", 2.5)
+    cache = DurationCache(tmp_path / "cache" / "durations.json")
+    assert cache.get(wav) == 2.5
+    cache.save()
+
+    # a second cache reads the JSON, not the wav header
+    monkeypatch.setattr("dataset.duration_cache.AudioInfo.analyze", lambda self: False)
+    reloaded = DurationCache(tmp_path / "cache" / "durations.json")
+    assert reloaded.get(wav) == 2.5
+    assert not reloaded.dirty
+
+
+def test_replaced_file_is_read_again(tmp_path):
+    wav = _wav(tmp_path / "a.wav", 1.0)
+    cache = DurationCache(tmp_path / "durations.json")
+    assert cache.get(wav) == 1.0
+
+    _wav(wav, 3.0)
+    assert cache.get(wav) == 3.0
+
+
+def test_missing_file_and_unreadable_cache(tmp_path):
+    cache_file = tmp_path / "durations.json"
+    cache_file.write_text("{not json", encoding="utf-8")
+
+    cache = DurationCache(cache_file)
+    assert cache.entries == {}
+    assert cache.get(tmp_path / "missing.wav") is None
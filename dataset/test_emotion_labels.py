@@ -0,0 +1,41 @@
+from analyser.der.der_io import DERIO
+from dataset.emotion_labels import EmotionLabels
+
+
+def _dialog(tmp_path, categories, attributes):
+    for folder, files in (("emotions", categories), ("attributes", attributes)):
+        (tmp_path / folder).mkdir()
+        for name, lines in files.items():
+            (tmp_path / folder / name).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_majority_agreement_and_means(tmp_path):
+    dialog = _dialog(tmp_path, {
+        "d_e1_cat.txt": ["d_F000 :Anger; :Frustration; ()", "d_M000 :Sadness; ()"],
+        "d_e2_cat.txt": ["d_F000 :Frustration; ()", "d_M000 :Neutral state; ()"],
+        "d_e3_cat.txt": ["d_F000 :Frustration; ()", "% comment line"],
+    }, {
+        "d_e1_atr.txt": ["d_F000 :act 4; :val 2; :dom 3; (tense)"],
+        "d_e2_atr.txt": ["d_F000 :act 3; :val 2; :dom 4; ()", "d_X001 :act 1; ()"],
+    })
+
+    labels = EmotionLabels(dialog).load()
+
+    assert labels["d_F000"] == {"emotion": "Frustration", "agreement": 1.0,
+                                "activation": 3.5, "valence": 2.0, "dominance": 3.5}
+    # 1 : 1 tie -> alphabetical
+    assert labels["d_M000"]["emotion"] == "Neutral state"
+    assert labels["d_M000"]["agreement"] == 0.5
+    assert labels["d_M000"]["activation"] is None
+    assert labels["d_X001"]["emotion"] is None and labels["d_X001"]["activation"] == 1.0
+
+
+def test_every_reference_utterance_is_labelled(dataset_dir):
+    dialog = dataset_dir / "Ses01F_impro01"
+    labels = EmotionLabels(dialog).load()
+
+    for utt_id in DERIO.load_reference_ids(dialog / "transcript_norm.txt"):
+        assert labels[utt_id]["emotion"], utt_id
+        assert 0 < labels[utt_id]["agreement"] <= 1
+        assert labels[utt_id]["valence"] is not None
@@ -1,7 +1,83 @@
 # main_runner.py
+import argparse
+from orchestrator.log_config import configure_logging
 from orchestrator.pipeline_runner import PipelineRunner
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="WhisperX IEMOCAP experiment runner")
+    parser.add_argument("--config", default=None,
+                        help="Config.xlsx or a .yaml / .toml sweep spec")
+    parser.add_argument("--start", help="first config_id (prompted if omitted)")
+    parser.add_argument("--end", help="last config_id (prompted if omitted)")
+    parser.add_argument("--log-level", default="INFO",
+                        help="DEBUG / INFO / WARNING / ERROR")
+    parser.add_argument("--log-file", default=None)
+    parser.add_argument("--status-file", default=None,
+                        help="JSON progress file rewritten during the sweep")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on 127.0.0.1:<port>/metrics")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of supervised inference worker processes "
+                             "(default: autotuned layout of this machine, if any)")
+    parser.add_argument("--autotune", action="store_true",
+                        help="benchmark workers x threads x compute_type first "
+                             "and store the best layout for this machine")
+    parser.add_argument("--layout-file", default=None,
+                        help="autotune store (default ~/.cache/whisperx_iemocap/autotune.json)")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help="RSS ceiling per worker; larger jobs are retried cheaper")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--sweep-id", default=None,
+                        help="results store key of this sweep (default: config file name)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip jobs already done in this sweep")
+    parser.add_argument("--threshold-sweep", action="store_true",
+                        help="configs differing only in clustering params share "
+                             "ASR / embeddings and one linkage per audio")
+    parser.add_argument("--queue", default=None,
+                        help="shared SQLite job queue: run as a queue worker "
+                             "(hosts share dataset / output / results paths)")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="with --queue: only queue the --start..--end jobs")
+    parser.add_argument("--lease-seconds", type=float, default=600.0,
+                        help="a queue worker silent this long loses its job")
+    parser.add_argument("--score-workers", type=int, default=2,
+                        help="threads saving / scoring finished audios while the "
+                             "next one is transcribed (0 = all stages in sequence)")
+    parser.add_argument("--prefetch", type=int, default=2,
+                        help="audios decoded ahead of in-process inference (0 = off)")
+    parser.add_argument("--dataset-order", action="store_true",
+                        help="dispatch jobs in dataset order instead of "
+                             "longest predicted job first")
+    parser.add_argument("--subset-fraction", type=float, default=None,
+                        help="screen configs on a stratified subset holding this "
+                             "fraction of the audio minutes (e.g. 0.1)")
+    parser.add_argument("--subset-minutes", type=float, default=None,
+                        help="same, with an audio minutes budget")
+    parser.add_argument("--subset-seed", type=int, default=0)
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="run every row even when several rows resolve to "
+                             "the same effective config")
+    parser.add_argument("--word-alignments", action="store_true",
+                        help="store the word alignment (S/D/I ops) of every job "
+                             "for error analysis")
+    parser.add_argument("--segment-errors", action="store_true",
+                        help="store missed / false alarm / confusion seconds per "
+                             "reference utterance with its emotion labels")
+    parser.add_argument("--debug-json", action="store_true",
+                        help="also write the full WhisperX JSON of every job next "
+                             "to its compact .npz result")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=["cprofile", "sample"],
+                        help="profile every job (cProfile, or stack sampling for "
+                             "flamegraphs) with per stage tracemalloc; reports go to "
+                             "<output>/profiles/<sweep_id>")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="run inference in this process even when an inference "
+                             "daemon (python -m orchestrator.inference_daemon) is running")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
 
     dataset = r"S:\Sambhav's Project\Dataset_IEMOCAP"
@@ -9,12 +85,49 @@ if __name__ == "__main__":
     config  = r"S:\Sambhav's Project\Config.xlsx"
     results = r"S:\Sambhav's Project\results\result.xlsx"
 
-    start = input().strip()
-    end   = input().strip()
+    args = parse_args()
+    configure_logging(args.log_level, args.log_file)
 
-    PipelineRunner(
+    runner = PipelineRunner(
         dataset_dir=dataset,
         output_dir=output,
-        config_file=config,
-        results_excel=results
-    ).run(start, end)
+        config_file=args.config or config,
+        results_excel=results,
+        status_file=args.status_file,
+        metrics_port=args.metrics_port,
+        workers=args.workers,
+        memory_limit_mb=args.memory_limit_mb,
+        max_retries=args.max_retries,
+        sweep_id=args.sweep_id,
+        resume=args.resume,
+        autotune=args.autotune,
+        layout_file=args.layout_file,
+        threshold_sweep=args.threshold_sweep,
+        queue_file=args.queue,
+        lease_seconds=args.lease_seconds,
+        score_workers=args.score_workers,
+        prefetch=args.prefetch,
+        longest_first=not args.dataset_order,
+        subset_fraction=args.subset_fraction,
+        subset_minutes=args.subset_minutes,
+        subset_seed=args.subset_seed,
+        dedup=not args.no_dedup,
+        word_alignments=args.word_alignments,
+        segment_errors=args.segment_errors,
+        debug_json=args.debug_json,
+        profile=args.profile,
+        use_daemon=not args.no_daemon
+    )
+
+    # queue workers take their configs from the queue, no range needed
+    if args.queue and not args.enqueue:
+        runner.work()
+    else:
+        # blank = from the first / to the last config
+        start = args.start or input().strip() or None
+        end   = args.end or input().strip() or None
+
+        if args.queue:
+            runner.enqueue(start, end)
+        else:
+            runner.run(start, end)
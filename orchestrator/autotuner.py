@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import socket
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from dataset.audio_info import AudioInfo
+from orchestrator.worker_supervisor import WorkerSupervisor
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LAYOUT_FILE = Path.home() / ".cache" / "whisperx_iemocap" / "autotune.json"
+
+
+def machine_fingerprint() -> dict:
+    """
+    Identifies the box a layout was measured on.
+    """
+    total_ram_mb = None
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        for line in meminfo.read_text().splitlines():
+            if line.startswith("MemTotal:"):
+                total_ram_mb = int(line.split()[1]) // 1024
+                break
+
+    return {
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "total_ram_mb": total_ram_mb,
+    }
+
+
+def fingerprint_key(fingerprint: dict) -> str:
+    raw = json.dumps(fingerprint, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def candidate_layouts(cpu_count: int, compute_types: Sequence[str]) -> List[dict]:
+    """
+    (workers x threads) splits that use every core once,
+    crossed with the compute types to try.
+    """
+    cpu_count = max(1, cpu_count)
+    workers = sorted({w for w in (1, 2, 3, 4, 6, 8, 12, 16) if w <= cpu_count} | {cpu_count})
+
+    layouts = []
+    for compute_type in compute_types:
+        for w in workers:
+            layouts.append({
+                "workers": w,
+                "cpu_threads": max(1, cpu_count // w),
+                "compute_type": compute_type,
+            })
+    return layouts
+
+
+class Autotuner:
+    """
+    Finds the fastest (workers x threads x compute_type) layout
+    ----------------------------------------------------------
+    Runs a few representative IEMOCAP dialogs under every candidate
+    layout, measures throughput (audio seconds per wall second) and
+    persists the best layout per machine. WorkerSupervisor picks it
+    up automatically through load_layout().
+    """
+
+    def __init__(self,
+                audio_items: List[Dict],
+                whisper_model: str = "small",
+                compute_types: Sequence[str] = ("int8", "float32"),
+                sample_size: int = 3,
+                layout_file: Optional[str] = None):
+
+        self.audio_items = audio_items
+        self.whisper_model = whisper_model
+        self.compute_types = tuple(compute_types)
+        self.sample_size = sample_size
+        self.layout_file = Path(layout_file) if layout_file else DEFAULT_LAYOUT_FILE
+
+    # ---------- PUBLIC API ----------
+
+    def run(self) -> dict:
+        sample = self._representative_sample()
+        fingerprint = machine_fingerprint()
+        layouts = candidate_layouts(fingerprint["cpu_count"] or 1, self.compute_types)
+
+        logger.info("Autotune: %d layouts on %d dialogs (%s)",
+                    len(layouts), len(sample), ", ".join(a["audio_id"] for a in sample))
+
+        results = []
+        with tempfile.TemporaryDirectory(prefix="autotune_") as tmp:
+            for layout in layouts:
+                result = self._benchmark(layout, sample, Path(tmp))
+                results.append(result)
+                logger.info("Autotune %s -> %.2f audio s / s",
+                            layout, result["throughput"] or 0.0)
+
+        entry = self._summarise(fingerprint, results)
+        self._persist(entry)
+        logger.info("Autotune best layout: %s", entry["best"])
+        return entry
+
+    @staticmethod
+    def load_layout(layout_file: Optional[str] = None) -> Optional[dict]:
+        """
+        Stored autotune entry of this machine, or None.
+        """
+        path = Path(layout_file) if layout_file else DEFAULT_LAYOUT_FILE
+        if not path.exists():
+            return None
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data.get(fingerprint_key(machine_fingerprint()))
+
+    # ---------- HELPERS ----------
+
+    def _representative_sample(self) -> List[Dict]:
+        """
+        Dialogs spread over the duration distribution (short .. long)
+        """
+        timed = []
+        for item in self.audio_items:
+            info = AudioInfo(str(item["wav_path"]))
+            if info.analyze():
+                timed.append(dict(item, duration=info.duration))
+
+        if not timed:
+            raise ValueError("Autotune: no readable audio files")
+
+        timed.sort(key=lambda a: a["duration"])
+        n = min(self.sample_size, len(timed))
+        if n == 1:
+            return [timed[len(timed) // 2]]
+        picks = {round(i * (len(timed) - 1) / (n - 1)) for i in range(n)}
+        return [timed[i] for i in sorted(picks)]
+
+    def _benchmark(self, layout: dict, sample: List[Dict], out_root: Path) -> dict:
+        params = {
+            "whisper_model": self.whisper_model,
+            "compute_type": layout["compute_type"],
+            "cpu_threads": layout["cpu_threads"],
+        }
+        workers = layout["workers"]
+
+        def jobs_for(items):
+            jobs = []
+            for item in items:
+                out_dir = out_root / item["audio_id"]
+                out_dir.mkdir(parents=True, exist_ok=True)
+                jobs.append({"audio_id": item["audio_id"],
+                             "wav_path": item["wav_path"],
+                             "out_dir": out_dir})
+            return jobs
+
+        # every worker needs work: repeat the sample up to the worker count
+        timed_items = sample * max(1, -(-workers // len(sample)))
+
+        supervisor = WorkerSupervisor(num_workers=workers, max_retries=0)
+        try:
+            # warm-up round: one short job per worker loads the models
+            for _ in supervisor.run_config("autotune", params, jobs_for([sample[0]] * workers)):
+                pass
+
+            start = time.time()
+            outcomes = list(supervisor.run_config("autotune", params, jobs_for(timed_items)))
+            wall = time.time() - start
+        finally:
+            supervisor.close()
+
+        done = [o for o in outcomes if o["status"] == "done"]
+        audio_seconds = sum(item["duration"] for item in timed_items)
+        ok = len(done) == len(outcomes)
+
+        return dict(
+            layout,
+            wall_time=wall,
+            audio_seconds=audio_seconds,
+            throughput=(audio_seconds / wall) if ok and wall > 0 else None,
+            peak_rss_mb=max((o["peak_rss_mb"] or 0 for o in outcomes), default=None),
+            failed=len(outcomes) - len(done),
+        )
+
+    def _summarise(self, fingerprint: dict, results: List[dict]) -> dict:
+        valid = [r for r in results if r["throughput"]]
+        if not valid:
+            raise RuntimeError("Autotune: every layout failed")
+
+        def pick(rows):
+            best = max(rows, key=lambda r: r["throughput"])
+            return {k: best[k] for k in ("workers", "cpu_threads", "compute_type", "throughput")}
+
+        per_compute_type = {}
+        for compute_type in self.compute_types:
+            rows = [r for r in valid if r["compute_type"] == compute_type]
+            if rows:
+                per_compute_type[compute_type] = pick(rows)
+
+        return {
+            "machine": fingerprint,
+            "measured_at": time.time(),
+            "whisper_model": self.whisper_model,
+            "results": results,
+            "best": pick(valid),
+            "best_per_compute_type": per_compute_type,
+        }
+
+    def _persist(self, entry: dict):
+        self.layout_file.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {}
+        if self.layout_file.exists():
+            data = json.loads(self.layout_file.read_text(encoding="utf-8"))
+        data[fingerprint_key(entry["machine"])] = entry
+
+        self.layout_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -1,7 +1,23 @@
+import json
+import logging
+import threading
+import traceback
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional
+from analyser.overall_accumulator import OverallAccumulator
+from analyser.utils.hypothesis_file import HypothesisFile
+from config.config_planner import ConfigPlanner
 from dataset.dataset_manager import DatasetManager
+from orchestrator.job_profiler import JobProfiler, ProfileReport
+from orchestrator.job_scheduler import JobScheduler
+from orchestrator.progress_reporter import ProgressReporter
+from orchestrator.stage_pipeline import AudioPrefetcher, ResultPool
+from orchestrator.worker_supervisor import InferenceWorker, WorkerSupervisor
 from results.excel_writer import ExcelWriter
+from results.results_store import ResultsStore
+from whisperx_core.threshold_sweep import group_by_clustering
+
+logger = logging.getLogger(__name__)
 
 
 class ExperimentManager:
@@ -13,14 +29,89 @@ class ExperimentManager:
     def __init__(self,
                 dataset_dir: str,
                 output_root: str,
-                results_excel: str):
+                results_excel: str,
+                progress: Optional[ProgressReporter] = None,
+                supervisor: Optional[WorkerSupervisor] = None,
+                sweep_id: str = "default",
+                resume: bool = False,
+                threshold_sweep: bool = False,
+                excel_per_job: bool = True,
+                score_workers: int = 2,
+                prefetch: int = 2,
+                scheduler: Optional[JobScheduler] = None,
+                subset_id: Optional[str] = None,
+                dedup: bool = True,
+                word_alignments: bool = False,
+                segment_errors: bool = False,
+                debug_json: bool = False,
+                profiler: Optional[JobProfiler] = None,
+                inference=None):
+        """
+        :param supervisor: run inference in memory budgeted worker
+                           processes; None runs it in this process
+        :param sweep_id: key of this sweep in the results store
+        :param resume: skip (config, audio) jobs already done in this sweep
+        :param threshold_sweep: configs that only differ in clustering
+                                params share ASR / alignment / embeddings
+                                and one linkage per audio
+        :param excel_per_job: write each audio into the Excel sheet as
+                              soon as it is scored; False leaves the
+                              sheet to finalize_config() (shared queue)
+        :param score_workers: threads saving / scoring / storing finished
+                              jobs while the next inference runs;
+                              0 = every stage in sequence
+        :param prefetch: audios decoded ahead of the in-process inference
+        :param scheduler: orders the jobs of a config longest first for
+                          the supervised workers; None keeps dataset order
+        :param subset_id: quick-eval subset the audios come from
+                          (DatasetManager.select_subset), stored per job
+        :param dedup: run rows with the same effective config once and
+                      copy the results to the others (ConfigPlanner)
+        :param word_alignments: store the word alignment of every job
+                                (analyser.wer.alignment_queries)
+        :param segment_errors: store DER errors per reference utterance
+                               with its emotion labels
+                               (ResultsStore.segment_error_summary)
+        :param debug_json: keep the full WhisperX JSON next to the
+                           compact .npz result of every job
+        :param profiler: profile every inference job (--profile); the
+                         merged report is written by close()
+        :param inference: in-process inference backend; None = a local
+                          InferenceWorker, an InferenceClient sends
+                          the jobs to a running inference daemon
+        """
 
         self.dataset_dir = Path(dataset_dir)
         self.output_root = Path(output_root)
         self.results_excel = Path(results_excel)
+        self.progress = progress if progress is not None else ProgressReporter()
+        self.supervisor = supervisor
+        self.sweep_id = sweep_id
+        self.resume = resume
+        self.threshold_sweep = threshold_sweep
+        self.excel_per_job = excel_per_job
+        self.score_workers = score_workers
+        self.prefetch = prefetch
+        self.scheduler = scheduler
+        self.subset_id = subset_id
+        self.dedup = dedup
+        self.word_alignments = word_alignments
+        self.segment_errors = segment_errors
+        self.debug_json = debug_json
+        self.profiler = profiler
+        # emotion labels per audio, read once for every config
+        self._emotions = {}
+        # store / Excel / accumulators are written by one thread at a time
+        self._sink_lock = threading.Lock()
 
         self._validate_paths()
 
+        self.store = ResultsStore(self.output_root / "results.sqlite")
+        self.cache_dir = self.output_root / "cache"
+        self.inference = inference if inference is not None else InferenceWorker(self.cache_dir)
+        # the daemon decodes and saves itself (see InferenceClient)
+        self.remote = getattr(self.inference, "remote", False)
+
     def _validate_paths(self):
         if not self.dataset_dir.exists():
             raise FileNotFoundError(f"Dataset not found: {self.dataset_dir}")
@@ -31,147 +122,438 @@ class ExperimentManager:
 
     def run_experiments(self,
                         configs: List[Dict],
-                        audio_items: List[Dict]):
+                        audio_items: List[Dict],
+                        early_stop: Optional[Callable[[str, Dict], bool]] = None):
         """
         Main controller
+        ---------------
+        :param early_stop: optional callback(cfg_id, running_scores) -> bool,
+                           called after every audio with the running
+                           OverallAccumulator snapshot. Returning True stops
+                           the current config early.
         """
 
-        print("\n===== Starting Experiment Pipeline =====\n")
+        logger.info("===== Starting Experiment Pipeline =====")
 
-        print(f"[INFO] Total audios found: {len(audio_items)}")
-        print(f"[INFO] Total configs: {len(configs)}\n")
+        logger.info("Total audios found: %d", len(audio_items))
+        logger.info("Total configs: %d", len(configs))
 
-        for cfg in configs:
+        runnable = [c for c in configs if c["config_id"].lower() != "config_default"]
+        if self.dedup:
+            runnable = ConfigPlanner().plan(runnable)
+        self.progress.begin_sweep(len(runnable) * len(audio_items))
 
-            cfg_id = cfg["config_id"]
-            params = cfg["params"]
+        # remove this to run default config
+        if len(runnable) != len(configs):
+            logger.info("[SKIP] Default config already evaluated.")
 
-            # remove this to run default config
-            if cfg_id.lower() == "config_default":
-                print(f"[SKIP] Default config already evaluated.")
-                continue
+        if self.threshold_sweep:
+            batches = group_by_clustering(runnable)
+        else:
+            batches = [[cfg] for cfg in runnable]
 
-            print(f"\n=== Running Config: {cfg_id} ===")
+        for batch in batches:
+            if len(batch) > 1:
+                self._run_sweep_group(batch, audio_items, early_stop)
+            else:
+                self._run_config(batch[0], audio_items, early_stop)
 
-            Total_processing_Time = 0
-            Total_audio_Time = 0
+        self.close()
+        logger.info("===== All Experiments Completed =====")
 
-            reference_text = ""
-            hypothesis_text = ""
+    def run_job(self, cfg_id, params, item):
+        """
+        One (config, audio) job, scored and stored.
+        Returns (ok, error).
+        """
+        job = self._job_for(cfg_id, item)
+        for outcome in self._execute(cfg_id, params, [job]):
+            ok = self._finish_job(cfg_id, outcome, OverallAccumulator())
+            return ok, outcome["error"]
+        return False, "no outcome"
 
-            Total_reference_time = 0
-            Total_miss = 0
-            Total_False_alarm = 0
-            Total_confusion = 0
+    def finalize_config(self, cfg_id):
+        """
+        Excel block + overall scores of one config from the results store
+        """
+        overall = OverallAccumulator()
+        audio_rows = []
+        for row in self.store.get_jobs(self.sweep_id, cfg_id, status="done"):
+            self._accumulate_row(overall, row)
+            audio_rows.append((row["audio_id"], row["wer"], row["der"], row["rtf"]))
+
+        WER, DER, RTF, cpWER = self._compute_overall(overall)
+        ExcelWriter(self.results_excel).write_config_results(cfg_id, audio_rows, (WER, DER, RTF, cpWER))
+        logger.info("Overall %s: WER=%s DER=%s RTF=%s cpWER=%s (%d audios)",
+                    cfg_id, WER, DER, RTF, cpWER, len(audio_rows))
+
+    def fan_out(self, cfg_id, aliases):
+        """
+        Results of `cfg_id` copied to the config ids that share its
+        effective config: store rows (alias_of = cfg_id), Excel block
+        and overall scores. Output files stay under cfg_id.
+        """
+        for alias in aliases:
+            copied = self.store.copy_jobs(self.sweep_id, cfg_id, alias)
+            self.finalize_config(alias)
+            logger.info("[DEDUP] %s: %d results copied from %s", alias, copied, cfg_id)
+
+    def close(self):
+        if self.supervisor is not None:
+            self.supervisor.close()
+        if self.profiler is not None:
+            ProfileReport(self.profiler.profile_dir).write()
+        if self.remote:
+            self.inference.close()
+        self.progress.close()
+
+    def _run_config(self, cfg, audio_items, early_stop):
+        """
+        Every audio under one config
+        """
+        cfg_id = cfg["config_id"]
+        params = cfg["params"]
 
-            for item in audio_items:
+        self.progress.begin_config(cfg_id, len(audio_items))
 
-                audio_id = item["audio_id"]
-                audio_path = item["wav_path"]
+        overall = OverallAccumulator()
+        jobs = self._pending_jobs(cfg_id, audio_items, overall)
+        stopped = set()
 
-                print(f"\n→ Processing Audio: {audio_id}")
+        # order only matters when several workers share the jobs
+        if self.scheduler is not None and self.supervisor is not None:
+            jobs = self.scheduler.order(cfg_id, jobs, self.supervisor.num_workers)
 
-                out_dir = self.output_root / "WhisperX_Output" / audio_id
-                out_dir.mkdir(parents=True, exist_ok=True)
+        with ResultPool(self.score_workers) as pool:
+            for outcome in self._execute(cfg_id, params, jobs):
 
-                processing_time = self._run_whisperx(audio_path, out_dir, params,audio_id)
-                Total_processing_Time+=round(processing_time,4)
+                future = pool.submit(self._finish_and_check, cfg_id, outcome, overall, early_stop, stopped)
+                # the stop decision needs this job's score before the next job starts
+                if early_stop is not None:
+                    future.result()
 
-                res_wer = self._compute_wer(audio_id, out_dir)
-                wer = res_wer[0]
+                if cfg_id in stopped:
+                    break
 
-                der,breakdown = self._compute_der(audio_id, out_dir)
-                Total_miss += breakdown[0]
-                Total_False_alarm +=breakdown[1]
-                Total_confusion += breakdown[2]
-                Total_reference_time += breakdown[3]
+        self._write_overall(cfg_id, overall)
+        self.fan_out(cfg_id, cfg.get("aliases", ()))
 
-                res_time = self._compute_rtf(audio_path, processing_time)
-                rtf = res_time[0]
+    def _run_sweep_group(self, group, audio_items, early_stop):
+        """
+        Configs that only differ in clustering params: every audio is
+        transcribed, aligned and embedded once, and the dendrogram is
+        cut once per config (see whisperx_core.threshold_sweep).
+        Runs in this process.
+        """
+        cfg_ids = [cfg["config_id"] for cfg in group]
+        params_by_cfg = {cfg["config_id"]: cfg["params"] for cfg in group}
+        logger.info("Threshold sweep: %s share one linkage per audio", ", ".join(cfg_ids))
 
-                Total_audio_Time += res_time[1]
-                reference_text += res_wer[1]
-                hypothesis_text += res_wer[2]
+        self.progress.begin_config(f"{cfg_ids[0]}..{cfg_ids[-1]}", len(group) * len(audio_items))
 
+        overall = {cfg_id: OverallAccumulator() for cfg_id in cfg_ids}
+        pending = {
+            cfg_id: {job["audio_id"]: job
+                     for job in self._pending_jobs(cfg_id, audio_items, overall[cfg_id])}
+            for cfg_id in cfg_ids
+        }
+        items = [item for item in audio_items
+                 if any(item["audio_id"] in pending[cfg_id] for cfg_id in cfg_ids)]
+        stopped = set()
 
+        with ResultPool(self.score_workers) as pool:
+            for item, audio, decode_error in self._decoded(items):
+
+                audio_id = item["audio_id"]
+                todo = [cfg_id for cfg_id in cfg_ids
+                        if cfg_id not in stopped and audio_id in pending[cfg_id]]
+                if not todo:
+                    continue
+
+                job = {
+                    "audio_id": audio_id,
+                    "wav_path": item["wav_path"],
+                    "out_dirs": {cfg_id: pending[cfg_id][audio_id]["out_dir"] for cfg_id in todo},
+                    "debug_json": self.debug_json,
+                    "profile": self.profiler.to_spec() if self.profiler else None
+                }
+                try:
+                    if decode_error is not None:
+                        raise decode_error
+                    times = self.inference.run_sweep(job, {c: params_by_cfg[c] for c in todo},
+                                                     audio=audio)
+                    error = None
+                except Exception:
+                    times, error = {}, traceback.format_exc()
+
+                for cfg_id in todo:
+                    outcome = {
+                        "job": pending[cfg_id][audio_id],
+                        "status": "done" if error is None else "failed",
+                        "processing_time": times.get(cfg_id),
+                        "attempts": 1,
+                        "error": error,
+                        "params": params_by_cfg[cfg_id],
+                        "peak_rss_mb": getattr(self.inference, "peak_rss_mb", None) if error is None else None,
+                        # shared stages: count the cache lookups once
+                        "cache_events": self.inference.cache_events if error is None and cfg_id == todo[0] else [],
+                    }
+                    future = pool.submit(self._finish_and_check, cfg_id, outcome, overall[cfg_id],
+                                         early_stop, stopped)
+                    if early_stop is not None:
+                        future.result()
+
+        for cfg in group:
+            self._write_overall(cfg["config_id"], overall[cfg["config_id"]])
+            self.fan_out(cfg["config_id"], cfg.get("aliases", ()))
+
+    def _pending_jobs(self, cfg_id, audio_items, overall):
+        """
+        Jobs of one config still to run; with resume, done jobs are
+        fed back into `overall` instead
+        """
+        jobs = []
+
+        for item in audio_items:
+
+            audio_id = item["audio_id"]
+
+            previous = self.store.get_job(self.sweep_id, cfg_id, audio_id) if self.resume else None
+            if previous is not None and previous["status"] == "done":
+                logger.debug("[RESUME] %s | %s already done", cfg_id, audio_id)
+                self._accumulate_row(overall, previous)
+                self.progress.job_done(audio_id, previous["audio_duration"],
+                                       previous["processing_time"])
+                continue
+
+            jobs.append(self._job_for(cfg_id, item))
+
+        return jobs
+
+    def _job_for(self, cfg_id, item):
+        # one folder per config, so configs never overwrite each other
+        out_dir = self.output_root / "WhisperX_Output" / cfg_id / item["audio_id"]
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        return {
+            "audio_id": item["audio_id"],
+            "config_id": cfg_id,
+            "wav_path": item["wav_path"],
+            "out_dir": out_dir,
+            "debug_json": self.debug_json,
+            "profile": self.profiler.to_spec() if self.profiler else None
+        }
+
+    def _finish_job(self, cfg_id, outcome, overall) -> bool:
+        """
+        Score + store one outcome. Returns False when the job failed.
+        """
+        job = outcome["job"]
+        audio_id = job["audio_id"]
+
+        if outcome["status"] != "done":
+            with self._sink_lock:
+                self._record_failure(cfg_id, outcome)
+            return False
+
+        try:
+            # inference left the result file to this stage (see _execute)
+            if outcome.get("result") is not None:
+                from whisperx_core.whisperX_runner import WhisperXRunner
+                WhisperXRunner.write_result(outcome.pop("result"), str(job["out_dir"]), audio_id,
+                                            self.debug_json)
+            scores = self._score_job(job, outcome["processing_time"])
+        except Exception:
+            outcome["error"] = traceback.format_exc()
+            with self._sink_lock:
+                self._record_failure(cfg_id, outcome)
+            return False
+
+        wer, wer_breakdown, der, breakdown, rtf, audio_duration, cp_breakdown = scores
+
+        with self._sink_lock:
+            for cache_name, hit in outcome.get("cache_events", []):
+                self.progress.record_cache(cache_name, hit)
+
+            overall.update(wer_breakdown, breakdown, outcome["processing_time"], audio_duration,
+                           cp_breakdown)
+            self.progress.job_done(audio_id, audio_duration, outcome["processing_time"])
+
+            self._store_job(cfg_id, outcome, scores)
+            if self.excel_per_job:
                 ExcelWriter(self.results_excel).write_audio_result(
                     cfg_id, audio_id, wer, der, rtf
                 )
+        return True
 
-            #OVERALL RESULT CALCULATION:
-            overall_result = self._compute_overall(
-                cfg_id,
-                reference_text,
-                hypothesis_text,
-                Total_processing_Time,
-                Total_audio_Time,
-                Total_miss,
-                Total_False_alarm,
-                Total_confusion,
-                Total_reference_time
-            )
-            WER = overall_result[0]
-            DER = overall_result[1]
-            RTF = overall_result[2]
-            ExcelWriter(self.results_excel).write_overall_result(cfg_id,WER,DER,RTF)
-            
+    def _finish_and_check(self, cfg_id, outcome, overall, early_stop, stopped):
+        """
+        _finish_job + early stop check; a stopped config is added to
+        `stopped`. With an early_stop callback the caller waits for
+        this before starting the next job, so no inference runs past
+        the stop (scoring then no longer overlaps inference); jobs
+        already running in supervised workers are still scored.
+        """
+        if not self._finish_job(cfg_id, outcome, overall) or early_stop is None:
+            return
+
+        with self._sink_lock:
+            if cfg_id not in stopped and early_stop(cfg_id, overall.snapshot()):
+                logger.info("[STOP] Early stop for %s after %d audios", cfg_id, overall.count)
+                stopped.add(cfg_id)
+
+    def _write_overall(self, cfg_id, overall):
+        if not self.excel_per_job:
+            self.finalize_config(cfg_id)
+            return
+
+        #OVERALL RESULT CALCULATION:
+        WER, DER, RTF, cpWER = self._compute_overall(overall)
+        ExcelWriter(self.results_excel).write_overall_result(cfg_id,WER,DER,RTF,cpWER)
+        logger.info("Overall %s: WER=%s DER=%s RTF=%s cpWER=%s",
+                    cfg_id, WER, DER, RTF, cpWER)
 
-        print("\n===== All Experiments Completed =====\n")
     # ---------- Delegation Methods (only CALL others) ----------
 
-    def _run_whisperx(self, audio_path, out_dir, params, audio_id):
+    def _execute(self, cfg_id, params, jobs):
         """
-        Delegates whisperx run
+        Runs the inference jobs of one config.
+        Yields outcome dicts (see WorkerSupervisor.run_config).
         """
-        from whisperx_core.whisperX_runner import WhisperXRunner
-        from whisperx_core.whisperx_configurator import WhisperXConfigurator
-        import time
-
-        model = WhisperXConfigurator().configure(params)
-        runner = WhisperXRunner(model)
+        if self.supervisor is not None:
+            yield from self.supervisor.run_config(cfg_id, params, jobs)
+            return
+
+        # with score workers the result file is written by the scoring stage
+        deferred = self.score_workers > 0 and not self.remote
+
+        for job, audio, decode_error in self._decoded(jobs):
+            outcome = {"job": job, "attempts": 1, "params": params, "peak_rss_mb": None}
+            try:
+                if decode_error is not None:
+                    raise decode_error
+                processing_time = self.inference.run(job, params, audio=audio, save=not deferred)
+                outcome.update(status="done", processing_time=processing_time, error=None,
+                               peak_rss_mb=getattr(self.inference, "peak_rss_mb", None),
+                               cache_events=self.inference.cache_events,
+                               result=self.inference.runner.result if deferred else None)
+            except Exception:
+                outcome.update(status="failed", processing_time=None,
+                               error=traceback.format_exc())
+            yield outcome
+
+    def _decoded(self, items):
+        """
+        (item, audio, decode error) per item; decoded ahead on a
+        background thread when prefetch is on, else left to the runner
+        """
+        if not self.prefetch or self.remote:
+            for item in items:
+                yield item, None, None
+            return
 
-        start = time.time()
+        with AudioPrefetcher(items, self.prefetch) as prefetcher:
+            yield from prefetcher
 
-        runner.run(audio_path)
-        runner.save_result(out_dir,audio_id)
+    def _score_job(self, job, processing_time):
+        """
+        WER / DER / RTF of one finished job, plus the cpWER breakdown
+        """
+        audio_id, out_dir = job["audio_id"], job["out_dir"]
 
-        end = time.time()
+        wer, wer_breakdown = self._compute_wer(audio_id, out_dir, job.get("config_id"))
+        der, breakdown = self._compute_der(audio_id, out_dir, job.get("config_id"))
+        rtf, audio_duration = self._compute_rtf(job["wav_path"], processing_time)
+        cp_breakdown = self._compute_cpwer(audio_id, out_dir)
 
-        return end-start
+        return wer, wer_breakdown, der, breakdown, rtf, audio_duration, cp_breakdown
 
-    def _compute_wer(self, audio_id, out_dir):
+    def _compute_wer(self, audio_id, out_dir, cfg_id=None):
         """
         Deligate to compute wer
         """
         from analyser.wer.wer_calculator import WERCalculator
-        from pathlib import Path
 
         ref_path = self.dataset_dir / audio_id /"transcript_norm.txt"   # reference
-        hyp_path = out_dir / f"{audio_id}.json"        # whisper result
+        hyp_path = HypothesisFile.find(out_dir, audio_id)   # whisper result
 
         calculator = WERCalculator(out_dir)
         calculator.load_inputs(ref_path,hyp_path)
         calculator.preprocess()
-        wer = calculator.calculate()
-        ref = calculator.get_ref_token()
-        hyp = calculator.get_hyp_token()
-        result = (round(wer,4),ref,hyp)
+        with_alignment = self.word_alignments and cfg_id is not None
+        wer = calculator.calculate(with_alignment=with_alignment)
+        result = (round(wer,4),calculator.get_breakdown())
+
+        if with_alignment:
+            self.store.save_alignment(
+                self.sweep_id, cfg_id, audio_id, calculator.alignment,
+                calculator.reference_text.split(), calculator.hypothesis_text.split(),
+                calculator.reference_speakers()
+            )
 
         return result
 
 
-    def _compute_der(self, audio_id, out_dir):
+    def _compute_cpwer(self, audio_id, out_dir):
+        """
+        Speaker attributed WER: (S, D, I, N) under the best mapping of
+        reference speakers to diarization labels
+        """
+        from analyser.wer.cpwer_calculator import CPWERCalculator
+
+        ref_path = self.dataset_dir / audio_id /"transcript_norm.txt"   # reference
+        hyp_path = HypothesisFile.find(out_dir, audio_id)   # whisper result
+
+        calculator = CPWERCalculator(out_dir)
+        calculator.load_inputs(ref_path,hyp_path)
+        calculator.preprocess()
+        calculator.calculate()
+        return calculator.get_breakdown()
+
+    def _compute_der(self, audio_id, out_dir, cfg_id=None):
         from analyser.der.der_calculator import DERCalculator
         # call DER module
         ref_path = self.dataset_dir / audio_id /"transcript_norm.txt"   # reference
-        hyp_path = out_dir / f"{audio_id}.json"        # whisper result
+        hyp_path = HypothesisFile.find(out_dir, audio_id)   # whisper result
 
         calculator = DERCalculator()
         calculator.load_inputs(ref_path,hyp_path)
         der,breakdown = calculator.calculate()
 
+        if self.segment_errors and cfg_id is not None:
+            self._store_segment_errors(cfg_id, audio_id, ref_path, calculator)
+
         return der,breakdown
 
+    def _store_segment_errors(self, cfg_id, audio_id, ref_path, calculator):
+        """
+        DER attribution per reference utterance joined with its
+        emotion category and activation / valence / dominance
+        """
+        from analyser.der.der_io import DERIO
+        from dataset.emotion_labels import EmotionLabels
+
+        if audio_id not in self._emotions:
+            self._emotions[audio_id] = EmotionLabels(self.dataset_dir / audio_id).load()
+        labels = self._emotions[audio_id]
+
+        errors = calculator.attribute()
+        rows = []
+        for k, utt_id in enumerate(DERIO.load_reference_ids(ref_path)):
+            rows.append(dict(
+                labels.get(utt_id, {}),
+                utt_id=utt_id,
+                speaker=calculator.ref.speakers[k],
+                start=float(calculator.ref.starts[k]),
+                end_time=float(calculator.ref.ends[k]),
+                duration=float(errors["duration"][k]),
+                missed=float(errors["missed"][k]),
+                false_alarm=float(errors["false_alarm"][k]),
+                confusion=float(errors["confusion"][k]),
+            ))
+
+        self.store.save_segment_errors(self.sweep_id, cfg_id, audio_id, rows)
+
 
     def _compute_rtf(self, audio_path,processing_time):
         from analyser.rtf.rtf_calculator import RTFCalculator
@@ -180,21 +562,61 @@ class ExperimentManager:
         return result
 
 
-    def _save_results(self, cfg_id, audio_id, wer, der, rtf):
-        ExcelWriter(self.results_excel).write_audio_result(
-            cfg_id, audio_id, wer, der, rtf
+    def _store_job(self, cfg_id, outcome, scores):
+        wer, wer_breakdown, der, breakdown, rtf, audio_duration, cp_breakdown = scores
+        s, d, i, n = wer_breakdown
+        missed, false_alarm, confusion, total_speech = breakdown
+        cp_s, cp_d, cp_i, cp_n = cp_breakdown
+
+        self.store.mark_done(
+            self.sweep_id, cfg_id, outcome["job"]["audio_id"],
+            attempts=outcome["attempts"],
+            wer=wer, der=der, rtf=rtf,
+            processing_time=outcome["processing_time"],
+            audio_duration=audio_duration,
+            peak_rss_mb=outcome["peak_rss_mb"],
+            subset_id=self.subset_id,
+            substitutions=s, deletions=d, insertions=i, ref_words=n,
+            cpwer=round((cp_s + cp_d + cp_i) / cp_n, 4) if cp_n else 0.0,
+            cp_substitutions=cp_s, cp_deletions=cp_d, cp_insertions=cp_i,
+            missed=missed, false_alarm=false_alarm,
+            confusion=confusion, total_speech=total_speech,
+            params=json.dumps(outcome["params"], sort_keys=True, default=str)
         )
 
-    def _compute_overall(self,cfg_id,ref,hyp,process_time,audio_time,miss,false_alarm,confusion,reference_time):
-        from analyser.wer.wer_calculator import WERcalculator_overall
-
-        calculate = WERcalculator_overall(ref,hyp)
-        calculate.preprocess()
-        WER = calculate.calculate()
+    def _record_failure(self, cfg_id, outcome):
+        audio_id = outcome["job"]["audio_id"]
+        logger.error("%s | %s failed after %d attempt(s):\n%s",
+                     cfg_id, audio_id, outcome["attempts"], outcome["error"])
+
+        self.store.mark_failed(
+            self.sweep_id, cfg_id, audio_id,
+            error=outcome["error"],
+            attempts=outcome["attempts"],
+            peak_rss_mb=outcome["peak_rss_mb"],
+            subset_id=self.subset_id,
+            params=json.dumps(outcome["params"], sort_keys=True, default=str)
+        )
+        self.progress.job_failed(audio_id, outcome["error"].strip().splitlines()[-1])
 
-        DER = round(((miss+false_alarm+confusion)/reference_time),4)
+    @staticmethod
+    def _accumulate_row(overall: OverallAccumulator, row: dict):
+        """
+        Feed a stored job row back into the running accumulators
+        """
+        overall.update(
+            (row["substitutions"], row["deletions"], row["insertions"], row["ref_words"]),
+            (row["missed"], row["false_alarm"], row["confusion"], row["total_speech"]),
+            row["processing_time"],
+            row["audio_duration"],
+            # rows stored before cpWER existed have no cp counts
+            (row["cp_substitutions"], row["cp_deletions"], row["cp_insertions"], row["ref_words"])
+            if row.get("cp_substitutions") is not None else None
+        )
 
-        RTF = round(process_time/audio_time,4)
-        return [WER,DER,RTF]
-    
-        
+    def _compute_overall(self, overall: OverallAccumulator):
+        """
+        Overall WER / DER / RTF / cpWER from the per audio accumulators
+        """
+        scores = overall.snapshot()
+        return [scores["WER"], scores["DER"], scores["RTF"], scores["cpWER"]]
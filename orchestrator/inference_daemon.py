@@ -0,0 +1,245 @@
+import logging
+import os
+import secrets
+import time
+import traceback
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Dict, Optional
+
+from orchestrator.worker_supervisor import InferenceWorker
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PORT = 47650
+DEFAULT_KEY_FILE = Path.home() / ".cache" / "whisperx_iemocap" / "daemon.key"
+
+
+class InferenceDaemon:
+    """
+    Long lived inference process with the models kept loaded.
+    ---------------------------------------------------------
+    Listens on 127.0.0.1:<port> (multiprocessing.connection, the
+    same pickled (job, params) messages the supervised workers get)
+    and runs every job through one InferenceWorker, so the torch /
+    whisperx imports and the model load are paid once. A config that
+    changes the weights reloads them as in any worker.
+
+    Connections are served one at a time: jobs from several clients
+    queue up instead of sharing the GPU. Results are written by the
+    daemon to the job's out_dir (same machine); every reply carries
+    the timings:
+
+        ("run", job, params)            -> {"ok", "processing_time", "cache_events", "peak_rss_mb"}
+        ("sweep", job, params_by_cfg)   -> {"ok", "times", "cache_events", "peak_rss_mb"}
+        ("status",)                     -> {"ok", "runner", "jobs", "uptime"}
+        ("shutdown",)
+
+    The connection is authenticated with a random key written to
+    `key_file` (user only), which is also how clients find a
+    running daemon.
+    """
+
+    def __init__(self,
+                 port: int = DEFAULT_PORT,
+                 cache_dir: Optional[str] = None,
+                 key_file: Path = DEFAULT_KEY_FILE):
+        self.port = port
+        self.key_file = Path(key_file)
+        self.worker = InferenceWorker(cache_dir)
+        self.jobs = 0
+        self.started = time.time()
+        self._running = False
+
+    # ---------- PUBLIC API ----------
+
+    def preload(self, params: Optional[dict] = None):
+        """
+        Load the models of `params` (default config) before the first job
+        """
+        from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+        self.worker._ensure_runner(WhisperXConfigurator().configure(params or {}))
+
+    def serve(self):
+        authkey = secrets.token_bytes(32)
+        self._write_key(authkey)
+
+        self._running = True
+        with Listener(("127.0.0.1", self.port), authkey=authkey) as listener:
+            logger.info("[DAEMON] listening on 127.0.0.1:%d", self.port)
+            try:
+                while self._running:
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        # wrong key / port scan: not a client
+                        logger.warning("[DAEMON] rejected connection: %s", e)
+                        continue
+                    with conn:
+                        self._serve_client(conn)
+            finally:
+                self.key_file.unlink(missing_ok=True)
+                logger.info("[DAEMON] stopped after %d jobs", self.jobs)
+
+    # ---------- HELPERS ----------
+
+    def _write_key(self, authkey: bytes):
+        """
+        Key file created user only: never readable by others, not even
+        between creating and writing it
+        """
+        self.key_file.parent.mkdir(parents=True, exist_ok=True)
+        # a leftover file keeps its old mode under O_CREAT, start fresh
+        self.key_file.unlink(missing_ok=True)
+        fd = os.open(self.key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f"{self.port}\n{authkey.hex()}\n")
+
+    def _serve_client(self, conn):
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                return
+
+            command = msg[0]
+            if command == "shutdown":
+                self._running = False
+                conn.send({"ok": True})
+                return
+
+            try:
+                conn.send(self._handle(command, msg[1:]))
+            except (EOFError, OSError, BrokenPipeError):
+                # client went away mid job; the result file is still written
+                return
+
+    def _handle(self, command: str, args: tuple) -> dict:
+        if command == "status":
+            runner = self.worker.runner
+            return {"ok": True, "jobs": self.jobs, "uptime": time.time() - self.started,
+                    "runner": runner.load_key() if runner is not None else None}
+
+        try:
+            if command == "run":
+                job, params = args
+                processing_time = self.worker.run(job, params)
+                reply = {"ok": True, "processing_time": processing_time}
+            elif command == "sweep":
+                job, params_by_cfg = args
+                reply = {"ok": True, "times": self.worker.run_sweep(job, params_by_cfg)}
+            else:
+                return {"ok": False, "error": f"Unknown command '{command}'"}
+        except Exception:
+            return {"ok": False, "error": traceback.format_exc()}
+
+        self.jobs += 1
+        reply["cache_events"] = self.worker.cache_events
+        reply["peak_rss_mb"] = self.worker.peak_rss_mb
+        logger.info("[DAEMON] %s %s done", command, args[0]["audio_id"])
+        return reply
+
+
+class InferenceClient:
+    """
+    InferenceWorker stand-in that sends the jobs to a running
+    InferenceDaemon. run() / run_sweep() / cache_events / peak_rss_mb
+    (the daemon's) behave like the local worker's; the decoded audio is not sent (the daemon
+    decodes itself) and results are always saved by the daemon.
+    """
+
+    # lets ExperimentManager skip prefetching / deferred saving
+    remote = True
+
+    def __init__(self, port: int, authkey: bytes):
+        self.port = port
+        self.conn = Client(("127.0.0.1", port), authkey=authkey)
+        self.cache_events = []
+        self.peak_rss_mb = None
+
+    @classmethod
+    def connect(cls, key_file: Path = DEFAULT_KEY_FILE) -> Optional["InferenceClient"]:
+        """
+        Client of the daemon advertised in `key_file`, None when no
+        daemon is running
+        """
+        key_file = Path(key_file)
+        if not key_file.exists():
+            return None
+
+        try:
+            port, key = key_file.read_text(encoding="utf-8").split()
+            client = cls(int(port), bytes.fromhex(key))
+            status = client.status()
+        except (OSError, ValueError, EOFError, AuthenticationError) as e:
+            logger.debug("No inference daemon (%s)", e)
+            return None
+
+        logger.info("[DAEMON] using inference daemon on 127.0.0.1:%s (%d jobs served, runner %s)",
+                    port, status["jobs"], status["runner"])
+        return client
+
+    # ---------- PUBLIC API ----------
+
+    def run(self, job: dict, params: dict, audio=None, save: bool = True) -> float:
+        reply = self._call("run", job, params)
+        self.cache_events = reply["cache_events"]
+        self.peak_rss_mb = reply.get("peak_rss_mb")
+        return reply["processing_time"]
+
+    def run_sweep(self, job: dict, params_by_cfg: Dict[str, dict], audio=None) -> Dict[str, float]:
+        reply = self._call("sweep", job, params_by_cfg)
+        self.cache_events = reply["cache_events"]
+        self.peak_rss_mb = reply.get("peak_rss_mb")
+        return reply["times"]
+
+    def status(self) -> dict:
+        return self._call("status")
+
+    def shutdown(self):
+        self.conn.send(("shutdown",))
+        self.conn.recv()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- HELPERS ----------
+
+    def _call(self, command: str, *args) -> dict:
+        self.conn.send((command, *args))
+        reply = self.conn.recv()
+        if not reply["ok"]:
+            raise RuntimeError(f"Inference daemon: {reply['error']}")
+        return reply
+
+
+if __name__ == "__main__":
+    import argparse
+    from orchestrator.log_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Keep the WhisperX models loaded between runs")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-dir", default=None,
+                        help="stage caches (VAD / emissions / embeddings), "
+                             "e.g. <output>/cache")
+    parser.add_argument("--preload", action="store_true",
+                        help="load the default config's models before the first job")
+    parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level)
+
+    if args.stop:
+        client = InferenceClient.connect()
+        if client is not None:
+            client.shutdown()
+    else:
+        daemon = InferenceDaemon(args.port, args.cache_dir)
+        if args.preload:
+            daemon.preload()
+        daemon.serve()
@@ -0,0 +1,302 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobProfiler:
+    """
+    Per job CPU / memory profile (opt in, --profile).
+    -------------------------------------------------
+    Wraps one (config, audio) inference job:
+
+        cprofile : deterministic cProfile of every Python call
+        sample   : the job thread's stack read every `interval`
+                   seconds (low overhead, gives full stacks for
+                   flamegraphs)
+
+    Both modes run tracemalloc and cut it at the runner's stage
+    boundaries (transcribe / align / diarize / assign), keeping the
+    peak and the top allocation sites of each stage. tracemalloc
+    sees Python and NumPy allocations, not torch / CTranslate2
+    buffers.
+
+    Every job writes its own files under <profile_dir>/<config>/,
+    so jobs in supervised worker processes need nothing but the
+    spec carried in the job dict; ProfileReport merges them. With
+    profiling off no profiler object exists and jobs run unwrapped.
+    """
+
+    MODES = ("cprofile", "sample")
+
+    def __init__(self, profile_dir, mode: str = "cprofile",
+                 interval: float = 0.005, top: int = 15):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {self.MODES}")
+        self.profile_dir = Path(profile_dir)
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+
+    def to_spec(self) -> dict:
+        """
+        Picklable form for the job dict (worker processes)
+        """
+        return {"profile_dir": str(self.profile_dir), "mode": self.mode,
+                "interval": self.interval, "top": self.top}
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> "JobProfiler":
+        return cls(**spec)
+
+    # ---------- PUBLIC API ----------
+
+    @contextmanager
+    def job(self, cfg_id: str, audio_id: str, runner=None):
+        """
+        Profiles the body; `runner` (WhisperXRunner) reports its stages
+        """
+        folder = self.profile_dir / cfg_id
+        folder.mkdir(parents=True, exist_ok=True)
+
+        stages = _StageAllocations(self.top)
+
+        if self.mode == "cprofile":
+            profiler, sampler = cProfile.Profile(), None
+        else:
+            profiler, sampler = None, _StackSampler(threading.get_ident(), self.interval)
+
+        def enter_stage(name):
+            # snapshots are our own work, keep them out of the profile
+            if profiler is not None:
+                profiler.disable()
+            stages.enter(name)
+            if profiler is not None:
+                profiler.enable()
+
+        if runner is not None:
+            runner.stage_hook = enter_stage
+
+        stages.start()
+        if profiler is not None:
+            profiler.enable()
+        else:
+            sampler.start()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            else:
+                sampler.stop()
+            stages.stop()
+            if runner is not None:
+                runner.stage_hook = None
+
+            if profiler is not None:
+                profiler.dump_stats(str(folder / f"{audio_id}.prof"))
+            else:
+                (folder / f"{audio_id}.collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+            (folder / f"{audio_id}.alloc.json").write_text(json.dumps(stages.report), encoding="utf-8")
+
+
+class _StackSampler(threading.Thread):
+    """
+    Samples one thread's Python stack into collapsed stack counts
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class _StageAllocations:
+    """
+    tracemalloc cut at stage boundaries: peak and top allocation
+    sites (net size change by line) of each stage
+    """
+
+    def __init__(self, top: int):
+        self.top = top
+        self.report = {}
+        self._stage = None
+        self._snapshot = None
+        self._started = False
+
+    def start(self):
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self.enter("setup")
+
+    def enter(self, stage: str):
+        snapshot = tracemalloc.take_snapshot()
+        if self._stage is not None:
+            self._close(snapshot)
+        self._stage, self._snapshot = stage, snapshot
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        self._close(tracemalloc.take_snapshot())
+        self._stage = None
+        if self._started:
+            tracemalloc.stop()
+
+    def _close(self, snapshot):
+        _, peak = tracemalloc.get_traced_memory()
+        diff = self._own(snapshot).compare_to(self._own(self._snapshot), "lineno")
+        sites = [
+            {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+             "size_kb": round(s.size_diff / 1024, 1), "count": s.count_diff}
+            for s in sorted(diff, key=lambda s: s.size_diff, reverse=True)[:self.top]
+            if s.size_diff >= 1024
+        ]
+        # a stage entered twice (threshold sweep) keeps its worst run
+        previous = self.report.get(self._stage)
+        if previous is None or peak / 2 ** 20 > previous["peak_mb"]:
+            self.report[self._stage] = {"peak_mb": round(peak / 2 ** 20, 2), "sites": sites}
+
+    @staticmethod
+    def _own(snapshot):
+        """
+        Snapshot without the allocations of tracemalloc and this module
+        """
+        return snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)))
+
+
+class ProfileReport:
+    """
+    Merges the per job profiles of a profile_dir:
+
+        hotspots.txt     functions ranked by own and cumulative time
+                         (cProfile) or by samples (sampling)
+        stacks.collapsed summed sampled stacks; input of flamegraph.pl
+                         / speedscope
+        allocations.txt  per stage: max peak and the allocation sites
+                         summed over all jobs
+    """
+
+    def __init__(self, profile_dir, top: int = 30):
+        self.profile_dir = Path(profile_dir)
+        self.top = top
+
+    def write(self, config_id: Optional[str] = None) -> Dict[str, Path]:
+        """
+        Report over every job (or the jobs of one config); returns the
+        written files by name
+        """
+        root = self.profile_dir / config_id if config_id else self.profile_dir
+        written = {}
+
+        profiles = sorted(root.rglob("*.prof"))
+        # merged stacks.collapsed of an earlier report are not job files
+        stacks = sorted(p for p in root.rglob("*.collapsed") if p.name != "stacks.collapsed")
+        allocations = sorted(root.rglob("*.alloc.json"))
+
+        sections = []
+        if profiles:
+            sections.append(self._cprofile_hotspots(profiles))
+        if stacks:
+            merged = Counter()
+            for path in stacks:
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    stack, _, count = line.rpartition(" ")
+                    merged[stack] += int(count)
+            written["stacks"] = root / "stacks.collapsed"
+            written["stacks"].write_text(
+                "".join(f"{s} {c}\n" for s, c in merged.most_common()), encoding="utf-8")
+            sections.append(self._sample_hotspots(merged))
+
+        if sections:
+            written["hotspots"] = root / "hotspots.txt"
+            written["hotspots"].write_text("\n\n".join(sections), encoding="utf-8")
+
+        if allocations:
+            written["allocations"] = root / "allocations.txt"
+            written["allocations"].write_text(self._allocations(allocations), encoding="utf-8")
+
+        for name, path in written.items():
+            logger.info("[PROFILE] %s: %s", name, path)
+        return written
+
+    # ---------- HELPERS ----------
+
+    def _cprofile_hotspots(self, profiles) -> str:
+        import io
+
+        stats = pstats.Stats(str(profiles[0]), stream=io.StringIO())
+        for path in profiles[1:]:
+            stats.add(str(path))
+
+        out = io.StringIO()
+        stats.stream = out
+        out.write(f"cProfile, {len(profiles)} jobs\n")
+        for key in ("tottime", "cumulative"):
+            out.write(f"\n===== by {key} =====\n")
+            stats.sort_stats(key).print_stats(self.top)
+        return out.getvalue()
+
+    def _sample_hotspots(self, stacks: Counter) -> str:
+        own, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+
+        total = sum(stacks.values()) or 1
+        lines = [f"sampled stacks, {total} samples"]
+        for title, counts in (("own", own), ("inclusive", inclusive)):
+            lines.append(f"\n===== by {title} samples =====")
+            for frame, count in counts.most_common(self.top):
+                lines.append(f"{count:8d} {100 * count / total:6.1f}%  {frame}")
+        return "\n".join(lines)
+
+    def _allocations(self, paths) -> str:
+        peaks, sites = {}, {}
+        for path in paths:
+            for stage, data in json.loads(path.read_text(encoding="utf-8")).items():
+                peaks[stage] = max(peaks.get(stage, 0.0), data["peak_mb"])
+                per_site = sites.setdefault(stage, Counter())
+                for site in data["sites"]:
+                    per_site[site["site"]] += site["size_kb"]
+
+        lines = [f"tracemalloc, {len(paths)} jobs"]
+        for stage in peaks:
+            lines.append(f"\n===== {stage}: peak {peaks[stage]:.1f} MB =====")
+            for site, size_kb in sites[stage].most_common(self.top):
+                lines.append(f"{size_kb / 1024:10.2f} MB  {site}")
+        return "\n".join(lines)
+
@@ -0,0 +1,314 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Shared (config, audio) work queue with leases.
+    ----------------------------------------------
+    SQLite file on storage every worker host can reach. A worker
+    leases one job for `lease_seconds` and keeps the lease alive with
+    heartbeat(); a job whose lease expired (worker died, host lost)
+    goes back to pending and is picked up by someone else.
+
+    Job states: pending -> leased -> done / failed
+    (a failed attempt goes back to pending until max_attempts).
+
+    Configs are also tracked so exactly one worker finalizes each
+    config (overall scores, Excel) once its last job is finished.
+
+    SQLite locking needs a filesystem with working POSIX locks
+    (local disk, most NFSv4 / SMB setups); on plain NFSv3 point the
+    queue at a local disk of one host shared through the network.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._init_schema()
+
+    # --------------------------
+    # HELPERS
+    # --------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sweep_id TEXT NOT NULL,
+                    config_id TEXT NOT NULL,
+                    audio_id TEXT NOT NULL,
+                    params TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_until REAL,
+                    heartbeat REAL,
+                    error TEXT,
+                    updated_at REAL,
+                    UNIQUE (sweep_id, config_id, audio_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_configs (
+                    sweep_id TEXT NOT NULL,
+                    config_id TEXT NOT NULL,
+                    finalized INTEGER NOT NULL DEFAULT 0,
+                    aliases TEXT,
+                    PRIMARY KEY (sweep_id, config_id)
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(queue_configs)")}
+            if "aliases" not in columns:
+                conn.execute("ALTER TABLE queue_configs ADD COLUMN aliases TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS queue_status ON queue (sweep_id, status)")
+        finally:
+            conn.close()
+
+    def _transaction(self, fn):
+        """
+        Runs fn(conn) inside BEGIN IMMEDIATE (one writer at a time)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn)
+                conn.execute("COMMIT")
+                return result
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _job(row) -> Optional[dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"]) if job["params"] else {}
+        return job
+
+    # --------------------------
+    # PUBLIC API
+    # --------------------------
+
+    def enqueue(self, sweep_id: str, configs: List[Dict], audio_ids: List[str]) -> int:
+        """
+        Adds every (config, audio) job not queued yet.
+        Returns the number of new jobs.
+        """
+        def insert(conn):
+            added = 0
+            now = time.time()
+            for cfg in configs:
+                params = json.dumps(cfg["params"], sort_keys=True, default=str)
+                conn.execute("INSERT OR IGNORE INTO queue_configs (sweep_id, config_id) VALUES (?, ?)",
+                             (sweep_id, cfg["config_id"]))
+                # config ids sharing this effective config (ConfigPlanner)
+                conn.execute("UPDATE queue_configs SET aliases=? WHERE sweep_id=? AND config_id=?",
+                             (json.dumps(cfg.get("aliases", [])), sweep_id, cfg["config_id"]))
+                for audio_id in audio_ids:
+                    cur = conn.execute(
+                        """INSERT OR IGNORE INTO queue
+                           (sweep_id, config_id, audio_id, params, updated_at)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        (sweep_id, cfg["config_id"], audio_id, params, now)
+                    )
+                    added += cur.rowcount
+            return added
+
+        return self._transaction(insert)
+
+    def reclaim_stale(self, sweep_id: str) -> int:
+        """
+        Expired leases back to pending. Returns the number reclaimed.
+        """
+        return self._transaction(lambda conn: self._reclaim(conn, sweep_id))
+
+    def _reclaim(self, conn: sqlite3.Connection, sweep_id: str) -> int:
+        # a job that keeps killing its workers ends up failed, not pending forever
+        now = time.time()
+        return conn.execute(
+            """UPDATE queue SET
+                   status=CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   error='lease expired (worker ' || COALESCE(worker, '?') || ')',
+                   worker=NULL, lease_until=NULL, updated_at=?
+               WHERE sweep_id=? AND status='leased' AND lease_until < ?""",
+            (self.max_attempts, now, sweep_id, now)
+        ).rowcount
+
+    def lease(self, sweep_id: str, worker_id: str,
+              prefer_config: Optional[str] = None) -> Optional[dict]:
+        """
+        Leases the next pending job (same config as `prefer_config`
+        first, so a worker keeps its loaded models). None = nothing to do.
+        """
+        def take(conn):
+            self._reclaim(conn, sweep_id)
+            now = time.time()
+            row = conn.execute(
+                """SELECT * FROM queue WHERE sweep_id=? AND status='pending'
+                   ORDER BY (config_id = ?) DESC, seq LIMIT 1""",
+                (sweep_id, prefer_config)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                """UPDATE queue SET status='leased', worker=?, attempts=attempts + 1,
+                   lease_until=?, heartbeat=?, updated_at=? WHERE seq=?""",
+                (worker_id, now + self.lease_seconds, now, now, row["seq"])
+            )
+            job = self._job(row)
+            job.update(status="leased", worker=worker_id, attempts=row["attempts"] + 1)
+            return job
+
+        return self._transaction(take)
+
+    def heartbeat(self, job: dict, worker_id: str) -> bool:
+        """
+        Extends the lease. False when the lease was lost (reclaimed).
+        """
+        def beat(conn):
+            now = time.time()
+            return conn.execute(
+                """UPDATE queue SET lease_until=?, heartbeat=?
+                   WHERE seq=? AND status='leased' AND worker=?""",
+                (now + self.lease_seconds, now, job["seq"], worker_id)
+            ).rowcount == 1
+
+        return self._transaction(beat)
+
+    def complete(self, job: dict, worker_id: str) -> bool:
+        def done(conn):
+            return conn.execute(
+                """UPDATE queue SET status='done', lease_until=NULL, error=NULL, updated_at=?
+                   WHERE seq=? AND status='leased' AND worker=?""",
+                (time.time(), job["seq"], worker_id)
+            ).rowcount == 1
+
+        return self._transaction(done)
+
+    def fail(self, job: dict, worker_id: str, error: str) -> Optional[str]:
+        """
+        Back to pending, or failed after max_attempts. Returns the new
+        status, None when the lease was lost (the job is someone else's)
+        """
+        def failed(conn):
+            row = conn.execute("SELECT attempts FROM queue WHERE seq=?", (job["seq"],)).fetchone()
+            status = "failed" if row["attempts"] >= self.max_attempts else "pending"
+            updated = conn.execute(
+                """UPDATE queue SET status=?, worker=NULL, lease_until=NULL, error=?, updated_at=?
+                   WHERE seq=? AND status='leased' AND worker=?""",
+                (status, error, time.time(), job["seq"], worker_id)
+            ).rowcount
+            return status if updated == 1 else None
+
+        return self._transaction(failed)
+
+    def claim_finalize(self, sweep_id: str, config_id: str) -> bool:
+        """
+        True for exactly one caller, once every job of the config is
+        done or failed
+        """
+        def claim(conn):
+            open_jobs = conn.execute(
+                """SELECT COUNT(*) FROM queue WHERE sweep_id=? AND config_id=?
+                   AND status IN ('pending', 'leased')""",
+                (sweep_id, config_id)
+            ).fetchone()[0]
+            if open_jobs:
+                return False
+            return conn.execute(
+                """UPDATE queue_configs SET finalized=1
+                   WHERE sweep_id=? AND config_id=? AND finalized=0""",
+                (sweep_id, config_id)
+            ).rowcount == 1
+
+        return self._transaction(claim)
+
+    def config_ids(self, sweep_id: str) -> List[str]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT config_id FROM queue_configs WHERE sweep_id=? ORDER BY config_id",
+                                (sweep_id,)).fetchall()
+        finally:
+            conn.close()
+        return [row["config_id"] for row in rows]
+
+    def aliases(self, sweep_id: str, config_id: str) -> List[str]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT aliases FROM queue_configs WHERE sweep_id=? AND config_id=?",
+                               (sweep_id, config_id)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row["aliases"]) if row is not None and row["aliases"] else []
+
+    def counts(self, sweep_id: str) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM queue WHERE sweep_id=? GROUP BY status",
+                (sweep_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update({status: n for status, n in rows})
+        return counts
+
+
+class FileLock:
+    """
+    Cross host mutex as an O_EXCL lock file on shared storage
+    (used around the shared Excel sheet). A lock older than
+    `stale_seconds` is considered abandoned and broken.
+    """
+
+    def __init__(self, path: str, stale_seconds: float = 600.0, poll: float = 1.0):
+        self.path = Path(path)
+        self.stale_seconds = stale_seconds
+        self.poll = poll
+
+    def __enter__(self):
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, default_worker_id().encode("utf-8"))
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > self.stale_seconds:
+                        self.path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(self.poll)
+
+    def __exit__(self, *exc):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
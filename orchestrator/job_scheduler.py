@@ -0,0 +1,110 @@
+import heapq
+import logging
+import statistics
+from typing import Dict, List, Optional
+
+from dataset.duration_cache import DurationCache
+from results.results_store import ResultsStore
+
+logger = logging.getLogger(__name__)
+
+
+class JobScheduler:
+    """
+    Longest processing time first ordering of the jobs of one config.
+    -----------------------------------------------------------------
+    The cost of a (config, audio) job is predicted as
+
+        audio duration * RTF of the config
+
+    with the duration from the DurationCache and the RTF from the
+    done jobs of that config in the results store (this sweep), else
+    the median RTF of the configs scheduled before it, else 1.0.
+
+    Handing the most expensive job to whichever worker frees up first
+    is greedy LPT list scheduling: the long dialogs start early and
+    the short ones fill the gaps at the end, instead of one worker
+    finishing the biggest file alone.
+
+    Only the jobs of one config are ordered: configs still run one
+    after the other (each drains before the next starts, so the
+    workers keep their loaded models), and each config ends with its
+    own short tail. Within a config the RTF is a common factor, so the
+    order is the duration order whatever the RTF; the RTF only scales
+    the predicted costs and makespan.
+    """
+
+    def __init__(self,
+                store: ResultsStore,
+                durations: DurationCache,
+                sweep_id: Optional[str] = None):
+        self.store = store
+        self.durations = durations
+        self.sweep_id = sweep_id
+        # cfg_id -> RTF from its stored jobs (None: no history yet)
+        self._rtf = {}
+
+    # ---------- PUBLIC API ----------
+
+    def order(self, cfg_id: Optional[str], jobs: List[Dict], num_workers: int = 1) -> List[Dict]:
+        """
+        Jobs sorted by predicted cost, longest first. Each job gets a
+        "predicted_cost" (seconds); audios whose duration cannot be
+        read go first, as they cannot be placed.
+        """
+        # jobs of this config stored since the last call refine its RTF
+        self._rtf.pop(cfg_id, None)
+        for job in jobs:
+            job["predicted_cost"] = self.predict(cfg_id, job)
+        self.durations.save()
+
+        unknown = [job for job in jobs if job["predicted_cost"] is None]
+        known = sorted((job for job in jobs if job["predicted_cost"] is not None),
+                       key=lambda job: job["predicted_cost"], reverse=True)
+
+        if known and num_workers > 1:
+            costs = [job["predicted_cost"] for job in known]
+            logger.info("%s: predicted makespan %.0fs on %d workers (work / workers = %.0fs)",
+                        cfg_id, self.makespan(costs, num_workers), num_workers,
+                        sum(costs) / num_workers)
+
+        return unknown + known
+
+    def predict(self, cfg_id: Optional[str], job: Dict) -> Optional[float]:
+        duration = self.durations.get(job["wav_path"])
+        if duration is None:
+            return None
+        return duration * self.rtf(cfg_id)
+
+    def rtf(self, cfg_id: Optional[str]) -> float:
+        if cfg_id is not None and cfg_id not in self._rtf:
+            self._rtf[cfg_id] = self._load_history(cfg_id)
+
+        rtf = self._rtf.get(cfg_id)
+        if rtf is not None:
+            return rtf
+        known = [value for value in self._rtf.values() if value is not None]
+        return statistics.median(known) if known else 1.0
+
+    @staticmethod
+    def makespan(costs: List[float], num_workers: int) -> float:
+        """
+        Finish time of `costs` dispatched in order to the first free worker
+        """
+        finish = [0.0] * max(1, num_workers)
+        for cost in costs:
+            heapq.heappush(finish, heapq.heappop(finish) + cost)
+        return max(finish)
+
+    # ---------- HELPERS ----------
+
+    def _load_history(self, cfg_id: str) -> Optional[float]:
+        """
+        RTF of the done jobs of one config (this sweep only when set)
+        """
+        time = duration = 0.0
+        for row in self.store.get_jobs(self.sweep_id, cfg_id, status="done"):
+            if row["processing_time"] and row["audio_duration"]:
+                time += row["processing_time"]
+                duration += row["audio_duration"]
+        return time / duration if duration else None
@@ -0,0 +1,25 @@
+import logging
+from typing import Optional
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+
+def configure_logging(level: str = "INFO", log_file: Optional[str] = None):
+    """
+    Configure leveled logging for the whole pipeline.
+    -------------------------------------------------
+    :param level: DEBUG / INFO / WARNING / ERROR
+    :param log_file: optional file that receives the same records
+    """
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+
+    logging.basicConfig(
+        level=getattr(logging, str(level).upper(), logging.INFO),
+        format=LOG_FORMAT,
+        datefmt="%H:%M:%S",
+        handlers=handlers,
+        force=True,
+    )
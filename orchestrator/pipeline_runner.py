@@ -1,8 +1,22 @@
 # orchestrator/pipeline_runner.py
+import logging
 from pathlib import Path
+from typing import Optional
 from config.config_loader import ConfigLoader
+from config.config_planner import ConfigPlanner
 from dataset.dataset_manager import DatasetManager
 from orchestrator.experiment_manager import ExperimentManager
+from orchestrator.autotuner import Autotuner
+from orchestrator.inference_daemon import InferenceClient
+from orchestrator.job_profiler import JobProfiler
+from orchestrator.job_queue import JobQueue
+from orchestrator.job_scheduler import JobScheduler
+from dataset.duration_cache import DurationCache
+from results.results_store import ResultsStore
+from orchestrator.progress_reporter import ProgressReporter
+from orchestrator.worker_supervisor import WorkerSupervisor
+
+logger = logging.getLogger(__name__)
 
 
 class PipelineRunner:
@@ -11,31 +25,147 @@ class PipelineRunner:
                 dataset_dir: str,
                 output_dir: str,
                 config_file: str,
-                results_excel: str):
+                results_excel: str,
+                status_file: Optional[str] = None,
+                metrics_port: Optional[int] = None,
+                workers: Optional[int] = None,
+                memory_limit_mb: Optional[float] = None,
+                max_retries: int = 2,
+                sweep_id: Optional[str] = None,
+                resume: bool = False,
+                autotune: bool = False,
+                layout_file: Optional[str] = None,
+                threshold_sweep: bool = False,
+                queue_file: Optional[str] = None,
+                lease_seconds: float = 600.0,
+                score_workers: int = 2,
+                prefetch: int = 2,
+                longest_first: bool = True,
+                subset_fraction: Optional[float] = None,
+                subset_minutes: Optional[float] = None,
+                subset_seed: int = 0,
+                dedup: bool = True,
+                word_alignments: bool = False,
+                segment_errors: bool = False,
+                debug_json: bool = False,
+                profile: Optional[str] = None,
+                use_daemon: bool = True):
+        """
+        :param workers: explicit worker count; None = autotuned layout
+                        of this machine if one is stored, else in-process
+        :param autotune: benchmark layouts on this machine before the sweep
+        :param threshold_sweep: one linkage per audio for configs that
+                                only differ in clustering params
+        :param queue_file: shared SQLite job queue for enqueue() / work()
+        :param lease_seconds: how long a silent worker keeps its job
+        :param score_workers: threads scoring / writing finished jobs
+                              while inference goes on (0 = sequential)
+        :param prefetch: audios decoded ahead of in-process inference
+        :param longest_first: dispatch the longest predicted jobs first
+                              (parallel workers / shared queue)
+        :param subset_fraction / subset_minutes: run on a stratified
+                              quick-eval subset of that size instead of
+                              every dialog (see DatasetManager.select_subset)
+        :param subset_seed: picks a different, equally stratified subset
+        :param dedup: rows resolving to the same effective config run once
+        :param word_alignments: keep per word error ops in the results store
+        :param segment_errors: keep DER errors per utterance with emotion labels
+        :param debug_json: also write the full WhisperX JSON of every job
+        :param profile: None, "cprofile" or "sample": profile every job
+                        into <output_dir>/profiles/<sweep_id> (JobProfiler)
+        :param use_daemon: send the jobs to a running inference daemon
+                           (orchestrator.inference_daemon) when there is
+                           one and no workers / memory limit / autotune
+                           was asked for
+        """
 
         self.dataset_dir = dataset_dir
         self.output_dir = output_dir
         self.config_file = config_file
         self.results_excel = results_excel
+        self.status_file = status_file
+        self.metrics_port = metrics_port
+        self.workers = workers
+        self.memory_limit_mb = memory_limit_mb
+        self.max_retries = max_retries
+        self.sweep_id = sweep_id or Path(config_file).stem
+        self.resume = resume
+        self.autotune = autotune
+        self.layout_file = layout_file
+        self.threshold_sweep = threshold_sweep
+        self.queue_file = queue_file
+        self.lease_seconds = lease_seconds
+        self.score_workers = score_workers
+        self.prefetch = prefetch
+        self.longest_first = longest_first
+        self.subset_fraction = subset_fraction
+        self.subset_minutes = subset_minutes
+        self.subset_seed = subset_seed
+        self.dedup = dedup
+        self.word_alignments = word_alignments
+        self.segment_errors = segment_errors
+        self.debug_json = debug_json
+        self.profile = profile
+        self.use_daemon = use_daemon
 
 
-    def run(self, start_config: str, end_config: str):
+    def run(self, start_config: Optional[str] = None, end_config: Optional[str] = None):
 
-        print("\n===== INITIALIZING PIPELINE =====\n")
+        logger.info("===== INITIALIZING PIPELINE =====")
 
         # ---- Load Configs ----
         loader = ConfigLoader(self.config_file)
         configs = loader.load_configs(start_config, end_config)
 
         # ---- Dataset Manager ----
-        dataset = DatasetManager(self.dataset_dir)
-        audio_items = dataset.get_all_audio_files()
+        audio_items, subset_id = self._audio_items()
+
+        # ---- Worker layout ----
+        layout = None
+        if self.autotune:
+            layout = Autotuner(audio_items, layout_file=self.layout_file).run()
+        elif self.workers is None:
+            layout = Autotuner.load_layout(self.layout_file)
+            if layout is not None:
+                logger.info("Using autotuned layout: %s", layout["best"])
+
+        # ---- Warm inference daemon, if one is running ----
+        inference = self._inference(layout)
+
+        # ---- Supervised workers (only when asked for) ----
+        supervisor = None
+        if inference is None and ((self.workers or 1) > 1 or self.memory_limit_mb or layout is not None):
+            supervisor = WorkerSupervisor(
+                num_workers=self.workers or 1,
+                memory_limit_mb=self.memory_limit_mb,
+                max_retries=self.max_retries,
+                layout=layout if self.workers is None else None,
+                cache_dir=Path(self.output_dir) / "cache"
+            )
 
         # ---- Experiment Manager ----
         manager = ExperimentManager(
             dataset_dir=self.dataset_dir,
             output_root=self.output_dir,
-            results_excel=self.results_excel
+            results_excel=self.results_excel,
+            progress=ProgressReporter(
+                status_file=self.status_file,
+                metrics_port=self.metrics_port
+            ),
+            supervisor=supervisor,
+            sweep_id=self.sweep_id,
+            resume=self.resume,
+            threshold_sweep=self.threshold_sweep,
+            score_workers=self.score_workers,
+            prefetch=self.prefetch,
+            scheduler=self._scheduler(),
+            subset_id=subset_id,
+            dedup=self.dedup,
+            word_alignments=self.word_alignments,
+            segment_errors=self.segment_errors,
+            debug_json=self.debug_json,
+            profiler=self._profiler(),
+            inference=inference
         )
 
         # ---- Run full pipeline ----
@@ -44,4 +174,125 @@ class PipelineRunner:
             audio_items=audio_items
         )
 
-        print("\n===== PIPELINE COMPLETE =====\n")
+        logger.info("===== PIPELINE COMPLETE =====")
+
+
+    def enqueue(self, start_config: Optional[str] = None, end_config: Optional[str] = None) -> int:
+        """
+        Puts every (config, audio) job of the range on the shared queue
+        """
+        configs = ConfigLoader(self.config_file).load_configs(start_config, end_config)
+        configs = [c for c in configs if c["config_id"].lower() != "config_default"]
+        if self.dedup:
+            configs = ConfigPlanner().plan(configs)
+        audio_items, _ = self._audio_items()
+
+        # queue order = lease order within a config: longest dialogs first
+        # (the RTF of a config scales all its jobs alike, so one duration
+        # order serves every config)
+        scheduler = self._scheduler()
+        if scheduler is not None:
+            audio_items = scheduler.order(None, audio_items)
+
+        queue = self._queue()
+        added = queue.enqueue(self.sweep_id, configs, [item["audio_id"] for item in audio_items])
+        logger.info("Queued %d new jobs for sweep %s: %s", added, self.sweep_id, queue.counts(self.sweep_id))
+        return added
+
+    def work(self) -> int:
+        """
+        Works off the shared queue until it is drained. Start one of
+        these per GPU / host; every host needs the dataset, output dir
+        and results Excel on the same shared storage.
+        """
+        from orchestrator.queue_worker import QueueWorker
+
+        # any queued audio may come to this host; the subset only tags results
+        subset_id = self._audio_items()[1] if self._subset_requested() else None
+        dataset = DatasetManager(self.dataset_dir)
+        audio_items = {item["audio_id"]: item for item in dataset.get_all_audio_files()}
+
+        manager = ExperimentManager(
+            dataset_dir=self.dataset_dir,
+            output_root=self.output_dir,
+            results_excel=self.results_excel,
+            progress=ProgressReporter(
+                status_file=self.status_file,
+                metrics_port=self.metrics_port
+            ),
+            sweep_id=self.sweep_id,
+            excel_per_job=False,
+            score_workers=self.score_workers,
+            prefetch=self.prefetch,
+            subset_id=subset_id,
+            word_alignments=self.word_alignments,
+            segment_errors=self.segment_errors,
+            debug_json=self.debug_json,
+            profiler=self._profiler(),
+            inference=self._inference()
+        )
+
+        return QueueWorker(self._queue(), manager, audio_items, self.sweep_id).run()
+
+    def _subset_requested(self) -> bool:
+        return self.subset_fraction is not None or self.subset_minutes is not None
+
+    def _audio_items(self):
+        """
+        (audio items, subset_id): every dialog, or the stratified
+        subset when one was asked for (recorded in the results store)
+        """
+        dataset = DatasetManager(
+            self.dataset_dir,
+            durations=DurationCache(Path(self.output_dir) / "cache" / "durations.json")
+        )
+        if not self._subset_requested():
+            return dataset.get_all_audio_files(), None
+
+        subset = dataset.select_subset(fraction=self.subset_fraction,
+                                       minutes=self.subset_minutes,
+                                       seed=self.subset_seed)
+        dataset.durations.save()
+        ResultsStore(Path(self.output_dir) / "results.sqlite").save_subset(subset)
+        logger.info("Quick-eval subset %s: %d dialogs, %.1f of %.1f minutes",
+                    subset["subset_id"], len(subset["audio_ids"]),
+                    subset["minutes"], subset["spec"]["dataset_minutes"])
+        return dataset.get_subset_audio_files(subset), subset["subset_id"]
+
+    def _scheduler(self) -> Optional[JobScheduler]:
+        if not self.longest_first:
+            return None
+        return JobScheduler(
+            ResultsStore(Path(self.output_dir) / "results.sqlite"),
+            DurationCache(Path(self.output_dir) / "cache" / "durations.json"),
+            sweep_id=self.sweep_id
+        )
+
+    def _inference(self, layout: Optional[dict] = None) -> Optional[InferenceClient]:
+        """
+        Client of the running inference daemon; None = infer here (no
+        daemon, or workers / memory limit / autotune asked for, which
+        only the supervised workers honour)
+        """
+        if not self.use_daemon:
+            return None
+        if self.workers or self.memory_limit_mb or self.autotune:
+            logger.info("Worker layout requested (--workers / --memory-limit-mb / --autotune): "
+                        "not using an inference daemon")
+            return None
+
+        client = InferenceClient.connect()
+        if client is not None and layout is not None:
+            logger.warning("Inference daemon running: the stored autotune layout %s is not used "
+                           "(--no-daemon to run with it)", layout["best"])
+        return client
+
+    def _profiler(self) -> Optional[JobProfiler]:
+        if not self.profile:
+            return None
+        return JobProfiler(Path(self.output_dir) / "profiles" / self.sweep_id, mode=self.profile)
+
+    def _queue(self) -> JobQueue:
+        if not self.queue_file:
+            raise ValueError("queue_file is required for enqueue() / work()")
+        return JobQueue(self.queue_file, lease_seconds=self.lease_seconds)
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Structured progress / throughput tracking for a sweep.
+    ------------------------------------------------------
+    Tracks:
+        -> jobs done / total  (one job = one (config, audio) pair)
+        -> audio hours processed
+        -> current and average RTF
+        -> ETA for the running config and for the whole sweep
+        -> cache hit rates (any stage can call record_cache)
+
+    Sinks (both optional):
+        -> status_file  : JSON snapshot rewritten at most every `interval` s
+        -> metrics_port : Prometheus text format on http://127.0.0.1:<port>/metrics
+    """
+
+    def __init__(self,
+                status_file: Optional[str] = None,
+                metrics_port: Optional[int] = None,
+                interval: float = 5.0):
+
+        self.status_file = Path(status_file) if status_file else None
+        self.metrics_port = metrics_port
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._server = None
+        self._last_write = 0.0
+
+        self.sweep_start = time.time()
+        self.jobs_total = 0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.audio_seconds = 0.0
+        self.processing_seconds = 0.0
+        self.current_rtf = 0.0
+
+        self.config_id = None
+        self.config_start = None
+        self.config_jobs_total = 0
+        self.config_jobs_done = 0
+
+        self.cache_hits = {}
+        self.cache_misses = {}
+
+    # ---------- LIFECYCLE ----------
+
+    def begin_sweep(self, jobs_total: int):
+        with self._lock:
+            self.sweep_start = time.time()
+            self.jobs_total = jobs_total
+
+        if self.metrics_port and self._server is None:
+            self._start_metrics_server()
+
+        logger.info("Sweep started: %d jobs", jobs_total)
+        self._flush(force=True)
+
+    def begin_config(self, config_id: str, jobs_total: int):
+        with self._lock:
+            self.config_id = config_id
+            self.config_start = time.time()
+            self.config_jobs_total = jobs_total
+            self.config_jobs_done = 0
+
+        logger.info("=== Running Config: %s (%d audios) ===", config_id, jobs_total)
+
+    def job_done(self, audio_id: str, audio_duration: float, processing_time: float):
+        with self._lock:
+            self.jobs_done += 1
+            self.config_jobs_done += 1
+            self.audio_seconds += audio_duration
+            self.processing_seconds += processing_time
+            self.current_rtf = processing_time / audio_duration if audio_duration else 0.0
+
+        snap = self.snapshot()
+        logger.info(
+            "[%d/%d] %s | %s rtf=%.3f avg_rtf=%.3f | eta config %s sweep %s",
+            snap["jobs_done"], snap["jobs_total"], self.config_id, audio_id,
+            snap["current_rtf"], snap["average_rtf"],
+            self._fmt_eta(snap["eta_config_s"]), self._fmt_eta(snap["eta_sweep_s"])
+        )
+        self._flush()
+
+    def job_failed(self, audio_id: str, reason: str = ""):
+        with self._lock:
+            self.jobs_done += 1
+            self.jobs_failed += 1
+            self.config_jobs_done += 1
+
+        logger.warning("[FAILED] %s | %s %s", self.config_id, audio_id, reason)
+        self._flush()
+
+    def record_cache(self, name: str, hit: bool):
+        with self._lock:
+            table = self.cache_hits if hit else self.cache_misses
+            table[name] = table.get(name, 0) + 1
+
+    def close(self):
+        self._flush(force=True)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # ---------- SNAPSHOT ----------
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.time()
+            elapsed = now - self.sweep_start
+
+            per_job = elapsed / self.jobs_done if self.jobs_done else None
+            eta_sweep = per_job * (self.jobs_total - self.jobs_done) if per_job else None
+
+            eta_config = None
+            if self.config_start is not None and self.config_jobs_done:
+                config_per_job = (now - self.config_start) / self.config_jobs_done
+                eta_config = config_per_job * (self.config_jobs_total - self.config_jobs_done)
+
+            caches = {}
+            for name in set(self.cache_hits) | set(self.cache_misses):
+                hits = self.cache_hits.get(name, 0)
+                total = hits + self.cache_misses.get(name, 0)
+                caches[name] = {
+                    "hits": hits,
+                    "lookups": total,
+                    "hit_rate": hits / total if total else 0.0,
+                }
+
+            return {
+                "timestamp": now,
+                "elapsed_s": elapsed,
+                "config_id": self.config_id,
+                "jobs_done": self.jobs_done,
+                "jobs_failed": self.jobs_failed,
+                "jobs_total": self.jobs_total,
+                "config_jobs_done": self.config_jobs_done,
+                "config_jobs_total": self.config_jobs_total,
+                "audio_hours": self.audio_seconds / 3600.0,
+                "current_rtf": self.current_rtf,
+                "average_rtf": (self.processing_seconds / self.audio_seconds
+                                if self.audio_seconds else 0.0),
+                "eta_config_s": eta_config,
+                "eta_sweep_s": eta_sweep,
+                "caches": caches,
+            }
+
+    def render_prometheus(self) -> str:
+        """
+        Snapshot in Prometheus text exposition format
+        """
+        snap = self.snapshot()
+        lines = []
+
+        def gauge(name, value, help_text, labels=""):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{labels} {value if value is not None else 'NaN'}")
+
+        gauge("sweep_jobs_done", snap["jobs_done"], "Finished (config, audio) jobs")
+        gauge("sweep_jobs_failed", snap["jobs_failed"], "Failed (config, audio) jobs")
+        gauge("sweep_jobs_total", snap["jobs_total"], "Planned (config, audio) jobs")
+        gauge("sweep_audio_hours", snap["audio_hours"], "Audio hours processed")
+        gauge("sweep_current_rtf", snap["current_rtf"], "RTF of the last job")
+        gauge("sweep_average_rtf", snap["average_rtf"], "Average RTF of the sweep")
+        gauge("sweep_eta_config_seconds", snap["eta_config_s"], "ETA of the running config")
+        gauge("sweep_eta_seconds", snap["eta_sweep_s"], "ETA of the whole sweep")
+
+        if snap["caches"]:
+            lines.append("# HELP sweep_cache_hit_rate Cache hit rate per cache")
+            lines.append("# TYPE sweep_cache_hit_rate gauge")
+            for name, c in sorted(snap["caches"].items()):
+                lines.append(f'sweep_cache_hit_rate{{cache="{name}"}} {c["hit_rate"]}')
+
+        return "\n".join(lines) + "\n"
+
+    # ---------- SINKS ----------
+
+    def _flush(self, force: bool = False):
+        if self.status_file is None:
+            return
+
+        now = time.time()
+        if not force and now - self._last_write < self.interval:
+            return
+        self._last_write = now
+
+        # write to a temp file first so readers never see half a JSON
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.status_file.with_suffix(self.status_file.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        os.replace(tmp, self.status_file)
+
+    def _start_metrics_server(self):
+        reporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = reporter.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.metrics_port), _Handler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        logger.info("Metrics endpoint on http://127.0.0.1:%d/metrics", self.metrics_port)
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _fmt_eta(seconds) -> str:
+        if seconds is None:
+            return "--:--:--"
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
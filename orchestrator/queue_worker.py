@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from orchestrator.experiment_manager import ExperimentManager
+from orchestrator.job_queue import FileLock, JobQueue, default_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat:
+    """
+    Keeps a job lease alive from a background thread
+    """
+
+    def __init__(self, queue: JobQueue, job: dict, worker_id: str, interval: float):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job, self.worker_id):
+                    self.lost = True
+                    logger.warning("Lease lost: %s | %s", self.job["config_id"], self.job["audio_id"])
+                    return
+            except Exception:
+                logger.exception("Heartbeat failed")
+
+
+class QueueWorker:
+    """
+    Pulls (config, audio) jobs from a shared JobQueue.
+    --------------------------------------------------
+    Any number of these can run on any number of hosts against the
+    same queue. Each leased job is run and scored through the
+    ExperimentManager (results go to its ResultsStore) while a
+    heartbeat keeps the lease alive. The worker that finishes the last
+    job of a config writes that config's Excel block and overall
+    scores. The worker exits once nothing is pending or leased, after
+    finalizing any config left unfinalized (its last lease expired).
+    """
+
+    def __init__(self,
+                queue: JobQueue,
+                manager: ExperimentManager,
+                audio_items: Dict[str, dict],
+                sweep_id: str,
+                worker_id: Optional[str] = None,
+                heartbeat_interval: Optional[float] = None,
+                idle_poll: float = 30.0):
+        """
+        :param audio_items: audio_id -> {"audio_id", "wav_path"} as seen
+                            from this host (dataset mounts may differ)
+        """
+        self.queue = queue
+        self.manager = manager
+        self.audio_items = audio_items
+        self.sweep_id = sweep_id
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_interval = heartbeat_interval or max(1.0, queue.lease_seconds / 3)
+        self.idle_poll = idle_poll
+
+    # ---------- PUBLIC API ----------
+
+    def run(self) -> int:
+        """
+        Works until the sweep is drained. Returns the number of jobs done.
+        """
+        counts = self.queue.counts(self.sweep_id)
+        logger.info("Queue worker %s joined sweep %s: %s", self.worker_id, self.sweep_id, counts)
+        # progress / ETA over the jobs still open when this worker joined
+        # (other workers take their share of them)
+        self.manager.progress.begin_sweep(counts["pending"] + counts["leased"])
+
+        done = 0
+        last_config = None
+
+        while True:
+            job = self.queue.lease(self.sweep_id, self.worker_id, prefer_config=last_config)
+
+            if job is None:
+                counts = self.queue.counts(self.sweep_id)
+                if counts["leased"] == 0:
+                    # a config whose last lease expired into 'failed' had
+                    # no worker finishing its last job
+                    self._finalize_remaining()
+                    break
+                # others still busy: their leases may expire and come back
+                time.sleep(self.idle_poll)
+                continue
+
+            if self._run_job(job):
+                done += 1
+            last_config = job["config_id"]
+
+            if self.queue.claim_finalize(self.sweep_id, job["config_id"]):
+                self._finalize(job["config_id"])
+
+        self.manager.close()
+        logger.info("Queue worker %s finished (%d jobs): %s",
+                    self.worker_id, done, self.queue.counts(self.sweep_id))
+        return done
+
+    # ---------- HELPERS ----------
+
+    def _run_job(self, job: dict) -> bool:
+        cfg_id, audio_id = job["config_id"], job["audio_id"]
+        item = self.audio_items.get(audio_id)
+
+        if item is None:
+            error = f"audio '{audio_id}' not found in this host's dataset"
+            ok = False
+        else:
+            logger.info("[%s] %s | %s (attempt %d)", self.worker_id, cfg_id, audio_id, job["attempts"])
+            with _Heartbeat(self.queue, job, self.worker_id, self.heartbeat_interval):
+                try:
+                    ok, error = self.manager.run_job(cfg_id, job["params"], item)
+                except Exception:
+                    ok, error = False, traceback.format_exc()
+
+        if ok:
+            if not self.queue.complete(job, self.worker_id):
+                logger.warning("%s | %s finished after its lease was reclaimed", cfg_id, audio_id)
+            return True
+
+        status = self.queue.fail(job, self.worker_id, error or "unknown error")
+        if status is None:
+            logger.warning("%s | %s failed after its lease was reclaimed", cfg_id, audio_id)
+        else:
+            logger.warning("%s | %s failed -> %s", cfg_id, audio_id, status)
+        return False
+
+    def _finalize_remaining(self):
+        for cfg_id in self.queue.config_ids(self.sweep_id):
+            if self.queue.claim_finalize(self.sweep_id, cfg_id):
+                self._finalize(cfg_id)
+
+    def _finalize(self, cfg_id: str):
+        lock = FileLock(str(self.manager.results_excel) + ".lock")
+        with lock:
+            self.manager.finalize_config(cfg_id)
+            self.manager.fan_out(cfg_id, self.queue.aliases(self.sweep_id, cfg_id))
@@ -0,0 +1,146 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioPrefetcher:
+    """
+    Decodes upcoming audios on a background thread.
+    -----------------------------------------------
+    Iterating yields (item, audio, error) in input order while the
+    next `depth` audios are already being decoded, so inference never
+    waits on ffmpeg. The bounded queue keeps at most `depth` decoded
+    waveforms in memory. A decode error is handed to the consumer
+    with its item instead of stopping the stream.
+    """
+
+    _END = object()
+
+    def __init__(self,
+                items: Iterable[dict],
+                depth: int = 2,
+                loader: Optional[Callable] = None):
+        self.items = items
+        self.depth = max(1, depth)
+        self.loader = loader or self._load_audio
+        self._queue = queue.Queue(maxsize=self.depth)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _load_audio(path):
+        import whisperx
+        return whisperx.load_audio(str(path))
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            entry = self._queue.get()
+            if entry is self._END:
+                return
+            yield entry
+
+    def close(self):
+        self._stop.set()
+        # unblock a producer waiting on a full queue
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._thread = None
+
+    def _produce(self):
+        for item in self.items:
+            if self._stop.is_set():
+                return
+            try:
+                entry = (item, self.loader(item["wav_path"]), None)
+            except Exception as e:
+                entry = (item, None, e)
+            if not self._put(entry):
+                return
+        self._put(self._END)
+
+    def _put(self, entry) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class ResultPool:
+    """
+    Scoring / writing stage with bounded backlog.
+    ---------------------------------------------
+    submit() hands a finished inference to a thread pool (JSON save,
+    WER / DER / RTF, result sinks) and only blocks once `max_pending`
+    tasks are in flight, so inference keeps running ahead of scoring
+    but never by more than that. workers=0 runs every task inline,
+    i.e. the old sequential behaviour.
+
+    Exceptions of a task are re-raised in the submitting thread (on a
+    later submit() or on exit), like they would have been inline.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        self.workers = workers
+        self.max_pending = max_pending or 2 * max(1, workers)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="score") if workers > 0 else None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            if exc_type is None:
+                self.drain()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if self._executor is None:
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+        self._raise_finished()
+        self._slots.acquire()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def drain(self):
+        """
+        Waits for every submitted task
+        """
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def _raise_finished(self):
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._futures = pending
@@ -0,0 +1,42 @@
+import pytest
+
+from orchestrator.autotuner import Autotuner, candidate_layouts, machine_fingerprint
+
+
+@pytest.mark.parametrize("cpu_count", [1, 6, 8, 20])
+def test_layouts_use_every_core_once(cpu_count):
+    layouts = candidate_layouts(cpu_count, ("int8",))
+    workers = [layout["workers"] for layout in layouts]
+
+    assert workers == sorted(set(workers)) and workers[0] == 1 and workers[-1] == cpu_count
+    assert all(layout["workers"] * layout["cpu_threads"] <= cpu_count for layout in layouts)
+
+
+def test_layouts_cross_compute_types():
+    layouts = candidate_layouts(4, ("int8", "float32"))
+    assert len(layouts) == 2 * len(candidate_layouts(4, ("int8",)))
+
+
+def _result(workers, compute_type, throughput):
+    return {"workers": workers, "cpu_threads": 8 // workers, "compute_type": compute_type,
+            "throughput": throughput}
+
+
+def test_summary_persists_best_layout_per_machine(tmp_path):
+    layout_file = tmp_path / "autotune.json"
+    tuner = Autotuner([], compute_types=("int8", "float32"), layout_file=str(layout_file))
+
+    entry = tuner._summarise(machine_fingerprint(), [
+        _result(1, "int8", 2.0), _result(4, "int8", 5.0),
+        _result(2, "float32", 3.0), _result(8, "float32", None),
+    ])
+    tuner._persist(entry)
+
+    assert entry["best"] == {"workers": 4, "cpu_threads": 2, "compute_type": "int8", "throughput": 5.0}
+    assert entry["best_per_compute_type"]["float32"]["workers"] == 2
+    assert Autotuner.load_layout(str(layout_file))["best"] == entry["best"]
+
+
+def test_every_layout_failed():
+    with pytest.raises(RuntimeError):
+        Autotuner([])._summarise(machine_fingerprint(), [_result(1, "int8", None)])
@@ -0,0 +1,113 @@
+import shutil
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from orchestrator.experiment_manager import ExperimentManager
+
+DIALOGS = ["Ses01F_impro01", "Ses01F_impro02", "Ses01F_impro03"]
+# config rows of the results sheet template
+C1, C2 = "Config_A_01", "Config_A_02"
+TEMPLATE = Path(__file__).resolve().parent.parent / "results" / "result.xlsx"
+
+
+class _OracleInference:
+    """
+    InferenceWorker stand-in: "transcribes" every audio into its
+    reference transcript
+    """
+
+    def __init__(self, oracle_hypothesis, peak_rss_mb=321.0):
+        self.oracle_hypothesis = oracle_hypothesis
+        self.cache_events = []
+        self.peak_rss_mb = peak_rss_mb
+        self.runner = SimpleNamespace(result=None)
+        self.jobs = []
+        self.lock = threading.Lock()
+
+    def run(self, job, params, audio=None, save=True):
+        out_dir = Path(job["out_dir"])       # <output>/WhisperX_Output/<config>/<audio>
+        with self.lock:
+            self.jobs.append((out_dir.parent.name, job["audio_id"]))
+        shutil.copy(self.oracle_hypothesis(job["audio_id"]), out_dir / f"{job['audio_id']}.json")
+        return 1.0
+
+
+@pytest.fixture
+def dataset(dataset_dir, tmp_path):
+    root = tmp_path / "dataset"
+    for audio_id in DIALOGS:
+        folder = root / audio_id
+        folder.mkdir(parents=True)
+        shutil.copy(dataset_dir / audio_id / "transcript_norm.txt", folder)
+        sf.write(str(folder / f"{audio_id}.wav"), np.zeros(200 * 1000, dtype=np.float32), 1000)
+    return root
+
+
+@pytest.fixture
+def make_manager(dataset, oracle_hypothesis, tmp_path):
+    def make(**kwargs):
+        excel = tmp_path / "result.xlsx"
+        shutil.copy(TEMPLATE, excel)
+        kwargs.setdefault("prefetch", 0)
+        manager = ExperimentManager(str(dataset), str(tmp_path / "out"), str(excel), **kwargs)
+        manager.inference = _OracleInference(oracle_hypothesis)
+        return manager, manager.inference
+
+    return make
+
+
+def _items(dataset):
+    return [{"audio_id": audio_id, "wav_path": dataset / audio_id / f"{audio_id}.wav"} for audio_id in DIALOGS]
+
+
+@pytest.mark.parametrize("score_workers", [0, 2])
+def test_early_stop_runs_no_job_past_the_stop(score_workers, make_manager, dataset):
+    manager, inference = make_manager(score_workers=score_workers)
+    seen = []
+
+    def stop_after_first(cfg_id, scores):
+        seen.append((cfg_id, scores["audios"]))
+        return True
+
+    configs = [{"config_id": C1, "params": {"beam_size": 1}}, {"config_id": C2, "params": {"beam_size": 2}}]
+    manager.run_experiments(configs, _items(dataset), early_stop=stop_after_first)
+
+    assert inference.jobs == [(C1, DIALOGS[0]), (C2, DIALOGS[0])]
+    assert seen == [(C1, 1), (C2, 1)]
+
+
+@pytest.mark.parametrize("excel_per_job", [True, False])
+def test_overall_cpwer_is_written_next_to_wer(excel_per_job, make_manager, dataset):
+    from openpyxl import load_workbook
+
+    manager, _ = make_manager(excel_per_job=excel_per_job)
+    manager.run_experiments([{"config_id": C1, "params": {}}], _items(dataset))
+
+    ws = load_workbook(manager.results_excel).active
+    assert [ws.cell(row=2, column=col).value for col in range(1, 6)] == ["config_id", "WER", "cpWER", "DER", "RTF"]
+    assert ws.cell(row=1, column=6).value == DIALOGS[0]
+    assert "B1:E1" in [str(r) for r in ws.merged_cells.ranges]
+
+    row = next(r for r in range(3, ws.max_row + 1) if ws.cell(row=r, column=1).value == C1)
+    assert ws.cell(row=row, column=2).value == 0.0
+    assert ws.cell(row=row, column=3).value == 0.0
+    assert ws.cell(row=row, column=5).value == 1.0 / 200
+
+    (summary,) = manager.store.config_summary("default", C1)
+    assert summary["audios"] == len(DIALOGS)
+    assert summary["cpwer"] == 0.0
+
+
+def test_in_process_jobs_store_peak_rss(make_manager, dataset):
+    manager, _ = make_manager(score_workers=2)
+    manager.run_experiments([{"config_id": C1, "params": {}}], _items(dataset))
+
+    rows = manager.store.get_jobs("default", C1, status="done")
+    assert len(rows) == len(DIALOGS)
+    assert all(row["peak_rss_mb"] == 321.0 for row in rows)
+    assert all(row["wer"] == 0.0 for row in rows)
@@ -0,0 +1,75 @@
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from orchestrator.inference_daemon import InferenceClient, InferenceDaemon
+
+
+class _EchoWorker:
+    """
+    InferenceWorker stand-in: the daemon protocol without the models
+    """
+    runner = None
+    cache_events = [("emissions", True)]
+    peak_rss_mb = 512.0
+
+    def run(self, job, params):
+        if params.get("fail"):
+            raise RuntimeError("boom")
+        return 1.5
+
+    def run_sweep(self, job, params_by_cfg):
+        return {cfg_id: 1.0 for cfg_id in params_by_cfg}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_key_file_is_user_only(tmp_path):
+    key_file = tmp_path / "daemon.key"
+    key_file.write_text("stale")
+    os.chmod(key_file, 0o644)
+
+    daemon = InferenceDaemon(key_file=key_file)
+    daemon._write_key(b"\x01" * 32)
+
+    assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
+    assert key_file.read_text().split() == [str(daemon.port), "01" * 32]
+
+
+def test_protocol_round_trip(tmp_path):
+    key_file = tmp_path / "daemon.key"
+    daemon = InferenceDaemon(port=_free_port(), key_file=key_file)
+    daemon.worker = _EchoWorker()
+
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if key_file.exists():
+            break
+        threading.Event().wait(0.01)
+
+    client = InferenceClient.connect(key_file)
+    assert client is not None
+
+    job = {"audio_id": "a"}
+    assert client.run(job, {}) == 1.5
+    assert client.cache_events == [("emissions", True)]
+    assert client.peak_rss_mb == 512.0
+    assert client.run_sweep(job, {"c1": {}, "c2": {}}) == {"c1": 1.0, "c2": 1.0}
+    with pytest.raises(RuntimeError, match="boom"):
+        client.run(job, {"fail": True})
+    assert client.status()["jobs"] == 2
+
+    client.shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not key_file.exists()
+    assert InferenceClient.connect(key_file) is None
@@ -0,0 +1,74 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from orchestrator.job_profiler import JobProfiler, ProfileReport
+
+
+class _Runner:
+    """
+    Stands in for WhisperXRunner: reports its stages to stage_hook
+    """
+
+    stage_hook = None
+
+    def run(self):
+        for stage, size in (("transcribe", 2_000_000), ("align", 200_000)):
+            self.stage_hook(stage)
+            buffer = np.ones(size // 8)
+            _busy(0.05)
+            del buffer
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(200))
+
+
+@pytest.mark.parametrize("mode, suffix", [("cprofile", ".prof"), ("sample", ".collapsed")])
+def test_job_writes_profile_and_stage_peaks(mode, suffix, tmp_path):
+    profiler = JobProfiler.from_spec(JobProfiler(tmp_path, mode=mode, interval=0.002).to_spec())
+    runner = _Runner()
+
+    for audio_id in ("a1", "a2"):
+        with profiler.job("c", audio_id, runner):
+            runner.run()
+    assert runner.stage_hook is None
+
+    assert (tmp_path / "c" / f"a1{suffix}").exists()
+    stages = json.loads((tmp_path / "c" / "a1.alloc.json").read_text(encoding="utf-8"))
+    assert list(stages) == ["setup", "transcribe", "align"]
+    assert stages["transcribe"]["peak_mb"] >= 1.9
+    assert stages["transcribe"]["peak_mb"] > stages["align"]["peak_mb"]
+
+    written = ProfileReport(tmp_path).write("c")
+    assert {"hotspots", "allocations"} <= set(written)
+    hotspots = written["hotspots"].read_text(encoding="utf-8")
+    assert "_busy" in hotspots
+    if mode == "cprofile":
+        assert hotspots.startswith("cProfile, 2 jobs")
+    assert "transcribe: peak" in written["allocations"].read_text(encoding="utf-8")
+
+
+def test_sampled_stacks_are_merged_once(tmp_path):
+    folder = tmp_path / "c"
+    folder.mkdir()
+    (folder / "a1.collapsed").write_text("main;f;g 3\nmain;f 1\n", encoding="utf-8")
+    (folder / "a2.collapsed").write_text("main;f;g 2\n", encoding="utf-8")
+
+    report = ProfileReport(tmp_path)
+    for _ in range(2):
+        written = report.write()
+
+    merged = written["stacks"].read_text(encoding="utf-8").splitlines()
+    assert merged == ["main;f;g 5", "main;f 1"]
+    hotspots = written["hotspots"].read_text(encoding="utf-8")
+    assert "sampled stacks, 6 samples" in hotspots
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        JobProfiler("x", mode="perf")
@@ -0,0 +1,76 @@
+import threading
+
+from orchestrator.job_queue import JobQueue
+
+CONFIGS = [{"config_id": "c1", "params": {"beam_size": 5}, "aliases": ["c1b"]},
+           {"config_id": "c2", "params": {}}]
+
+
+def _queue(tmp_path, **kwargs):
+    queue = JobQueue(tmp_path / "queue.sqlite", **kwargs)
+    queue.enqueue("s", CONFIGS, ["a1", "a2"])
+    return queue
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    queue = _queue(tmp_path)
+    assert queue.enqueue("s", CONFIGS, ["a1", "a2"]) == 0
+    assert queue.counts("s")["pending"] == 4
+    assert queue.aliases("s", "c1") == ["c1b"]
+
+
+def test_lease_prefers_config_and_completes(tmp_path):
+    queue = _queue(tmp_path)
+    first = queue.lease("s", "w1")
+    job = queue.lease("s", "w1", prefer_config="c2")
+
+    assert first["config_id"] == "c1" and first["params"] == {"beam_size": 5}
+    assert job["config_id"] == "c2"
+    assert queue.complete(job, "w1")
+    assert not queue.complete(job, "w2")
+
+
+def test_fail_retries_then_fails(tmp_path):
+    queue = _queue(tmp_path, max_attempts=2)
+    statuses = []
+    for _ in range(2):
+        job = queue.lease("s", "w1")
+        while job["audio_id"] != "a1" or job["config_id"] != "c1":
+            queue.complete(job, "w1")
+            job = queue.lease("s", "w1")
+        statuses.append(queue.fail(job, "w1", "boom"))
+    assert statuses == ["pending", "failed"]
+
+
+def test_fail_after_lost_lease(tmp_path):
+    queue = _queue(tmp_path, lease_seconds=-1)
+    job = queue.lease("s", "w1")
+    # expired lease reclaimed and leased again by another worker
+    again = queue.lease("s", "w2")
+    assert again["seq"] == job["seq"]
+
+    assert queue.fail(job, "w1", "boom") is None
+    assert not queue.heartbeat(job, "w1")
+    assert queue.counts("s")["leased"] == 1
+
+
+def test_every_job_leased_once(tmp_path):
+    queue = _queue(tmp_path)
+    queue.enqueue("s", [{"config_id": f"x{k}", "params": {}} for k in range(10)], ["a1", "a2"])
+    taken, lock = [], threading.Lock()
+
+    def work(worker_id):
+        while (job := queue.lease("s", worker_id)) is not None:
+            with lock:
+                taken.append(job["seq"])
+            queue.complete(job, worker_id)
+
+    threads = [threading.Thread(target=work, args=(f"w{k}",)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(taken) == sorted(set(taken)) and len(taken) == 24
+    assert queue.claim_finalize("s", "c1")
+    assert not queue.claim_finalize("s", "c1")
@@ -0,0 +1,85 @@
+import itertools
+
+import numpy as np
+import soundfile as sf
+
+from dataset.duration_cache import DurationCache
+from orchestrator.job_scheduler import JobScheduler
+from results.results_store import ResultsStore
+
+
+def _wav(path, seconds, sample_rate=8000):
+    sf.write(str(path), np.zeros(int(seconds * sample_rate), dtype=np.float32), sample_rate)
+    return str(path)
+
+
+def _done(store, sweep_id, config_id, audio_id, processing_time, audio_duration):
+    store.mark_done(sweep_id, config_id, audio_id, attempts=1, wer=0.0, der=0.0,
+                    rtf=processing_time / audio_duration,
+                    processing_time=processing_time, audio_duration=audio_duration)
+
+
+def test_makespan_is_greedy_list_scheduling():
+    assert JobScheduler.makespan([], 2) == 0.0
+    assert JobScheduler.makespan([4, 1, 1, 1, 1], 2) == 4.0
+    # the long job last finishes alone
+    assert JobScheduler.makespan([1, 1, 1, 1, 4], 2) == 6.0
+    assert JobScheduler.makespan([1, 2, 3], 1) == 6.0
+
+
+def test_lpt_order_never_worse_than_any_order():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        costs = rng.uniform(1, 10, size=6).tolist()
+        lpt = JobScheduler.makespan(sorted(costs, reverse=True), 3)
+        best = min(JobScheduler.makespan(list(p), 3) for p in itertools.permutations(costs))
+        # Graham's bound for LPT
+        assert lpt <= (4 / 3 - 1 / 9) * best + 1e-9
+
+
+def test_order_uses_config_rtf_and_puts_unreadable_first(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    _done(store, "s", "fast", "x", processing_time=1.0, audio_duration=10.0)
+    _done(store, "other", "slow", "x", processing_time=30.0, audio_duration=10.0)
+
+    jobs = [{"audio_id": name, "wav_path": _wav(tmp_path / f"{name}.wav", seconds)}
+            for name, seconds in (("short", 1.0), ("long", 4.0), ("mid", 2.0))]
+    jobs.append({"audio_id": "missing", "wav_path": str(tmp_path / "missing.wav")})
+
+    scheduler = JobScheduler(store, DurationCache(tmp_path / "durations.json"), sweep_id="s")
+    ordered = scheduler.order("fast", jobs, num_workers=2)
+
+    assert [job["audio_id"] for job in ordered] == ["missing", "long", "mid", "short"]
+    assert ordered[0]["predicted_cost"] is None
+    assert np.isclose(ordered[1]["predicted_cost"], 4.0 * 0.1)
+    # other sweep's config is not read; unknown config: median of the scheduled ones
+    assert scheduler.rtf("slow") == scheduler.rtf("new") == scheduler.rtf("fast")
+    assert (tmp_path / "durations.json").exists()
+
+
+def test_history_is_read_per_scheduled_config(tmp_path, monkeypatch):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    for cfg_id, time in (("a", 2.0), ("b", 6.0), ("c", 100.0)):
+        _done(store, "s", cfg_id, "x", processing_time=time, audio_duration=10.0)
+
+    queries = []
+    get_jobs = store.get_jobs
+
+    def tracking_get_jobs(*args, **kwargs):
+        queries.append(args)
+        return get_jobs(*args, **kwargs)
+
+    monkeypatch.setattr(store, "get_jobs", tracking_get_jobs)
+
+    scheduler = JobScheduler(store, DurationCache(tmp_path / "durations.json"), sweep_id="s")
+    assert np.isclose(scheduler.rtf("a"), 0.2)
+    assert np.isclose(scheduler.rtf("b"), 0.6)
+
+    assert queries == [("s", "a"), ("s", "b")]
+    assert np.isclose(scheduler.rtf("new"), 0.4)
+
+
+def test_empty_store_defaults_to_duration_order(tmp_path):
+    scheduler = JobScheduler(ResultsStore(tmp_path / "results.sqlite"),
+                             DurationCache(tmp_path / "durations.json"))
+    assert scheduler.rtf("any") == 1.0
@@ -0,0 +1,29 @@
+import pytest
+
+from orchestrator import pipeline_runner
+from orchestrator.pipeline_runner import PipelineRunner
+
+DAEMON = object()
+
+
+@pytest.fixture(autouse=True)
+def running_daemon(monkeypatch):
+    monkeypatch.setattr(pipeline_runner.InferenceClient, "connect", classmethod(lambda cls: DAEMON))
+
+
+def _runner(tmp_path, **kwargs):
+    return PipelineRunner(str(tmp_path), str(tmp_path / "out"), str(tmp_path / "sweep.yaml"),
+                          str(tmp_path / "result.xlsx"), **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 2}, {"memory_limit_mb": 4000}, {"autotune": True},
+                                    {"use_daemon": False}])
+def test_worker_layout_requests_skip_the_daemon(kwargs, tmp_path):
+    assert _runner(tmp_path, **kwargs)._inference() is None
+
+
+def test_daemon_with_stored_layout_warns(tmp_path, caplog):
+    layout = {"best": {"workers": 2, "cpu_threads": 4}}
+    with caplog.at_level("WARNING"):
+        assert _runner(tmp_path)._inference(layout) is DAEMON
+    assert "stored autotune layout" in caplog.text
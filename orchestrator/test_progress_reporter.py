@@ -0,0 +1,51 @@
+import json
+import socket
+import urllib.request
+
+from orchestrator.progress_reporter import ProgressReporter
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_snapshot_counts_and_status_file(tmp_path):
+    status_file = tmp_path / "status.json"
+    reporter = ProgressReporter(status_file=str(status_file), interval=3600)
+    reporter.begin_sweep(4)
+    reporter.begin_config("c1", 2)
+    reporter.job_done("a1", audio_duration=100.0, processing_time=20.0)
+    reporter.job_failed("a2", "boom")
+    reporter.record_cache("vad", True)
+    reporter.record_cache("vad", False)
+    reporter.record_cache("vad", True)
+    reporter.close()
+
+    snap = json.loads(status_file.read_text(encoding="utf-8"))
+    assert (snap["jobs_done"], snap["jobs_failed"], snap["jobs_total"]) == (2, 1, 4)
+    assert snap["current_rtf"] == snap["average_rtf"] == 0.2
+    assert snap["eta_config_s"] == 0
+    assert snap["caches"]["vad"] == {"hits": 2, "lookups": 3, "hit_rate": 2 / 3}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_prometheus_endpoint():
+    reporter = ProgressReporter(metrics_port=_free_port())
+    reporter.begin_sweep(3)
+    reporter.record_cache("emissions", True)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{reporter.metrics_port}/metrics", timeout=5) as r:
+            body = r.read().decode("utf-8")
+    finally:
+        reporter.close()
+
+    assert "sweep_jobs_total 3" in body
+    assert "sweep_eta_seconds NaN" in body
+    assert 'sweep_cache_hit_rate{cache="emissions"} 1.0' in body
+
+
+def test_eta_format():
+    assert ProgressReporter._fmt_eta(None) == "--:--:--"
+    assert ProgressReporter._fmt_eta(3725.9) == "01:02:05"
@@ -0,0 +1,62 @@
+from orchestrator.job_queue import JobQueue
+from orchestrator.progress_reporter import ProgressReporter
+from orchestrator.queue_worker import QueueWorker
+
+
+class _Manager:
+    """
+    Stands in for ExperimentManager: records what the worker asks of it
+    """
+
+    def __init__(self, results_excel):
+        self.results_excel = results_excel
+        self.progress = ProgressReporter()
+        self.ran, self.finalized, self.fanned_out = [], [], []
+
+    def run_job(self, cfg_id, params, item):
+        self.ran.append((cfg_id, item["audio_id"]))
+        return True, None
+
+    def finalize_config(self, cfg_id):
+        self.finalized.append(cfg_id)
+
+    def fan_out(self, cfg_id, aliases):
+        self.fanned_out.append((cfg_id, aliases))
+
+    def close(self):
+        pass
+
+
+def _worker(queue, manager, worker_id="w1"):
+    items = {audio_id: {"audio_id": audio_id, "wav_path": f"{audio_id}.wav"} for audio_id in ("a1", "a2")}
+    return QueueWorker(queue, manager, items, "s", worker_id=worker_id, idle_poll=0.01)
+
+
+def test_worker_runs_and_finalizes_every_config(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    queue.enqueue("s", [{"config_id": "c1", "params": {}, "aliases": ["c1b"]},
+                        {"config_id": "c2", "params": {}}], ["a1", "a2"])
+    manager = _Manager(tmp_path / "results.xlsx")
+
+    assert _worker(queue, manager).run() == 4
+    assert manager.progress.jobs_total == 4
+    assert sorted(manager.finalized) == ["c1", "c2"]
+    assert ("c1", ["c1b"]) in manager.fanned_out
+
+
+def test_config_whose_last_lease_expired_is_finalized(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", lease_seconds=0.05, max_attempts=1)
+    queue.enqueue("s", [{"config_id": "c1", "params": {}, "aliases": ["c1b"]}], ["a1", "a2"])
+    manager = _Manager(tmp_path / "results.xlsx")
+
+    # another worker takes the last job and dies with it
+    dead = queue.lease("s", "dead", prefer_config="c1")
+    first = queue.lease("s", "w1")
+    queue.complete(first, "w1")
+    assert not queue.claim_finalize("s", "c1")
+
+    assert _worker(queue, manager).run() == 0
+    assert queue.counts("s")["failed"] == 1
+    assert manager.finalized == ["c1"]
+    assert manager.fanned_out == [("c1", ["c1b"])]
+    assert dead["audio_id"] != first["audio_id"]
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from orchestrator.stage_pipeline import AudioPrefetcher, ResultPool
+
+
+def _items(n):
+    return [{"audio_id": f"a{i}", "wav_path": f"a{i}.wav"} for i in range(n)]
+
+
+def test_prefetcher_yields_in_order_and_passes_errors():
+    def loader(path):
+        if path == "a2.wav":
+            raise IOError("broken")
+        return path.upper()
+
+    with AudioPrefetcher(_items(5), depth=2, loader=loader) as prefetcher:
+        entries = list(prefetcher)
+
+    assert [item["audio_id"] for item, _, _ in entries] == ["a0", "a1", "a2", "a3", "a4"]
+    assert [audio for _, audio, _ in entries] == ["A0.WAV", "A1.WAV", None, "A3.WAV", "A4.WAV"]
+    assert isinstance(entries[2][2], IOError)
+
+
+def test_prefetcher_stays_within_depth():
+    loaded = []
+
+    with AudioPrefetcher(_items(10), depth=2, loader=lambda path: loaded.append(path) or path) as prefetcher:
+        iterator = iter(prefetcher)
+        next(iterator)
+        time.sleep(0.3)
+        # one handed out, `depth` queued, one blocked on the full queue
+        assert len(loaded) <= 4
+
+
+def test_prefetcher_close_stops_a_blocked_producer():
+    prefetcher = AudioPrefetcher(_items(100), depth=1, loader=lambda path: path)
+    with prefetcher:
+        next(iter(prefetcher))
+    assert prefetcher._thread is None
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_result_pool_runs_every_task(workers):
+    done = []
+    lock = threading.Lock()
+
+    def task(i):
+        with lock:
+            done.append(i)
+
+    with ResultPool(workers=workers) as pool:
+        for i in range(20):
+            pool.submit(task, i)
+
+    assert sorted(done) == list(range(20))
+
+
+def test_result_pool_bounds_the_backlog():
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def task():
+        with lock:
+            running.append(1)
+            peak[0] = max(peak[0], len(running))
+        release.wait(1.0)
+        with lock:
+            running.pop()
+
+    pool = ResultPool(workers=2, max_pending=3)
+    submitter = threading.Thread(target=lambda: [pool.submit(task) for _ in range(6)])
+    submitter.start()
+    time.sleep(0.3)
+    # 2 running + 1 queued, the 4th submit blocks
+    assert len(pool._futures) == 3
+    release.set()
+    submitter.join(5)
+    pool.__exit__(None, None, None)
+    assert peak[0] <= 2
+
+
+def test_result_pool_reraises_task_errors():
+    def boom():
+        raise ValueError("scoring failed")
+
+    with pytest.raises(ValueError, match="scoring failed"):
+        with ResultPool(workers=1) as pool:
+            pool.submit(boom)
@@ -0,0 +1,63 @@
+import os
+import time
+
+import numpy as np
+
+from orchestrator.worker_supervisor import (WorkerSupervisor, degrade_params, peak_rss_mb,
+                                           reset_peak_rss, rss_mb)
+
+
+def test_degrade_halves_batches_then_threads():
+    params = {"embedding_batch_size": 8, "segmentation_batch_size": 3, "cpu_threads": 4}
+
+    steps = []
+    while params is not None:
+        steps.append(params)
+        params = degrade_params(params)
+
+    assert [(p["embedding_batch_size"], p["segmentation_batch_size"], p["cpu_threads"]) for p in steps] == [
+        (8, 3, 4), (4, 1, 4), (2, 1, 4), (1, 1, 4), (1, 1, 2), (1, 1, 1)]
+
+
+def test_degrade_does_not_touch_the_input():
+    params = {"embedding_batch_size": 2}
+    degrade_params(params)
+    assert params == {"embedding_batch_size": 2}
+
+
+def test_rss_of_this_process():
+    rss = rss_mb(os.getpid())
+    assert rss is None or rss > 1
+
+
+def test_peak_rss_sees_a_freed_allocation():
+    reset_peak_rss()
+    before = peak_rss_mb()
+    buffer = np.ones(64 * 2 ** 20 // 8)
+    del buffer
+
+    after = peak_rss_mb()
+    assert after is not None and after >= before + 60
+    assert after >= rss_mb(os.getpid()) + 30
+
+
+def test_closed_pipe_of_a_live_worker_is_a_crash():
+    supervisor = WorkerSupervisor(num_workers=1)
+    supervisor.EOF_GRACE_SECONDS = 0.2
+    slot = supervisor.slots[0]
+
+    # a worker that closed its end of the pipe but does not exit
+    parent_conn, child_conn = supervisor.ctx.Pipe()
+    slot.process = supervisor.ctx.Process(target=time.sleep, args=(60,), daemon=True)
+    slot.process.start()
+    child_conn.close()
+    slot.conn = parent_conn
+    process = slot.process
+
+    start = time.time()
+    outcome = supervisor._check_slot(slot, [slot.conn])
+
+    assert outcome["status"] == "retry" and outcome["reason"].startswith("crashed")
+    assert time.time() - start < 10
+    assert slot.process is None and slot.conn is None
+    assert not process.is_alive()
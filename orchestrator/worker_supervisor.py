@@ -0,0 +1,487 @@
+import logging
+import multiprocessing as mp
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:          # optional, /proc is used on Linux without it
+    psutil = None
+
+
+# exit code of a process killed by SIGKILL (kernel OOM killer / our own kill)
+_SIGKILL_EXIT = -9
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """
+    Resident memory of a process (and its children) in MB.
+    Returns None when it cannot be measured on this platform.
+    """
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            rss = proc.memory_info().rss
+            for child in proc.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    status = Path(f"/proc/{pid}/status")
+    try:
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def reset_peak_rss():
+    """
+    Restarts this process's peak RSS (Linux clear_refs); elsewhere the
+    peak stays the one since process start
+    """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process in MB since the last
+    reset_peak_rss(). Returns None when it cannot be measured.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:      # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def degrade_params(params: dict, default_threads: Optional[int] = None) -> Optional[dict]:
+    """
+    Returns a cheaper copy of an effective config for a retry:
+        1. halve embedding_batch_size / segmentation_batch_size
+        2. once both are 1, halve cpu_threads
+    Returns None when nothing is left to reduce.
+    """
+    degraded = dict(params)
+
+    batch_keys = ("embedding_batch_size", "segmentation_batch_size")
+    if any(int(degraded.get(k, 1)) > 1 for k in batch_keys):
+        for k in batch_keys:
+            degraded[k] = max(1, int(degraded.get(k, 1)) // 2)
+        return degraded
+
+    threads = int(degraded.get("cpu_threads") or default_threads or os.cpu_count() or 1)
+    if threads > 1:
+        degraded["cpu_threads"] = max(1, threads // 2)
+        return degraded
+
+    return None
+
+
+class InferenceWorker:
+    """
+    Runs WhisperX inference jobs, keeping the loaded runner
+    between jobs (and configs) as long as the weights do not change.
+    Used in-process and inside every supervised worker process.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self.runner = None
+        self.runner_key = None
+        # (cache name, hit) of the last job, for the progress reporter
+        self.cache_events = []
+        # peak RSS of this process during the last job (MB)
+        self.peak_rss_mb = None
+
+    def run(self, job: dict, params: dict, audio=None, save: bool = True) -> float:
+        """
+        Transcribe + save one audio. Returns the processing time.
+        :param audio: waveform decoded ahead of time (AudioPrefetcher)
+        :param save: False leaves the result file to the caller (runner.result)
+        """
+        from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+        config = WhisperXConfigurator().configure(params)
+        reset_peak_rss()
+        self._ensure_runner(config)
+
+        start = time.time()
+
+        if job.get("profile") is None:
+            self.runner.run(str(job["wav_path"]), audio=audio)
+        else:
+            from orchestrator.job_profiler import JobProfiler
+            profiler = JobProfiler.from_spec(job["profile"])
+            with profiler.job(job.get("config_id", "default"), job["audio_id"], self.runner):
+                self.runner.run(str(job["wav_path"]), audio=audio)
+        if save:
+            self.runner.save_result(str(job["out_dir"]), job["audio_id"],
+                                    job.get("debug_json", False))
+
+        end = time.time()
+
+        self.cache_events = list(self.runner.cache_events)
+        self.peak_rss_mb = peak_rss_mb()
+        return end - start
+
+    def run_sweep(self, job: dict, params_by_cfg: Dict[str, dict], audio=None) -> Dict[str, float]:
+        """
+        One audio under several configs that only differ in clustering
+        params (see threshold_sweep.group_by_clustering). Results go to
+        job["out_dirs"][cfg_id]. Returns {cfg_id: processing time}, the
+        shared stages split evenly between the configs.
+        """
+        from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+        configs = {cfg_id: WhisperXConfigurator().configure(params)
+                   for cfg_id, params in params_by_cfg.items()}
+
+        reset_peak_rss()
+        self._ensure_runner(next(iter(configs.values())))
+        if job.get("profile") is None:
+            results = self.runner.run_threshold_sweep(str(job["wav_path"]), configs, audio=audio)
+        else:
+            from orchestrator.job_profiler import JobProfiler
+            profiler = JobProfiler.from_spec(job["profile"])
+            # one profile for the shared run, under the first config
+            with profiler.job(next(iter(configs)), job["audio_id"], self.runner):
+                results = self.runner.run_threshold_sweep(str(job["wav_path"]), configs, audio=audio)
+
+        shared = self.runner.shared_time / len(results)
+        times = {}
+        for cfg_id, result in results.items():
+            self.runner.result = result
+            self.runner.save_result(str(job["out_dirs"][cfg_id]), job["audio_id"],
+                                    job.get("debug_json", False))
+            times[cfg_id] = shared + self.runner.sweep_times[cfg_id]
+
+        self.cache_events = list(self.runner.cache_events)
+        self.peak_rss_mb = peak_rss_mb()
+        return times
+
+    def _ensure_runner(self, config: dict):
+        from whisperx_core.whisperX_runner import WhisperXRunner
+        from whisperx_core.config_applier import ConfigApplier
+
+        # only weight changing keys force a reload, the rest is
+        # applied in place on the loaded models
+        key = ConfigApplier.load_key(config)
+        if self.runner is None or self.runner_key != key:
+            self.runner = WhisperXRunner.from_config(config, cache_dir=self.cache_dir)
+            self.runner.load_models()
+            self.runner_key = key
+        else:
+            self.runner.apply_config(config)
+
+
+def _worker_main(conn, cache_dir=None):
+    """
+    Entry point of a supervised worker process.
+    Receives (job, params), answers with a result dict.
+    """
+    worker = InferenceWorker(cache_dir)
+
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+
+        job, params = msg
+        try:
+            processing_time = worker.run(job, params)
+            conn.send({"ok": True, "processing_time": processing_time,
+                       "cache_events": worker.cache_events,
+                       "peak_rss_mb": worker.peak_rss_mb})
+        except MemoryError:
+            conn.send({"ok": False, "oom": True, "error": "MemoryError"})
+            break
+        except Exception:
+            conn.send({"ok": False, "oom": False, "error": traceback.format_exc()})
+
+    conn.close()
+
+
+class _WorkerSlot:
+    """
+    One supervised worker process and the job it is running.
+    """
+
+    def __init__(self, ctx, cache_dir=None):
+        self.ctx = ctx
+        self.cache_dir = cache_dir
+        self.process = None
+        self.conn = None
+        self.job = None
+        self.params = None
+        self.attempt = 0
+        self.started = 0.0
+        self.peak_rss = 0.0
+
+    def ensure_started(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_worker_main,
+                                        args=(child_conn, self.cache_dir), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def submit(self, job: dict, params: dict, attempt: int):
+        self.ensure_started()
+        self.job, self.params, self.attempt = job, params, attempt
+        self.started = time.time()
+        self.peak_rss = 0.0
+        self.conn.send((job, params))
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=10)
+        self.process = None
+        self.conn = None
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process = None
+        self.conn = None
+
+    @property
+    def busy(self) -> bool:
+        return self.job is not None
+
+
+class WorkerSupervisor:
+    """
+    Memory budgeted execution of (config, audio) jobs.
+    --------------------------------------------------
+    Every job runs in a worker process whose resident memory is
+    polled against `memory_limit_mb`. A worker that exceeds the
+    ceiling, crashes or is OOM-killed is restarted and the job is
+    retried with degraded params (smaller batch sizes, then fewer
+    threads). Jobs that still fail after `max_retries` are reported
+    as failed and the sweep goes on.
+
+    With an autotune `layout` (see Autotuner.load_layout) the worker
+    count and cpu_threads follow the best layout measured for the
+    compute_type of each config.
+    """
+
+    # seconds a worker that closed its pipe gets to exit before it is killed
+    EOF_GRACE_SECONDS = 5.0
+
+    def __init__(self,
+                num_workers: int = 1,
+                memory_limit_mb: Optional[float] = None,
+                max_retries: int = 2,
+                poll_interval: float = 0.5,
+                layout: Optional[dict] = None,
+                cache_dir: Optional[str] = None):
+
+        self.num_workers = max(1, int(num_workers))
+        self.memory_limit_mb = memory_limit_mb
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self.layout = layout
+        self.cache_dir = str(cache_dir) if cache_dir else None
+
+        self.ctx = mp.get_context("spawn")
+        self.slots = [_WorkerSlot(self.ctx, self.cache_dir) for _ in range(self.num_workers)]
+
+        if memory_limit_mb and psutil is None and not Path("/proc").exists():
+            logger.warning("psutil not installed: memory limit cannot be enforced")
+
+    # ---------- PUBLIC API ----------
+
+    def run_config(self, cfg_id: str, params: dict, jobs: List[Dict]) -> Iterator[dict]:
+        """
+        Runs all jobs of one config, yields one outcome dict per job
+        as soon as it finishes (not in submission order):
+            {"job", "status": "done"/"failed", "processing_time",
+             "peak_rss_mb", "attempts", "error", "params", "cache_events"}
+        """
+        from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+        effective = WhisperXConfigurator().configure(params)
+        effective = self._apply_layout(effective)
+        pending = deque((job, effective, 1) for job in jobs)
+
+        try:
+            yield from self._drain(cfg_id, pending)
+        finally:
+            # consumer stopped early (e.g. early stop): drop unfinished jobs
+            for slot in self.slots:
+                if slot.busy:
+                    slot.kill()
+                    slot.job = None
+
+    def close(self):
+        for slot in self.slots:
+            slot.stop()
+
+    # ---------- HELPERS ----------
+
+    def _apply_layout(self, config: dict) -> dict:
+        """
+        Take workers / cpu_threads from the autotuned layout of this
+        config's compute_type (explicit cpu_threads in the config win).
+        """
+        if not self.layout:
+            return config
+
+        best = self.layout.get("best_per_compute_type", {}).get(
+            config.get("compute_type"), self.layout.get("best"))
+        if not best:
+            return config
+
+        config = dict(config)
+        config.setdefault("cpu_threads", best["cpu_threads"])
+        self._resize(best["workers"])
+        return config
+
+    def _resize(self, num_workers: int):
+        num_workers = max(1, int(num_workers))
+        while len(self.slots) > num_workers:
+            self.slots.pop().stop()
+        while len(self.slots) < num_workers:
+            self.slots.append(_WorkerSlot(self.ctx, self.cache_dir))
+        self.num_workers = num_workers
+
+    def _drain(self, cfg_id: str, pending: deque) -> Iterator[dict]:
+        while pending or any(s.busy for s in self.slots):
+
+            for slot in self.slots:
+                if not slot.busy and pending:
+                    job, job_params, attempt = pending.popleft()
+                    slot.submit(job, job_params, attempt)
+
+            busy = [s for s in self.slots if s.busy]
+            waitables = []
+            for s in busy:
+                waitables.extend([s.conn, s.process.sentinel])
+            ready = wait(waitables, timeout=self.poll_interval)
+
+            for slot in busy:
+                outcome = self._check_slot(slot, ready)
+                if outcome is None:
+                    continue
+
+                if outcome["status"] == "retry":
+                    retry = degrade_params(slot.params)
+                    if retry is not None and slot.attempt <= self.max_retries:
+                        logger.warning(
+                            "%s | %s failed (%s), retry %d with %s",
+                            cfg_id, slot.job["audio_id"], outcome["reason"],
+                            slot.attempt, self._diff(slot.params, retry)
+                        )
+                        pending.appendleft((slot.job, retry, slot.attempt + 1))
+                        slot.job = None
+                        continue
+                    outcome["status"] = "failed"
+
+                outcome.update({
+                    "job": slot.job,
+                    "attempts": slot.attempt,
+                    "params": slot.params,
+                    "peak_rss_mb": slot.peak_rss or None,
+                })
+                slot.job = None
+                yield outcome
+
+    def _check_slot(self, slot: _WorkerSlot, ready) -> Optional[dict]:
+        """
+        Returns an outcome dict when the slot's job finished / died,
+        None while it is still running.
+        """
+        if slot.conn in ready:
+            try:
+                msg = slot.conn.recv()
+            except (EOFError, OSError):
+                # pipe closed: the worker is on its way out (or wedged);
+                # give it a moment to exit, then never poll the dead pipe again
+                if slot.process is not None:
+                    slot.process.join(self.EOF_GRACE_SECONDS)
+                return self._crashed(slot)
+
+            if msg["ok"]:
+                self._sample_rss(slot)
+                # the worker's own high water mark catches peaks between polls
+                slot.peak_rss = max(slot.peak_rss, msg.get("peak_rss_mb") or 0.0)
+                return {"status": "done",
+                        "processing_time": msg["processing_time"],
+                        "cache_events": msg.get("cache_events", []),
+                        "error": None}
+            if msg.get("oom"):
+                slot.kill()
+                return {"status": "retry", "reason": "MemoryError", "error": msg["error"],
+                        "processing_time": None}
+            # a python exception is not a memory problem: do not retry
+            return {"status": "failed", "processing_time": None, "error": msg["error"]}
+
+        if slot.process is None or not slot.process.is_alive():
+            return self._crashed(slot)
+
+        rss = self._sample_rss(slot)
+        if self.memory_limit_mb and rss is not None and rss > self.memory_limit_mb:
+            slot.kill()
+            reason = f"RSS {rss:.0f} MB > limit {self.memory_limit_mb:.0f} MB"
+            return {"status": "retry", "reason": reason, "error": reason,
+                    "processing_time": None}
+
+        return None
+
+    @staticmethod
+    def _crashed(slot: _WorkerSlot) -> dict:
+        exitcode = slot.process.exitcode if slot.process is not None else None
+        slot.kill()
+        reason = "OOM-killed" if exitcode == _SIGKILL_EXIT else f"crashed (exit {exitcode})"
+        return {"status": "retry", "reason": reason, "error": f"worker {reason}",
+                "processing_time": None}
+
+    @staticmethod
+    def _sample_rss(slot: _WorkerSlot) -> Optional[float]:
+        if slot.process is None:
+            return None
+        rss = rss_mb(slot.process.pid)
+        if rss is not None:
+            slot.peak_rss = max(slot.peak_rss, rss)
+        return rss
+
+    @staticmethod
+    def _diff(old: dict, new: dict) -> dict:
+        return {k: v for k, v in new.items() if old.get(k) != v}
@@ -1,4 +1,7 @@
+from copy import copy
+
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
 from pathlib import Path
 
 
@@ -18,6 +21,7 @@ class ExcelWriter:
 
         self.wb = load_workbook(self.excel_path)
         self.ws = self.wb.active
+        self._ensure_overall_column("cpWER", after="WER")
 
 
     # --------------------------
@@ -27,6 +31,7 @@ class ExcelWriter:
     def _find_config_row(self, config_id: str) -> int:
         """
         Find row where config_id exists in column A
+        (configs generated from a sweep spec get a new row at the end)
         """
 
         for row in range(3, self.ws.max_row + 1):
@@ -34,7 +39,64 @@ class ExcelWriter:
             if val == config_id:
                 return row
 
-        raise ValueError(f"Config ID '{config_id}' not found in sheet")
+        row = max(3, self.ws.max_row + 1)
+        self.ws.cell(row=row, column=1).value = config_id
+        return row
+
+
+    def _overall_columns(self) -> dict:
+        """
+        Row2 header -> column of the OVERALL block
+        (everything left of the first audio block)
+        """
+
+        columns = {}
+        for col in range(2, self.ws.max_column + 1):
+            if self.ws.cell(row=1, column=col).value not in (None, "OVERALL"):
+                break
+            header = self.ws.cell(row=2, column=col).value
+            if header is not None:
+                columns[header] = col
+        return columns
+
+
+    def _ensure_overall_column(self, header: str, after: str):
+        """
+        Adds an OVERALL column right of `after` to sheets made
+        before it existed; audio blocks shift one column right
+        """
+
+        columns = self._overall_columns()
+        if header in columns:
+            return
+
+        col = columns[after] + 1
+        merged = [r.bounds for r in self.ws.merged_cells.ranges]
+        for min_col, min_row, max_col, max_row in merged:
+            self.ws.unmerge_cells(start_row=min_row, start_column=min_col,
+                                  end_row=max_row, end_column=max_col)
+        self.ws.insert_cols(col)
+
+        for min_col, min_row, max_col, max_row in merged:
+            self.ws.merge_cells(start_row=min_row,
+                                start_column=min_col + (min_col >= col),
+                                end_row=max_row,
+                                end_column=max_col + (max_col >= col))
+
+        source = self.ws.cell(row=2, column=col - 1)
+        cell = self.ws.cell(row=2, column=col)
+        cell.value = header
+        cell.font = copy(source.font)
+        cell.alignment = copy(source.alignment)
+        cell.border = copy(source.border)
+        self.ws.column_dimensions[get_column_letter(col)].width = \
+            self.ws.column_dimensions[get_column_letter(col - 1)].width
+
+
+    def _write_overall(self, row: int, values: dict):
+        columns = self._overall_columns()
+        for header, value in values.items():
+            self.ws.cell(row=row, column=columns[header]).value = value
 
 
     def _find_audio_block_start(self, audio_id: str) -> int:
@@ -81,16 +143,38 @@ class ExcelWriter:
                             config_id: str,
                             wer: float,
                             der: float,
-                            rtf: float):
+                            rtf: float,
+                            cpwer: float = None):
         """
-        Writes overall dataset scores in columns:
-        B=WER  C=DER  D=RTF
+        Writes overall dataset scores in the OVERALL columns:
+        WER  cpWER  DER  RTF
         """
 
         row = self._find_config_row(config_id)
+        self._write_overall(row, {"WER": wer, "cpWER": cpwer, "DER": der, "RTF": rtf})
+
+        self.wb.save(self.excel_path)
+
+
+    def write_config_results(self,
+                            config_id: str,
+                            audio_rows: list,
+                            overall: tuple):
+        """
+        Writes every audio block of one config plus its overall
+        scores with a single save.
+        audio_rows = [(audio_id, wer, der, rtf), ...]
+        overall    = (wer, der, rtf, cpwer)
+        """
+
+        row = self._find_config_row(config_id)
+
+        for audio_id, wer, der, rtf in audio_rows:
+            col = self._find_audio_block_start(audio_id)
+            self.ws.cell(row=row, column=col + 0).value = wer
+            self.ws.cell(row=row, column=col + 1).value = der
+            self.ws.cell(row=row, column=col + 2).value = rtf
 
-        self.ws.cell(row=row, column=2).value = wer
-        self.ws.cell(row=row, column=3).value = der
-        self.ws.cell(row=row, column=4).value = rtf
+        self._write_overall(row, dict(zip(("WER", "DER", "RTF", "cpWER"), overall)))
 
         self.wb.save(self.excel_path)
@@ -0,0 +1,407 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+class ResultsStore:
+    """
+    SQLite store for per (config, audio) job results.
+    -------------------------------------------------
+    One row = one job of one sweep. Keeps the job status
+    (running / done / failed), the per audio scores and the
+    additive error counts, so a sweep can be resumed and
+    overall scores can be rebuilt without rescoring.
+
+    The Excel sheet stays the human facing output; this store
+    is the machine readable record of what actually ran.
+    """
+
+    JOB_COLUMNS = {
+        "status": "TEXT",
+        "attempts": "INTEGER",
+        "error": "TEXT",
+        "wer": "REAL",
+        "der": "REAL",
+        "rtf": "REAL",
+        "processing_time": "REAL",
+        "audio_duration": "REAL",
+        "peak_rss_mb": "REAL",
+        "substitutions": "INTEGER",
+        "deletions": "INTEGER",
+        "insertions": "INTEGER",
+        "ref_words": "INTEGER",
+        "cpwer": "REAL",
+        "cp_substitutions": "INTEGER",
+        "cp_deletions": "INTEGER",
+        "cp_insertions": "INTEGER",
+        "missed": "REAL",
+        "false_alarm": "REAL",
+        "confusion": "REAL",
+        "total_speech": "REAL",
+        "params": "TEXT",
+        "subset_id": "TEXT",
+        "alias_of": "TEXT",
+        "updated_at": "REAL",
+    }
+
+    # per reference utterance DER attribution, see save_segment_errors()
+    SEGMENT_COLUMNS = {
+        "utt_id": "TEXT NOT NULL",
+        "speaker": "TEXT",
+        "start": "REAL",
+        "end_time": "REAL",
+        "duration": "REAL",
+        "missed": "REAL",
+        "false_alarm": "REAL",
+        "confusion": "REAL",
+        "emotion": "TEXT",
+        "agreement": "REAL",
+        "activation": "REAL",
+        "valence": "REAL",
+        "dominance": "REAL",
+    }
+
+    # what segment_error_summary() may group by
+    SEGMENT_GROUPS = ("config_id", "audio_id", "speaker", "emotion",
+                      "activation", "valence", "dominance")
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    # --------------------------
+    # HELPERS
+    # --------------------------
+
+    @contextmanager
+    def _connect(self):
+        """
+        One connection per call: committed on success, rolled back on
+        error and always closed (sqlite3's own `with conn` never closes)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        columns = ",\n".join(f"{name} {kind}" for name, kind in self.JOB_COLUMNS.items())
+
+        with self._connect() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    sweep_id TEXT NOT NULL,
+                    config_id TEXT NOT NULL,
+                    audio_id TEXT NOT NULL,
+                    {columns},
+                    PRIMARY KEY (sweep_id, config_id, audio_id)
+                )
+            """)
+            self._ensure_columns(conn, "jobs", self.JOB_COLUMNS)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS alignments (
+                    sweep_id TEXT NOT NULL,
+                    config_id TEXT NOT NULL,
+                    audio_id TEXT NOT NULL,
+                    ops BLOB,
+                    ref_idx BLOB,
+                    hyp_idx BLOB,
+                    ref_tokens TEXT,
+                    hyp_tokens TEXT,
+                    ref_speakers BLOB,
+                    speaker_names TEXT,
+                    PRIMARY KEY (sweep_id, config_id, audio_id)
+                )
+            """)
+            segment_columns = ",\n".join(f"{name} {kind}"
+                                           for name, kind in self.SEGMENT_COLUMNS.items())
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS segment_errors (
+                    sweep_id TEXT NOT NULL,
+                    config_id TEXT NOT NULL,
+                    audio_id TEXT NOT NULL,
+                    {segment_columns},
+                    PRIMARY KEY (sweep_id, config_id, audio_id, utt_id)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS segment_errors_emotion
+                ON segment_errors (sweep_id, emotion)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS subsets (
+                    subset_id TEXT PRIMARY KEY,
+                    audio_ids TEXT NOT NULL,
+                    minutes REAL,
+                    spec TEXT,
+                    created_at REAL
+                )
+            """)
+
+    @staticmethod
+    def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+        """
+        Add columns introduced after the table was first created
+        """
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, kind in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+
+    def _upsert(self, sweep_id: str, config_id: str, audio_id: str, values: dict):
+        unknown = set(values) - set(self.JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job columns: {sorted(unknown)}")
+
+        values = dict(values, updated_at=time.time())
+        names = ", ".join(values)
+        marks = ", ".join("?" for _ in values)
+        updates = ", ".join(f"{k}=excluded.{k}" for k in values)
+
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                INSERT INTO jobs (sweep_id, config_id, audio_id, {names})
+                VALUES (?, ?, ?, {marks})
+                ON CONFLICT (sweep_id, config_id, audio_id) DO UPDATE SET {updates}
+                """,
+                (sweep_id, config_id, audio_id, *values.values())
+            )
+
+    # --------------------------
+    # PUBLIC API
+    # --------------------------
+
+    def mark_running(self, sweep_id: str, config_id: str, audio_id: str, attempts: int = 1):
+        self._upsert(sweep_id, config_id, audio_id,
+                     {"status": "running", "attempts": attempts, "error": None})
+
+    def mark_done(self, sweep_id: str, config_id: str, audio_id: str, **metrics):
+        self._upsert(sweep_id, config_id, audio_id,
+                     dict(metrics, status="done", error=None))
+
+    def mark_failed(self, sweep_id: str, config_id: str, audio_id: str,
+                    error: str, attempts: int = 1, **extra):
+        self._upsert(sweep_id, config_id, audio_id,
+                     dict(extra, status="failed", error=error, attempts=attempts))
+
+    def get_job(self, sweep_id: str, config_id: str, audio_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE sweep_id=? AND config_id=? AND audio_id=?",
+                (sweep_id, config_id, audio_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_jobs(self,
+                sweep_id: Optional[str] = None,
+                config_id: Optional[str] = None,
+                status: Optional[str] = None) -> List[dict]:
+        """
+        Returns job rows filtered by any of sweep / config / status
+        """
+        where, args = [], []
+        for column, value in (("sweep_id", sweep_id),
+                              ("config_id", config_id),
+                              ("status", status)):
+            if value is not None:
+                where.append(f"{column}=?")
+                args.append(value)
+
+        sql = "SELECT * FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY sweep_id, config_id, audio_id"
+
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, args)]
+
+    def copy_jobs(self, sweep_id: str, source_config: str, target_config: str) -> int:
+        """
+        Copies the job rows of one config to another config id with the
+        same effective config (see ConfigPlanner); alias_of = source.
+        Returns the number of rows copied.
+        """
+        rows = self.get_jobs(sweep_id, source_config)
+        for row in rows:
+            values = {k: row[k] for k in self.JOB_COLUMNS if k != "updated_at"}
+            values["alias_of"] = source_config
+            self._upsert(sweep_id, target_config, row["audio_id"], values)
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO alignments
+                   SELECT sweep_id, ?, audio_id, ops, ref_idx, hyp_idx, ref_tokens,
+                          hyp_tokens, ref_speakers, speaker_names
+                   FROM alignments WHERE sweep_id=? AND config_id=?""",
+                (target_config, sweep_id, source_config)
+            )
+            columns = ", ".join(self.SEGMENT_COLUMNS)
+            conn.execute(
+                f"""INSERT OR REPLACE INTO segment_errors
+                    SELECT sweep_id, ?, audio_id, {columns}
+                    FROM segment_errors WHERE sweep_id=? AND config_id=?""",
+                (target_config, sweep_id, source_config)
+            )
+        return len(rows)
+
+    def save_alignment(self, sweep_id: str, config_id: str, audio_id: str,
+                       alignment, ref_tokens: List[str], hyp_tokens: List[str],
+                       ref_speakers=None):
+        """
+        Word alignment of one job (analyser.wer.wer_alignment.WordAlignment);
+        ref_speakers = (speaker code per ref token, speaker names) or None
+        """
+        ops, ref_idx, hyp_idx = alignment.to_bytes()
+        codes, names = ref_speakers if ref_speakers is not None else (None, None)
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO alignments
+                   (sweep_id, config_id, audio_id, ops, ref_idx, hyp_idx,
+                    ref_tokens, hyp_tokens, ref_speakers, speaker_names)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (sweep_id, config_id, audio_id, ops, ref_idx, hyp_idx,
+                 json.dumps(ref_tokens), json.dumps(hyp_tokens),
+                 codes.astype("int32").tobytes() if codes is not None else None,
+                 json.dumps(names) if names is not None else None)
+            )
+
+    def get_alignments(self,
+                       sweep_id: Optional[str] = None,
+                       config_id: Optional[str] = None,
+                       audio_id: Optional[str] = None) -> List[dict]:
+        where, args = [], []
+        for column, value in (("sweep_id", sweep_id),
+                              ("config_id", config_id),
+                              ("audio_id", audio_id)):
+            if value is not None:
+                where.append(f"{column}=?")
+                args.append(value)
+
+        sql = "SELECT * FROM alignments"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY sweep_id, config_id, audio_id"
+
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, args)]
+
+    def save_segment_errors(self, sweep_id: str, config_id: str, audio_id: str,
+                            rows: List[dict]):
+        """
+        Replaces the per utterance error rows of one job; each row holds
+        the SEGMENT_COLUMNS (missing keys are NULL)
+        """
+        names = list(self.SEGMENT_COLUMNS)
+        values = [(sweep_id, config_id, audio_id, *(row.get(n) for n in names)) for row in rows]
+
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM segment_errors WHERE sweep_id=? AND config_id=? AND audio_id=?",
+                (sweep_id, config_id, audio_id)
+            )
+            conn.executemany(
+                f"""INSERT INTO segment_errors (sweep_id, config_id, audio_id, {", ".join(names)})
+                    VALUES ({", ".join("?" for _ in range(len(names) + 3))})""",
+                values
+            )
+
+    def segment_error_summary(self,
+                              sweep_id: Optional[str] = None,
+                              config_id: Optional[str] = None,
+                              by: Sequence[str] = ("config_id", "emotion")) -> List[dict]:
+        """
+        Error seconds and DER share per group of utterances, e.g. by
+        config and emotion: {<by...>, "segments", "duration", "missed",
+        "false_alarm", "confusion", "der"}
+        """
+        unknown = set(by) - set(self.SEGMENT_GROUPS)
+        if unknown:
+            raise ValueError(f"Cannot group segment errors by {sorted(unknown)}")
+
+        where, args = [], []
+        for column, value in (("sweep_id", sweep_id), ("config_id", config_id)):
+            if value is not None:
+                where.append(f"{column}=?")
+                args.append(value)
+
+        groups = ", ".join(by)
+        sql = f"""
+            SELECT {groups + "," if by else ""}
+                   COUNT(*) AS segments,
+                   SUM(duration) AS duration,
+                   SUM(missed) AS missed,
+                   SUM(false_alarm) AS false_alarm,
+                   SUM(confusion) AS confusion,
+                   (SUM(missed) + SUM(false_alarm) + SUM(confusion)) / NULLIF(SUM(duration), 0) AS der
+            FROM segment_errors
+            {"WHERE " + " AND ".join(where) if where else ""}
+            {"GROUP BY " + groups + " ORDER BY " + groups if by else ""}
+        """
+
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, args)]
+
+    def config_summary(self,
+                       sweep_id: Optional[str] = None,
+                       config_id: Optional[str] = None) -> List[dict]:
+        """
+        Overall scores per (sweep, config) pooled over the done jobs,
+        the same way OverallAccumulator does it: {"sweep_id",
+        "config_id", "audios", "wer", "cpwer", "der", "rtf"}.
+        cpWER only counts the jobs that have cp counts.
+        """
+        where, args = ["status='done'"], []
+        for column, value in (("sweep_id", sweep_id), ("config_id", config_id)):
+            if value is not None:
+                where.append(f"{column}=?")
+                args.append(value)
+
+        sql = f"""
+            SELECT sweep_id, config_id,
+                   COUNT(*) AS audios,
+                   SUM(substitutions + deletions + insertions) * 1.0
+                       / NULLIF(SUM(ref_words), 0) AS wer,
+                   SUM(cp_substitutions + cp_deletions + cp_insertions) * 1.0
+                       / NULLIF(SUM(CASE WHEN cp_substitutions IS NOT NULL THEN ref_words END), 0) AS cpwer,
+                   (SUM(missed) + SUM(false_alarm) + SUM(confusion))
+                       / NULLIF(SUM(total_speech), 0) AS der,
+                   SUM(processing_time) / NULLIF(SUM(audio_duration), 0) AS rtf
+            FROM jobs
+            WHERE {" AND ".join(where)}
+            GROUP BY sweep_id, config_id
+            ORDER BY sweep_id, config_id
+        """
+
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, args)]
+
+    def save_subset(self, subset: dict):
+        """
+        Records a DatasetManager.select_subset() result (same id = same dialogs)
+        """
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR IGNORE INTO subsets (subset_id, audio_ids, minutes, spec, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (subset["subset_id"], json.dumps(subset["audio_ids"]), subset["minutes"],
+                 json.dumps(subset["spec"], sort_keys=True), time.time())
+            )
+
+    def get_subset(self, subset_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM subsets WHERE subset_id=?", (subset_id,)).fetchone()
+        if row is None:
+            return None
+        subset = dict(row)
+        subset["audio_ids"] = json.loads(subset["audio_ids"])
+        subset["spec"] = json.loads(subset["spec"]) if subset["spec"] else {}
+        return subset
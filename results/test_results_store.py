@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+
+from results.results_store import ResultsStore
+
+
+def _done(store, config_id, audio_id, **counts):
+    values = dict(attempts=1, wer=0.1, der=0.2, rtf=0.5, processing_time=5.0, audio_duration=10.0,
+                  substitutions=1, deletions=2, insertions=3, ref_words=60,
+                  missed=1.0, false_alarm=0.5, confusion=0.5, total_speech=10.0)
+    values.update(counts)
+    store.mark_done("s", config_id, audio_id, **values)
+
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    store = ResultsStore(tmp_path / "results.sqlite")
+    _done(store, "c", "a")
+    store.get_jobs("s")
+
+    assert opened
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue
+        raise AssertionError("connection left open")
+
+
+def test_mark_done_round_trip_and_copy(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    _done(store, "c", "a1")
+    _done(store, "c", "a2", substitutions=4)
+
+    assert store.copy_jobs("s", "c", "alias") == 2
+    rows = {(r["config_id"], r["audio_id"]): r for r in store.get_jobs("s", status="done")}
+
+    assert rows[("c", "a2")]["substitutions"] == 4
+    assert rows[("alias", "a1")]["alias_of"] == "c"
+    assert rows[("c", "a1")]["alias_of"] is None
+
+
+def test_failed_write_is_rolled_back(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    try:
+        with store._connect() as conn:
+            conn.execute("INSERT INTO jobs (sweep_id, config_id, audio_id, status) VALUES ('s', 'c', 'a', 'done')")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert store.get_jobs("s") == []
+
+
+def test_segment_error_summary_groups_and_replaces(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    rows = [dict(utt_id="u1", speaker="F", duration=2.0, missed=0.5, false_alarm=0.0, confusion=0.5, emotion="Anger"),
+            dict(utt_id="u2", speaker="M", duration=4.0, missed=0.0, false_alarm=1.0, confusion=0.0, emotion="Anger"),
+            dict(utt_id="u3", speaker="F", duration=4.0, missed=0.0, false_alarm=0.0, confusion=0.0)]
+    store.save_segment_errors("s", "c", "a", rows[:1])
+    store.save_segment_errors("s", "c", "a", rows)
+
+    summary = {row["emotion"]: row for row in store.segment_error_summary("s")}
+    assert summary["Anger"]["segments"] == 2
+    assert summary["Anger"]["der"] == 2.0 / 6.0
+    assert summary[None]["der"] == 0.0
+
+    by_speaker = store.segment_error_summary(by=("speaker",))
+    assert [(row["speaker"], row["segments"]) for row in by_speaker] == [("F", 2), ("M", 1)]
+    assert store.segment_error_summary(by=())[0]["der"] == 0.2
+
+    with pytest.raises(ValueError):
+        store.segment_error_summary(by=("utt_id",))
+
+
+def test_config_summary_pools_counts_per_config(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    _done(store, "c", "a1", cp_substitutions=6, cp_deletions=0, cp_insertions=0)
+    _done(store, "c", "a2", ref_words=40)
+    store.mark_failed("s", "c", "a3", error="boom")
+
+    (summary,) = store.config_summary("s")
+    assert summary["audios"] == 2
+    assert summary["wer"] == pytest.approx(12 / 100)
+    # a2 has no cp counts, only a1 enters cpWER
+    assert summary["cpwer"] == pytest.approx(6 / 60)
+    assert summary["der"] == pytest.approx(0.2)
+    assert summary["rtf"] == pytest.approx(0.5)
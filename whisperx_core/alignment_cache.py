@@ -0,0 +1,187 @@
+# whisperx_core/alignment_cache.py
+"""
+Alignment split in two stages:
+    1. acoustic stage : wav2vec2 CTC emissions of the whole waveform
+                        (expensive), persisted per audio on disk
+    2. forced alignment : whisperx's trellis / backtrack over the
+                          emission frames of every segment (cheap)
+"""
+import logging
+from types import SimpleNamespace
+from typing import List, Optional
+
+import numpy as np
+
+from whisperx_core.diarization_cache import StageCache, audio_hash
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+class CachedAlignModel:
+    """
+    Stands in for the wav2vec2 model passed to whisperx.align.
+    ----------------------------------------------------------
+    prepare() loads (or computes once) the emissions of the whole
+    waveform. whisperx.align then calls this object with each segment's
+    waveform; the call is matched to the segment's sample range
+    [f1, f2) by length and content (not by call order, so segments
+    whisperx skips cost nothing) and its frames are read from the
+    cached emissions instead of running the network again.
+
+    A per segment pass has its frames at f1 + k * HOP, the cached ones
+    sit at multiples of HOP: the frames are linearly interpolated at
+    the segment's sub-hop offset so word times are not shifted.
+
+    Emissions are computed in WINDOW-second blocks with CONTEXT seconds
+    of audio on both sides, so attention never spans a whole dialog.
+    Calls that match no segment (e.g. the padded < 400 samples case)
+    fall back to the real model and leave the other segments cached.
+    """
+
+    WINDOW = 20.0
+    CONTEXT = 2.0
+
+    # wav2vec2 feature extractor: 400 samples receptive field, 320 hop
+    RECEPTIVE_FIELD = 400
+    HOP = 320
+
+    def __init__(self, align_model, metadata: dict, cache: StageCache, device: str = "cpu"):
+        self.align_model = align_model
+        self.metadata = metadata
+        self.cache = cache
+        self.device = device
+        self.last_hit = None
+
+        self.emissions = None
+        self._audio = None
+        self._ranges = {}
+        self._served = set()
+
+    def __getattr__(self, name):
+        if name == "align_model":
+            raise AttributeError(name)
+        return getattr(self.align_model, name)
+
+    # ---------- PUBLIC API ----------
+
+    def prepare(self, audio_path, audio: np.ndarray, segments: List[dict]):
+        """
+        Emissions of `audio` from cache when possible, plus the sample
+        ranges whisperx.align may request
+        """
+        params = {
+            "align_model": type(self.align_model).__name__,
+            "language": self.metadata.get("language"),
+            "vocab": len(self.metadata.get("dictionary", {})),
+            "window": self.WINDOW,
+            "context": self.CONTEXT,
+        }
+        key = self.cache.make_key(audio_hash(audio_path), params)
+
+        stage = self.cache.load(key)
+        self.last_hit = stage is not None
+        if stage is None:
+            logger.debug("Emission cache miss: %s", audio_path)
+            stage = {"emissions": self._compute(audio)}
+            self.cache.save(key, stage)
+        else:
+            logger.debug("Emission cache hit: %s", audio_path)
+
+        self.emissions = stage["emissions"]
+        self._index(audio, segments)
+
+    def __call__(self, waveform, lengths=None):
+        import torch
+
+        emission = self._lookup(waveform.detach().cpu().numpy().reshape(-1)) if lengths is None else None
+        if emission is None:
+            return self.align_model(waveform, lengths=lengths) \
+                if self.metadata.get("type") == "torchaudio" else self.align_model(waveform)
+
+        emission = torch.from_numpy(np.array(emission))[None].to(waveform.device)
+        if self.metadata.get("type") == "torchaudio":
+            return emission, None
+        return SimpleNamespace(logits=emission)
+
+    # ---------- HELPERS ----------
+
+    def _num_frames(self, num_samples: int) -> int:
+        return max(0, (num_samples - self.RECEPTIVE_FIELD) // self.HOP + 1)
+
+    def _index(self, audio: np.ndarray, segments: List[dict]):
+        """
+        Sample ranges of the segments as whisperx.align cuts them
+        (audio[:, f1:f2]), grouped by length
+        """
+        self._audio = np.asarray(audio).reshape(-1)
+        self._ranges = {}
+        self._served = set()
+        for segment in segments:
+            f1 = int(segment["start"] * SAMPLE_RATE)
+            f2 = min(int(segment["end"] * SAMPLE_RATE), len(self._audio))
+            if f2 > f1:
+                self._ranges.setdefault(f2 - f1, []).append(f1)
+
+    def _lookup(self, samples: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Cached frames of the segment whose samples these are; segments
+        with identical audio are served in order
+        """
+        matches = [f1 for f1 in self._ranges.get(len(samples), [])
+                   if np.array_equal(self._audio[f1:f1 + len(samples)], samples)]
+        if not matches:
+            return None
+
+        f1 = next((f for f in matches if f not in self._served), matches[0])
+        self._served.add(f1)
+        return self._frames_at(f1, len(samples))
+
+    def _frames_at(self, f1: int, num_samples: int) -> Optional[np.ndarray]:
+        """
+        Frames a pass over audio[f1:f1 + num_samples] would give,
+        interpolated between the cached frames around each position
+        """
+        first, offset = divmod(f1, self.HOP)
+        count = self._num_frames(num_samples)
+        stop = first + count + (1 if offset else 0)
+        if stop > self.emissions.shape[0]:
+            return None
+
+        frames = self.emissions[first:first + count]
+        if not offset:
+            return frames
+        alpha = offset / self.HOP
+        return ((1 - alpha) * frames + alpha * self.emissions[first + 1:stop]).astype(np.float32)
+
+    def _forward(self, chunk: np.ndarray) -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            x = torch.from_numpy(np.ascontiguousarray(chunk, dtype=np.float32))[None].to(self.device)
+            if self.metadata.get("type") == "torchaudio":
+                out, _ = self.align_model(x)
+            else:
+                out = self.align_model(x).logits
+        return out[0].cpu().numpy().astype(np.float32)
+
+    def _compute(self, audio: np.ndarray) -> np.ndarray:
+        # window and context are whole hops, so block frames line up globally
+        hop = self.HOP
+        window = int(self.WINDOW * SAMPLE_RATE) // hop * hop
+        context = int(self.CONTEXT * SAMPLE_RATE) // hop * hop
+        total = self._num_frames(len(audio))
+
+        blocks = []
+        for core in range(0, max(len(audio), 1), window):
+            a = max(0, core - context)
+            b = min(len(audio), core + window + context)
+            frames = self._forward(audio[a:b])
+
+            first = (core - a) // hop
+            last = min(first + window // hop, frames.shape[0], total - a // hop)
+            blocks.append(frames[first:last])
+
+        emissions = np.concatenate(blocks, axis=0) if blocks else np.zeros((0, 0), np.float32)
+        return emissions[:total]
@@ -0,0 +1,221 @@
+# whisperx_core/config_applier.py
+import dataclasses
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigApplier:
+    """
+    Maps WhisperXConfigurator keys onto the loaded models.
+    -----------------------------------------------------
+    Keys fall in three groups:
+        -> LOAD_KEYS     : change the weights / backend, need a new load
+        -> runtime keys  : updated in place on an already loaded runner
+                           (ASR options, VAD thresholds, diarization
+                           hyper-parameters, diarization call arguments)
+        -> UNSUPPORTED   : no counterpart in the installed whisperx /
+                           pyannote versions, logged once and ignored
+                           (ConfigPlanner collapses rows that only
+                           differ in them, SweepSpec rejects them as axes)
+    vad_min_duration_on / off only exist on CachedVAD (whisperx's own
+    Binarize rejects min_duration_off together with chunking); a non
+    zero value without the VAD cache is an error.
+    """
+
+    LOAD_KEYS = ("whisper_model", "compute_type", "cpu_threads")
+
+    # faster-whisper TranscriptionOptions fields
+    ASR_OPTIONS = {"beam_size": "beam_size"}
+
+    # FasterWhisperPipeline._vad_params keys
+    VAD_PARAMS = {"vad_onset": "vad_onset", "vad_offset": "vad_offset"}
+
+    # CachedVAD attributes (only when the VAD cache is enabled)
+    VAD_PROXY_PARAMS = {
+        "vad_onset": "onset",
+        "vad_offset": "offset",
+        "vad_min_duration_on": "min_duration_on",
+        "vad_min_duration_off": "min_duration_off",
+    }
+
+    # pyannote SpeakerDiarization hyper-parameters (sub pipeline, name)
+    DIARIZATION_PARAMS = {
+        "Clustering_threshold": ("clustering", "threshold"),
+        "clustering_min_cluster_size": ("clustering", "min_cluster_size"),
+    }
+
+    # plain attributes of the pyannote SpeakerDiarization pipeline
+    DIARIZATION_ATTRS = {
+        "embedding_exclude_overlap": "embedding_exclude_overlap",
+        "embedding_batch_size": "embedding_batch_size",
+        "segmentation_batch_size": "segmentation_batch_size",
+    }
+
+    # arguments of DiarizationPipeline.__call__
+    DIARIZATION_CALL = {"max_num_speakers": "max_speakers"}
+
+    UNSUPPORTED = ("seg_stich_threshold",)
+
+    # supported through CachedVAD only
+    VAD_PROXY_ONLY = ("vad_min_duration_on", "vad_min_duration_off")
+
+    INT_KEYS = ("beam_size", "clustering_min_cluster_size", "max_num_speakers",
+                "embedding_batch_size", "segmentation_batch_size", "cpu_threads")
+    BOOL_KEYS = ("embedding_exclude_overlap",)
+
+    _warned = set()
+
+    # ---------- PUBLIC API ----------
+
+    @classmethod
+    def normalize(cls, config: dict) -> dict:
+        """
+        Excel gives 5.0 / 1.0 / "2": cast to the types the models expect
+        """
+        config = dict(config)
+
+        for key in cls.INT_KEYS:
+            if config.get(key) is not None:
+                config[key] = int(float(config[key]))
+        for key in cls.BOOL_KEYS:
+            if config.get(key) is not None:
+                value = config[key]
+                if isinstance(value, str):
+                    value = value.strip().lower() in ("1", "true", "yes")
+                config[key] = bool(value)
+
+        if config.get("beam_size") is not None and config["beam_size"] < 1:
+            logger.warning("beam_size=%s is invalid for CTranslate2, using 1 (greedy)",
+                           config["beam_size"])
+            config["beam_size"] = 1
+
+        return config
+
+    @classmethod
+    def load_key(cls, config: dict) -> tuple:
+        """
+        Runners with the same load key can be reused for a config
+        """
+        config = cls.normalize(config)
+        return tuple(config.get(k) for k in cls.LOAD_KEYS)
+
+    @classmethod
+    def load_options(cls, config: dict) -> dict:
+        """
+        Extra whisperx.load_model kwargs so the first load already
+        uses the config's ASR / VAD options
+        """
+        config = cls.normalize(config)
+
+        asr_options = {opt: config[key] for key, opt in cls.ASR_OPTIONS.items()
+                       if config.get(key) is not None}
+        vad_options = {opt: config[key] for key, opt in cls.VAD_PARAMS.items()
+                       if config.get(key) is not None}
+
+        options = {}
+        if asr_options:
+            options["asr_options"] = asr_options
+        if vad_options:
+            options["vad_options"] = vad_options
+        return options
+
+    @classmethod
+    def apply(cls, runner, config: dict) -> dict:
+        """
+        Applies every runtime key of `config` to a loaded runner in place.
+        Returns {key: value} of what was applied.
+        """
+        config = cls.normalize(config)
+        applied = {}
+
+        applied.update(cls._apply_asr(runner.model, config))
+        applied.update(cls._apply_vad(runner.model, config))
+        applied.update(cls._apply_diarization(runner.diarize_model, config))
+
+        runner.diarize_kwargs = {
+            arg: config[key] for key, arg in cls.DIARIZATION_CALL.items()
+            if config.get(key) is not None
+        }
+        applied.update({k: config[k] for k in cls.DIARIZATION_CALL if k in config})
+
+        for key in cls.UNSUPPORTED:
+            if key in config and key not in cls._warned:
+                logger.warning("'%s' has no counterpart in this whisperx/pyannote "
+                               "version and is ignored", key)
+                cls._warned.add(key)
+
+        logger.debug("Applied runtime config: %s", applied)
+        return applied
+
+    # ---------- HELPERS ----------
+
+    @classmethod
+    def _apply_asr(cls, model, config: dict) -> dict:
+        updates = {opt: config[key] for key, opt in cls.ASR_OPTIONS.items()
+                   if config.get(key) is not None}
+        if not updates or model is None:
+            return {}
+
+        options = model.options
+        if hasattr(options, "_replace"):               # NamedTuple (older faster-whisper)
+            model.options = options._replace(**updates)
+        else:                                          # dataclass
+            model.options = dataclasses.replace(options, **updates)
+
+        return {k: config[k] for k in cls.ASR_OPTIONS if config.get(k) is not None}
+
+    @classmethod
+    def _apply_vad(cls, model, config: dict) -> dict:
+        vad_params = getattr(model, "_vad_params", None)
+        if vad_params is None:
+            return {}
+
+        applied = {}
+        for key, name in cls.VAD_PARAMS.items():
+            if config.get(key) is not None:
+                vad_params[name] = float(config[key])
+                applied[key] = config[key]
+
+        proxy = getattr(model, "vad_model", None)
+        if hasattr(proxy, "min_duration_on"):
+            for key, attr in cls.VAD_PROXY_PARAMS.items():
+                if config.get(key) is not None:
+                    setattr(proxy, attr, float(config[key]))
+                    applied[key] = config[key]
+        else:
+            # 0 = whisperx's own behaviour, anything else cannot be honoured
+            requested = [key for key in cls.VAD_PROXY_ONLY if config.get(key)]
+            if requested:
+                raise ValueError(f"{requested} need the VAD cache (cache_dir): "
+                                 "whisperx's own VAD has no min duration options")
+        return applied
+
+    @classmethod
+    def _apply_diarization(cls, diarize_model, config: dict) -> dict:
+        pipeline = getattr(diarize_model, "model", None)
+        if pipeline is None:
+            return {}
+
+        applied = {}
+
+        # hyper-parameters: re-instantiate with the merged values
+        params = pipeline.parameters(instantiated=True)
+        changed = False
+        for key, (sub, name) in cls.DIARIZATION_PARAMS.items():
+            if config.get(key) is None:
+                continue
+            value = config[key]
+            if params.setdefault(sub, {}).get(name) != value:
+                params[sub][name] = value
+                changed = True
+            applied[key] = value
+        if changed:
+            pipeline.instantiate(params)
+
+        for key, attr in cls.DIARIZATION_ATTRS.items():
+            if config.get(key) is not None:
+                setattr(pipeline, attr, config[key])
+                applied[key] = config[key]
+
+        return applied
@@ -0,0 +1,280 @@
+# whisperx_core/diarization_cache.py
+"""
+Diarization split in two stages:
+    1. neural stage  : segmentation + speaker embeddings (expensive),
+                       persisted per audio on disk
+    2. cluster stage : clustering + reconstruction + speaker labels
+                       (cheap), rerun for every config
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+_hash_memo = {}
+
+
+def audio_hash(audio_path) -> str:
+    """
+    sha1 of the audio file content (memoised on path + size + mtime)
+    """
+    path = Path(audio_path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime)
+
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+
+    return _hash_memo[memo_key]
+
+
+class StageCache:
+    """
+    On-disk store of one expensive per-audio stage.
+    ----------------------------------------------
+    One directory per key, holding the stage's arrays as .npy files
+    (opened memory-mapped) and its other values in a meta.json.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(audio_digest: str, params: dict) -> str:
+        raw = json.dumps({"audio": audio_digest, **params}, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        folder = self.cache_dir / key
+        meta_path = folder / "meta.json"
+        if not meta_path.exists():
+            return None
+
+        stage = json.loads(meta_path.read_text(encoding="utf-8"))
+        for path in folder.glob("*.npy"):
+            stage[path.stem] = np.load(path, mmap_mode="r")
+        return stage
+
+    def save(self, key: str, stage: dict):
+        folder = self.cache_dir / key
+        if folder.exists():
+            return
+
+        # build in a temp dir and rename, so readers never see half an entry
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir))
+        try:
+            meta = {}
+            for name, value in stage.items():
+                if isinstance(value, np.ndarray):
+                    np.save(tmp / f"{name}.npy", value)
+                else:
+                    meta[name] = value
+            (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp, folder)
+        except OSError:
+            # another worker stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class EmbeddingCache(StageCache):
+    """
+    StageCache of the neural diarization stage:
+        segmentations.npy : (chunks, frames, local_speakers)
+        embeddings.npy    : (chunks, local_speakers, dim)
+        count.npy         : (frames, 1) instantaneous speaker count
+    """
+
+
+class CachedDiarizer:
+    """
+    Drop-in replacement for calling whisperx's DiarizationPipeline.
+    ---------------------------------------------------------------
+    Segmentation outputs and speaker embeddings are looked up in the
+    EmbeddingCache (key = audio hash + segmentation / embedding params),
+    so configs that only change clustering params or max_num_speakers
+    only pay for clustering and speaker assignment.
+    """
+
+    # pipeline attributes that change the neural stage output
+    STAGE_PARAMS = ("embedding_exclude_overlap", "embedding_batch_size", "segmentation_batch_size")
+
+    def __init__(self, diarize_model, cache: Optional[EmbeddingCache]):
+        self.diarize_model = diarize_model
+        self.pipeline = diarize_model.model
+        self.cache = cache
+        self.last_hit = None
+
+    # ---------- PUBLIC API ----------
+
+    def __call__(self, audio_path, audio: Optional[np.ndarray] = None,
+                num_speakers=None, min_speakers=None, max_speakers=None):
+        """
+        Same output as DiarizationPipeline.__call__: a DataFrame with
+        segment / label / speaker / start / end columns
+        """
+        stage = self.neural_stage(audio_path, audio)
+        if np.nanmax(np.asarray(stage["count"])) == 0.0:
+            # no speaker is ever active
+            return self.empty_result()
+
+        num_speakers, min_speakers, max_speakers = self.pipeline.set_num_speakers(
+            num_speakers=num_speakers, min_speakers=min_speakers, max_speakers=max_speakers
+        )
+        hard_clusters = self.cluster(stage, num_speakers, min_speakers, max_speakers)
+        return self.to_dataframe(stage, hard_clusters, max_speakers, uri=Path(audio_path).stem)
+
+    @staticmethod
+    def empty_result():
+        """
+        Diarization of an audio where no speaker is ever active
+        """
+        import pandas as pd
+        return pd.DataFrame(columns=["segment", "label", "speaker", "start", "end"])
+
+    def segmentations(self, stage: dict):
+        """
+        Segmentation output of a neural stage as a SlidingWindowFeature,
+        what pipeline.clustering / reconstruct expect
+        """
+        return self._feature(stage, "segmentations")
+
+    def stage_params(self) -> dict:
+        params = {name: getattr(self.pipeline, name, None) for name in self.STAGE_PARAMS}
+        params["segmentation_model"] = str(getattr(self.pipeline, "segmentation_model", ""))
+        params["embedding_model"] = str(getattr(self.pipeline, "embedding", ""))
+        return params
+
+    def neural_stage(self, audio_path, audio: Optional[np.ndarray] = None) -> dict:
+        """
+        Segmentation + embeddings of one audio, from cache when possible
+        """
+        if self.cache is None:
+            self.last_hit = None
+            return self._compute_stage(audio_path, audio)
+
+        key = self.cache.make_key(audio_hash(audio_path), self.stage_params())
+
+        stage = self.cache.load(key)
+        self.last_hit = stage is not None
+        if stage is not None:
+            logger.debug("Embedding cache hit: %s", audio_path)
+            return stage
+
+        logger.debug("Embedding cache miss: %s", audio_path)
+        stage = self._compute_stage(audio_path, audio)
+        self.cache.save(key, stage)
+        return stage
+
+    def cluster(self, stage: dict, num_speakers, min_speakers, max_speakers) -> np.ndarray:
+        """
+        Hard cluster of every (chunk, local speaker), -2 = inactive
+        """
+        segmentations = self.segmentations(stage)
+        embeddings = np.asarray(stage["embeddings"])
+
+        hard_clusters, _, _ = self.pipeline.clustering(
+            embeddings=embeddings,
+            segmentations=segmentations,
+            num_clusters=num_speakers,
+            min_clusters=min_speakers,
+            max_clusters=max_speakers,
+            frames=self.pipeline._segmentation.model.receptive_field,
+        )
+        return self.mark_inactive(stage, hard_clusters)
+
+    @staticmethod
+    def mark_inactive(stage: dict, hard_clusters: np.ndarray) -> np.ndarray:
+        inactive = np.sum(np.asarray(stage["segmentations"]), axis=1) == 0
+        hard_clusters = np.array(hard_clusters)
+        hard_clusters[inactive] = -2
+        return hard_clusters
+
+    def to_dataframe(self, stage: dict, hard_clusters: np.ndarray, max_speakers, uri: str = None):
+        """
+        Reconstruct the diarization and format it like whisperx does
+        """
+        import pandas as pd
+
+        segmentations = self.segmentations(stage)
+        count = self._feature(stage, "count")
+        count.data = np.minimum(count.data, max_speakers).astype(np.int8)
+
+        if np.nanmax(count.data) == 0.0:
+            return self.empty_result()
+
+        discrete = self.pipeline.reconstruct(segmentations, hard_clusters, count)
+        diarization = self.pipeline.to_annotation(
+            discrete,
+            min_duration_on=0.0,
+            min_duration_off=self.pipeline.segmentation.min_duration_off,
+        )
+        diarization.uri = uri
+
+        mapping = {label: expected for label, expected
+                   in zip(diarization.labels(), self.pipeline.classes())}
+        diarization = diarization.rename_labels(mapping=mapping)
+
+        df = pd.DataFrame(diarization.itertracks(yield_label=True),
+                          columns=["segment", "label", "speaker"])
+        df["start"] = df["segment"].apply(lambda x: x.start)
+        df["end"] = df["segment"].apply(lambda x: x.end)
+        return df
+
+    # ---------- HELPERS ----------
+
+    def _compute_stage(self, audio_path, audio: Optional[np.ndarray]) -> dict:
+        import torch
+        import whisperx
+
+        if audio is None:
+            audio = whisperx.load_audio(str(audio_path))
+
+        file = {
+            "waveform": torch.from_numpy(audio[None, :]),
+            "sample_rate": SAMPLE_RATE,
+            "uri": Path(audio_path).stem,
+        }
+        pipeline = self.pipeline
+
+        segmentations = pipeline.get_segmentations(file)
+        count = pipeline.speaker_count(
+            segmentations, pipeline._segmentation.model.receptive_field, warm_up=(0.0, 0.0)
+        )
+        embeddings = pipeline.get_embeddings(
+            file, segmentations, exclude_overlap=pipeline.embedding_exclude_overlap
+        )
+
+        stage = {
+            "segmentations": np.asarray(segmentations.data, dtype=np.float32),
+            "embeddings": np.asarray(embeddings, dtype=np.float32),
+            "count": np.asarray(count.data),
+        }
+        for name, feature in (("segmentations", segmentations), ("count", count)):
+            sw = feature.sliding_window
+            stage[f"{name}_window"] = [sw.start, sw.duration, sw.step]
+        return stage
+
+    @staticmethod
+    def _feature(stage: dict, name: str):
+        from pyannote.core import SlidingWindow, SlidingWindowFeature
+
+        start, duration, step = stage[f"{name}_window"]
+        return SlidingWindowFeature(
+            np.array(stage[name]),
+            SlidingWindow(start=start, duration=duration, step=step),
+        )
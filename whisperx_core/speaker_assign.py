@@ -0,0 +1,189 @@
+# whisperx_core/speaker_assign.py
+"""
+Word / segment to speaker assignment as an interval join on sorted
+arrays. Drop-in replacement of whisperx.assign_word_speakers.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TurnIndex:
+    """
+    Diarization turns sorted by start, for overlap queries.
+    -------------------------------------------------------
+    A query [qs, qe) can only overlap turns with start < qe
+    (searchsorted on starts). For the lower bound the turns are split
+    at the LONG_QUANTILE duration:
+
+        short turns  start > qs - longest short turn
+        long turns   running max of ends > qs
+
+    so a query looks at the short turns around it plus the long turns
+    still open at qs. Worst case (every long turn spans the whole
+    dialog) that is O(queries x long turns), long turns being the
+    longest (1 - LONG_QUANTILE) of the table; one long early turn no
+    longer makes every later query scan all turns after it.
+
+    Per (query, speaker) the overlaps are summed in the diarization
+    table's row order with compensated summation, like pandas'
+    groupby().sum(), and the winner is the largest sum, ties going to
+    the first speaker label in sorted order. Labels are therefore the
+    same as whisperx's.
+    """
+
+    LONG_QUANTILE = 0.9
+
+    def __init__(self, starts, ends, speakers):
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+
+        order = np.argsort(starts, kind="stable")
+        self.rows = order
+        self.starts = starts[order]
+        self.ends = ends[order]
+
+        self.names, codes = np.unique(np.asarray(speakers, dtype=object).astype(str),
+                                      return_inverse=True)
+        self.codes = codes[order]
+
+        # positions (into the sorted table) of the short and long turns
+        durations = self.ends - self.starts
+        cut = np.quantile(durations, self.LONG_QUANTILE) if len(order) else 0.0
+        self.short = np.flatnonzero(durations <= cut)
+        self.long = np.flatnonzero(durations > cut)
+        self.max_short = float(durations[self.short].max()) if len(self.short) else 0.0
+        self.long_reach = np.maximum.accumulate(self.ends[self.long]) if len(self.long) else self.ends[:0]
+
+    @classmethod
+    def from_dataframe(cls, diarize_df) -> "TurnIndex":
+        return cls(diarize_df["start"].to_numpy(), diarize_df["end"].to_numpy(),
+                   diarize_df["speaker"].to_numpy())
+
+    # ---------- PUBLIC API ----------
+
+    def assign(self, q_start, q_end) -> np.ndarray:
+        """
+        Speaker code of every query (-1 = no overlapping turn)
+        """
+        q_start = np.asarray(q_start, dtype=np.float64)
+        q_end = np.asarray(q_end, dtype=np.float64)
+        num_queries = len(q_start)
+        result = np.full(num_queries, -1, dtype=np.int64)
+        if num_queries == 0 or len(self.starts) == 0:
+            return result
+
+        query, turn = self._candidates(q_start, q_end)
+        if len(query) == 0:
+            return result
+
+        overlap = np.minimum(self.ends[turn], q_end[query]) - np.maximum(self.starts[turn], q_start[query])
+        hit = overlap > 0
+        query, turn, overlap = query[hit], turn[hit], overlap[hit]
+        if len(query) == 0:
+            return result
+
+        speaker = self.codes[turn]
+        sums_query, sums_speaker, sums = self._group_sums(query, speaker, self.rows[turn], overlap)
+
+        # largest sum first, ties -> smallest speaker code
+        best = np.lexsort((sums_speaker, -sums, sums_query))
+        first = np.concatenate(([True], sums_query[best][1:] != sums_query[best][:-1]))
+        result[sums_query[best][first]] = sums_speaker[best][first]
+        return result
+
+    def labels(self, codes: np.ndarray) -> list:
+        return [str(self.names[c]) if c >= 0 else None for c in codes]
+
+    # ---------- HELPERS ----------
+
+    def _candidates(self, q_start, q_end):
+        """
+        (query, turn) pairs that may overlap, turn = position in the
+        sorted table
+        """
+        short_starts = self.starts[self.short]
+        long_starts = self.starts[self.long]
+
+        queries, turns = [], []
+        for part, lo, hi in (
+            (self.short,
+             np.searchsorted(short_starts, q_start - self.max_short, side="right"),
+             np.searchsorted(short_starts, q_end, side="left")),
+            (self.long,
+             np.searchsorted(self.long_reach, q_start, side="right"),
+             np.searchsorted(long_starts, q_end, side="left")),
+        ):
+            counts = np.maximum(hi - lo, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            query = np.repeat(np.arange(len(q_start)), counts)
+            offsets = np.cumsum(counts) - counts
+            queries.append(query)
+            turns.append(part[lo[query] + (np.arange(total) - offsets[query])])
+
+        if not queries:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return np.concatenate(queries), np.concatenate(turns)
+
+    @staticmethod
+    def _group_sums(query, speaker, row, values):
+        """
+        Kahan sums per (query, speaker), adding values in row order
+        """
+        order = np.lexsort((row, speaker, query))
+        query, speaker, values = query[order], speaker[order], values[order]
+
+        new_group = np.concatenate(([True], (query[1:] != query[:-1]) | (speaker[1:] != speaker[:-1])))
+        group = np.cumsum(new_group) - 1
+        starts = np.flatnonzero(new_group)
+        rank = np.arange(len(values)) - starts[group]
+
+        sums = np.zeros(len(starts))
+        compensation = np.zeros(len(starts))
+        for r in range(int(rank.max()) + 1):
+            level = rank == r
+            g, v = group[level], values[level]
+            y = v - compensation[g]
+            t = sums[g] + y
+            compensation[g] = t - sums[g] - y
+            sums[g] = t
+
+        return query[starts], speaker[starts], sums
+
+
+def assign_word_speakers(diarize_df, transcript_result, speaker_embeddings=None, fill_nearest=False):
+    """
+    Same contract as whisperx.assign_word_speakers: sets "speaker" on
+    every segment and timed word that overlaps a diarization turn.
+    """
+    if fill_nearest:
+        import whisperx
+        return whisperx.assign_word_speakers(diarize_df, transcript_result,
+                                             speaker_embeddings, fill_nearest=True)
+
+    segments = transcript_result["segments"]
+
+    targets, starts, ends = [], [], []
+    for seg in segments:
+        targets.append(seg)
+        starts.append(seg["start"])
+        ends.append(seg["end"])
+        for word in seg.get("words", []):
+            if "start" in word:
+                targets.append(word)
+                starts.append(word["start"])
+                ends.append(word["end"])
+
+    if len(diarize_df) and targets:
+        index = TurnIndex.from_dataframe(diarize_df)
+        for target, label in zip(targets, index.labels(index.assign(starts, ends))):
+            if label is not None:
+                target["speaker"] = label
+
+    if speaker_embeddings is not None:
+        transcript_result["speaker_embeddings"] = speaker_embeddings
+    return transcript_result
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from whisperx_core.alignment_cache import SAMPLE_RATE, CachedAlignModel
+
+XX_DIALOG = "Ses03F_impro06"
+
+# cached vs per segment word times: wav2vec2 frames are 20 ms, the
+# cached frames see other context and are interpolated at the segment
+# offset, so allow one frame for most words and a few frames for all
+WORD_TOLERANCE = 0.02
+WORD_TOLERANCE_SHARE = 0.95
+WORD_TOLERANCE_MAX = 0.1
+
+
+def _model(audio, segments):
+    """
+    Cache over emissions that encode their own sample position
+    (frame i = i * HOP), so every lookup can be checked exactly
+    """
+    model = CachedAlignModel(None, {}, cache=None)
+    model.emissions = (np.arange(len(audio) // model.HOP, dtype=np.float32) * model.HOP)[:, None]
+    model._index(audio, segments)
+    return model
+
+
+def _expected(model, f1, num_samples):
+    return (f1 + model.HOP * np.arange(model._num_frames(num_samples)))[:, None]
+
+
+@pytest.fixture
+def audio():
+    return np.random.default_rng(0).standard_normal(10 * SAMPLE_RATE).astype(np.float32)
+
+
+def test_lookup_by_range_not_order(audio):
+    segments = [{"start": 0.5, "end": 1.5}, {"start": 2.0, "end": 3.0}, {"start": 4.0, "end": 6.0}]
+    model = _model(audio, segments)
+
+    # first segment skipped by whisperx, then called out of order
+    for start, end in ((4.0, 6.0), (2.0, 3.0)):
+        f1, f2 = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        np.testing.assert_allclose(model._lookup(audio[f1:f2]), _expected(model, f1, f2 - f1))
+
+
+def test_unknown_call_does_not_consume_the_others(audio):
+    segments = [{"start": 1.0, "end": 2.0}, {"start": 3.0, "end": 4.0}]
+    model = _model(audio, segments)
+
+    # the padded < 400 samples case: no segment has these samples
+    assert model._lookup(np.zeros(400, dtype=np.float32)) is None
+    f1 = 3 * SAMPLE_RATE
+    np.testing.assert_allclose(model._lookup(audio[f1:f1 + SAMPLE_RATE]), _expected(model, f1, SAMPLE_RATE))
+
+
+def test_equal_length_segments_get_their_own_frames(audio):
+    # same length; whisperx skips the first one
+    segments = [{"start": 1.0, "end": 2.0}, {"start": 5.0, "end": 6.0}]
+    model = _model(audio, segments)
+
+    f1 = 5 * SAMPLE_RATE
+    np.testing.assert_allclose(model._lookup(audio[f1:f1 + SAMPLE_RATE]), _expected(model, f1, SAMPLE_RATE))
+
+
+def test_sub_hop_offset_is_interpolated(audio):
+    # 1.0101 s = 16161 samples, 161 samples into a hop
+    segments = [{"start": 1.0101, "end": 2.5}]
+    model = _model(audio, segments)
+
+    f1, f2 = int(1.0101 * SAMPLE_RATE), int(2.5 * SAMPLE_RATE)
+    assert f1 % model.HOP
+    np.testing.assert_allclose(model._lookup(audio[f1:f2]), _expected(model, f1, f2 - f1), rtol=1e-6)
+
+
+def test_cached_alignment_matches_whisperx(dataset_dir, tmp_path):
+    """
+    Word timings of whisperx.align with and without the emission
+    cache on one dialog (needs whisperx and the dialog's wav)
+    """
+    whisperx = pytest.importorskip("whisperx")
+    from whisperx_core.diarization_cache import StageCache
+
+    wav_files = list((dataset_dir / XX_DIALOG).glob("*.wav"))
+    if not wav_files:
+        pytest.skip(f"no wav in {dataset_dir / XX_DIALOG}")
+
+    audio = whisperx.load_audio(str(wav_files[0]))
+    segments = []
+    for line in (dataset_dir / XX_DIALOG / "transcript_norm.txt").read_text(encoding="utf-8").splitlines():
+        parts = line.split("\t")
+        if len(parts) >= 4:
+            segments.append({"start": float(parts[1]), "end": float(parts[2]), "text": parts[-1]})
+
+    align_model, metadata = whisperx.load_align_model(language_code="en", device="cpu")
+    plain = whisperx.align(segments, align_model, metadata, audio, "cpu")["segments"]
+
+    cached_model = CachedAlignModel(align_model, metadata, StageCache(str(tmp_path / "emissions")))
+    cached_model.prepare(wav_files[0], audio, segments)
+    cached = whisperx.align(segments, cached_model, metadata, audio, "cpu")["segments"]
+
+    def word_times(result):
+        return np.array([(w["start"], w["end"]) for s in result for w in s["words"] if "start" in w])
+
+    a, b = word_times(plain), word_times(cached)
+    assert a.shape == b.shape
+    error = np.abs(a - b).ravel()
+    assert np.mean(error <= WORD_TOLERANCE) >= WORD_TOLERANCE_SHARE
+    assert error.max() <= WORD_TOLERANCE_MAX
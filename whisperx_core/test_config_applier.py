@@ -0,0 +1,59 @@
+import dataclasses
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import pytest
+
+from whisperx_core.config_applier import ConfigApplier
+
+
+class _TupleOptions(NamedTuple):
+    beam_size: int = 5
+    patience: float = 1.0
+
+
+@dataclasses.dataclass(frozen=True)
+class _DataclassOptions:
+    beam_size: int = 5
+    patience: float = 1.0
+
+
+def test_normalize_excel_types():
+    config = ConfigApplier.normalize({"beam_size": 0.0, "max_num_speakers": "2",
+                                      "embedding_exclude_overlap": "Yes", "vad_onset": 0.5})
+    assert config == {"beam_size": 1, "max_num_speakers": 2,
+                      "embedding_exclude_overlap": True, "vad_onset": 0.5}
+
+
+def test_load_key_and_options():
+    assert ConfigApplier.load_key({"whisper_model": "small", "cpu_threads": 4.0, "beam_size": 3}) \
+        == ("small", None, 4)
+    assert ConfigApplier.load_options({"beam_size": "3", "vad_onset": 0.6}) \
+        == {"asr_options": {"beam_size": 3}, "vad_options": {"vad_onset": 0.6}}
+
+
+def test_apply_in_place():
+    for options in (_TupleOptions(), _DataclassOptions()):
+        runner = SimpleNamespace(
+            model=SimpleNamespace(options=options, _vad_params={"vad_onset": 0.5, "vad_offset": 0.363}),
+            diarize_model=None,
+        )
+        applied = ConfigApplier.apply(runner, {"beam_size": 2.0, "vad_offset": 0.3,
+                                               "max_num_speakers": 2, "seg_stich_threshold": 1})
+
+        assert runner.model.options.beam_size == 2 and runner.model.options.patience == 1.0
+        assert runner.model._vad_params == {"vad_onset": 0.5, "vad_offset": 0.3}
+        assert runner.diarize_kwargs == {"max_speakers": 2}
+        assert applied == {"beam_size": 2, "vad_offset": 0.3, "max_num_speakers": 2}
+
+
+def test_vad_min_duration_needs_the_vad_cache():
+    runner = SimpleNamespace(
+        model=SimpleNamespace(options=_TupleOptions(), _vad_params={"vad_onset": 0.5}, vad_model=object()),
+        diarize_model=None,
+    )
+    # whisperx's default (0) is what the non cached VAD does anyway
+    ConfigApplier.apply(runner, {"vad_min_duration_on": 0, "vad_min_duration_off": 0})
+
+    with pytest.raises(ValueError, match="VAD cache"):
+        ConfigApplier.apply(runner, {"vad_min_duration_off": 0.2})
@@ -0,0 +1,41 @@
+import numpy as np
+
+from whisperx_core.diarization_cache import CachedDiarizer, StageCache, audio_hash
+
+
+def test_audio_hash_follows_content(tmp_path):
+    a, b = tmp_path / "a.wav", tmp_path / "b.wav"
+    a.write_bytes(b"RIFF1234")
+    b.write_bytes(b"RIFF1234")
+    assert audio_hash(a) == audio_hash(b)
+
+    b.write_bytes(b"RIFF12345")
+    assert audio_hash(a) != audio_hash(b)
+
+
+def test_key_depends_on_audio_and_params():
+    key = StageCache.make_key("abc", {"embedding_batch_size": 32})
+    assert key == StageCache.make_key("abc", {"embedding_batch_size": 32})
+    assert key != StageCache.make_key("abd", {"embedding_batch_size": 32})
+    assert key != StageCache.make_key("abc", {"embedding_batch_size": 16})
+
+
+def test_save_load_round_trip(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    embeddings = np.random.default_rng(0).standard_normal((4, 3, 8)).astype(np.float32)
+
+    assert cache.load("k") is None
+    cache.save("k", {"embeddings": embeddings, "sliding_window": [0.0, 10.0, 1.0]})
+    # a second save of the same key keeps the first entry
+    cache.save("k", {"embeddings": embeddings * 0, "sliding_window": []})
+
+    stage = cache.load("k")
+    np.testing.assert_array_equal(stage["embeddings"], embeddings)
+    assert stage["sliding_window"] == [0.0, 10.0, 1.0]
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["k"]
+
+
+def test_empty_result_has_the_whisperx_columns():
+    df = CachedDiarizer.empty_result()
+    assert df.empty
+    assert list(df.columns) == ["segment", "label", "speaker", "start", "end"]
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from whisperx_core.speaker_assign import TurnIndex, assign_word_speakers
+
+
+def _whisperx_speaker(diarize_df, start, end):
+    """
+    whisperx.assign_word_speakers' choice for one segment / word
+    """
+    intersection = np.minimum(diarize_df["end"], end) - np.maximum(diarize_df["start"], start)
+    hits = diarize_df[intersection > 0].assign(intersection=intersection[intersection > 0])
+    if len(hits) == 0:
+        return None
+    return hits.groupby("speaker")["intersection"].sum().sort_values(ascending=False).index[0]
+
+
+def _diarization(rng, num_turns, long_first=False):
+    starts = np.sort(rng.uniform(0, 300, num_turns))
+    ends = starts + rng.uniform(0.2, 8.0, num_turns)
+    if long_first:
+        ends[0] = 400.0
+    speakers = rng.choice(["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"], num_turns)
+    return pd.DataFrame({"start": starts, "end": ends, "speaker": speakers}).sample(frac=1, random_state=0)
+
+
+@pytest.mark.parametrize("seed, long_first", [(0, False), (1, True), (2, False), (3, True)])
+def test_matches_whisperx(seed, long_first):
+    rng = np.random.default_rng(seed)
+    diarize_df = _diarization(rng, 120, long_first)
+    q_start = rng.uniform(-5, 310, 500)
+    q_end = q_start + rng.uniform(0.05, 3.0, 500)
+
+    index = TurnIndex.from_dataframe(diarize_df)
+    labels = index.labels(index.assign(q_start, q_end))
+
+    assert labels == [_whisperx_speaker(diarize_df, s, e) for s, e in zip(q_start, q_end)]
+
+
+def test_one_long_turn_does_not_widen_every_query():
+    rng = np.random.default_rng(4)
+    diarize_df = _diarization(rng, 2000, long_first=True)
+    q_start = np.sort(rng.uniform(0, 300, 3000))
+    q_end = q_start + 0.3
+
+    index = TurnIndex.from_dataframe(diarize_df)
+    query, _ = index._candidates(q_start, q_end)
+
+    # local short turns + the long turns open at the query, not all earlier turns
+    assert len(query) < len(q_start) * (len(index.long) + 100)
+    assert len(query) < len(q_start) * len(diarize_df) / 4
+
+
+def test_empty_inputs():
+    index = TurnIndex([], [], [])
+    assert index.assign([1.0], [2.0]).tolist() == [-1]
+    assert TurnIndex([0.0], [1.0], ["A"]).assign([], []).tolist() == []
+
+
+def test_assign_word_speakers_contract():
+    diarize_df = pd.DataFrame({"start": [0.0, 2.0], "end": [2.0, 4.0], "speaker": ["A", "B"]})
+    result = {"segments": [{"start": 0.5, "end": 3.8, "words": [
+        {"word": "hi", "start": 0.5, "end": 1.0},
+        {"word": "there", "start": 2.5, "end": 3.8},
+        {"word": "42"},
+    ]}, {"start": 5.0, "end": 6.0, "words": []}]}
+
+    assign_word_speakers(diarize_df, result)
+
+    segment = result["segments"][0]
+    assert segment["speaker"] == "B"
+    assert [w.get("speaker") for w in segment["words"]] == ["A", "B", None]
+    assert "speaker" not in result["segments"][1]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from scipy.cluster.hierarchy import fcluster
+
+from whisperx_core.threshold_sweep import LinkageSweep, group_by_clustering
+
+
+class _Clustering:
+    """
+    The parts of pyannote's AgglomerativeClustering LinkageSweep reads
+    """
+    metric = "cosine"
+    method = "centroid"
+
+    def filter_embeddings(self, embeddings, segmentations=None):
+        chunks, speakers, _ = embeddings.shape
+        chunk_idx, speaker_idx = np.divmod(np.arange(chunks * speakers), speakers)
+        return embeddings.reshape(chunks * speakers, -1), chunk_idx, speaker_idx
+
+
+def _sweep(seed, num_chunks=40):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((4, 16))
+    labels = rng.integers(0, 4, (num_chunks, 3))
+    embeddings = centers[labels] + 0.4 * rng.standard_normal((num_chunks, 3, 16))
+    return LinkageSweep(_Clustering(), embeddings, segmentations=None)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_flat_cuts_match_fcluster(seed):
+    sweep = _sweep(seed)
+    heights = sweep.dendrogram[:, 2]
+    thresholds = np.concatenate([np.linspace(0, heights.max() * 1.1, 25), heights[::7]])
+
+    cuts = sweep.flat_cuts(thresholds)
+
+    for t in thresholds:
+        expected = fcluster(sweep.dendrogram, t, criterion="distance") - 1
+        np.testing.assert_array_equal(cuts[float(t)], expected)
+
+
+def test_small_clusters_join_the_closest_large_one():
+    sweep = _sweep(3)
+    t = float(np.median(sweep.dendrogram[:, 2]))
+    flat = sweep.flat_cuts([t])[t]
+
+    clusters = sweep._finalise(flat, t, min_cluster_size=5, num_clusters=None, min_clusters=1, max_clusters=50)
+
+    sizes = np.bincount(clusters)
+    assert len(clusters) == sweep.num_train
+    assert sizes.min() >= min(5, round(0.1 * sweep.num_train))
+    assert list(np.unique(clusters)) == list(range(len(sizes)))
+
+
+def test_group_by_clustering_ignores_cluster_keys():
+    configs = [
+        {"config_id": "a", "params": {"Clustering_threshold": 0.6}},
+        {"config_id": "b", "params": {"beam_size": 1}},
+        {"config_id": "c", "params": {"Clustering_threshold": 0.8, "max_num_speakers": 2}},
+    ]
+    assert [[cfg["config_id"] for cfg in group] for group in group_by_clustering(configs)] == [["a", "c"], ["b"]]
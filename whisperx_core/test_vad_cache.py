@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from whisperx_core.vad_cache import VADBinarizer
+
+
+def _loop_hysteresis(scores, onset, offset):
+    """
+    Frame by frame state of whisperx's Binarize
+    """
+    active = np.zeros(len(scores), dtype=bool)
+    state = scores[0] > onset
+    active[0] = state
+    for i in range(1, len(scores)):
+        if state and scores[i] < offset:
+            state = False
+        elif not state and scores[i] > onset:
+            state = True
+        active[i] = state
+    return active
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hysteresis_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    scores = np.clip(np.cumsum(rng.normal(0, 0.08, 2000)) % 1.0, 0, 1)
+    onsets = rng.uniform(0.4, 0.8, 12)
+    offsets = onsets - rng.uniform(0.0, 0.3, 12)
+
+    active = VADBinarizer.hysteresis(scores, onsets, offsets)
+
+    for k in range(12):
+        np.testing.assert_array_equal(active[k], _loop_hysteresis(scores, onsets[k], offsets[k]))
+
+
+def test_min_durations():
+    # frames every 0.1 s: on 1.0-1.5, short gap, on 1.6-2.0, short blip at 3.0
+    binarizer = VADBinarizer(np.arange(50) * 0.1)
+    scores = np.zeros(50)
+    scores[10:15] = scores[16:20] = scores[30] = 1.0
+
+    [regions] = binarizer.regions(scores, [{"onset": 0.5, "offset": 0.5,
+                                             "min_duration_off": 0.2, "min_duration_on": 0.3}])
+    assert regions == [(1.0, 2.0)]
+
+    [regions] = binarizer.regions(scores, [{"onset": 0.5, "offset": 0.5}])
+    assert [(round(a, 1), round(b, 1)) for a, b in regions] == [(1.0, 1.5), (1.6, 2.0), (3.0, 3.1)]
+
+
+def test_max_duration_splits_long_regions():
+    binarizer = VADBinarizer(np.arange(200) * 0.1)
+    scores = np.full(200, 0.9)
+    scores[120] = 0.6          # lowest point in the second half of the first 10 s
+
+    [regions] = binarizer.regions(scores, [{"onset": 0.5, "offset": 0.5}], max_duration=15.0)
+
+    assert len(regions) == 2
+    assert regions[0][1] == regions[1][0] == pytest.approx(12.0)
+    assert all(b - a <= 15.0 for a, b in regions)
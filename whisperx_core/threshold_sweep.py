@@ -0,0 +1,230 @@
+# whisperx_core/threshold_sweep.py
+"""
+One linkage, many cuts.
+
+When configs only differ in clustering params, the agglomerative
+dendrogram of an audio's speaker embeddings is built once and cut at
+every requested threshold in a single sweep over its merges.
+"""
+import logging
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# configs that differ only in these keys share ASR, alignment and embeddings
+CLUSTER_KEYS = ("Clustering_threshold", "clustering_min_cluster_size", "max_num_speakers")
+
+
+def group_by_clustering(configs: List[Dict]) -> List[List[Dict]]:
+    """
+    Groups {"config_id", "params"} entries whose effective configs
+    are equal once CLUSTER_KEYS are ignored (order of first appearance).
+    """
+    from whisperx_core.config_applier import ConfigApplier
+    from whisperx_core.whisperx_configurator import WhisperXConfigurator
+
+    groups = {}
+    for cfg in configs:
+        effective = ConfigApplier.normalize(WhisperXConfigurator().configure(cfg["params"]))
+        shared = tuple(sorted((k, str(v)) for k, v in effective.items() if k not in CLUSTER_KEYS))
+        groups.setdefault(shared, []).append(cfg)
+    return list(groups.values())
+
+
+class LinkageSweep:
+    """
+    Dendrogram of one audio, cut at many thresholds.
+    ------------------------------------------------
+    Mirrors pyannote's AgglomerativeClustering.cluster(): unit-normalised
+    embeddings, centroid linkage, flat cut at `threshold`, small clusters
+    merged into the closest large one, num/min/max cluster constraints.
+    Everything that does not depend on the threshold (filtering,
+    normalisation, linkage, leaf order) is computed once.
+    """
+
+    def __init__(self, clustering, embeddings: np.ndarray, segmentations):
+        from scipy.cluster.hierarchy import fcluster, linkage
+
+        self.clustering = clustering
+        self.embeddings = np.array(embeddings)
+
+        train, self.chunk_idx, self.speaker_idx = clustering.filter_embeddings(
+            self.embeddings, segmentations=segmentations
+        )
+        self.num_train = train.shape[0]
+
+        if clustering.metric == "cosine" and clustering.method in ("centroid", "median", "ward"):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                train = train / np.linalg.norm(train, axis=-1, keepdims=True)
+            metric = "euclidean"
+        else:
+            metric = clustering.metric
+        self.train = train
+        self.metric = clustering.metric
+
+        if self.num_train < 2:
+            self.dendrogram = None
+            return
+
+        self.dendrogram = linkage(train, method=clustering.method, metric=metric)
+
+        # fcluster(criterion="distance") joins a node when the largest merge
+        # height in its subtree is <= t; that value is monotonic up the tree
+        n = self.num_train
+        max_dist = np.empty(n - 1)
+        for i, (a, b, height, _) in enumerate(self.dendrogram):
+            a, b = int(a), int(b)
+            max_dist[i] = max(height,
+                              max_dist[a - n] if a >= n else -np.inf,
+                              max_dist[b - n] if b >= n else -np.inf)
+        self.max_dist = max_dist
+        self.merge_order = np.argsort(max_dist, kind="stable")
+        # fcluster numbers clusters by first appearance in its traversal
+        # order, which is the numbering of an all-singleton cut
+        self.leaf_order = np.argsort(fcluster(self.dendrogram, -1.0, criterion="distance"))
+
+    # ---------- PUBLIC API ----------
+
+    def flat_cuts(self, thresholds: Sequence[float]) -> Dict[float, np.ndarray]:
+        """
+        fcluster(dendrogram, t, "distance") - 1 for every t, in one
+        pass over the merges (union-find, thresholds in ascending order)
+        """
+        n = self.num_train
+        parent = np.arange(2 * n - 1)
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        cuts = {}
+        pos = 0
+        for t in sorted(set(float(t) for t in thresholds)):
+            while pos < n - 1 and self.max_dist[self.merge_order[pos]] <= t:
+                node = self.merge_order[pos]
+                a, b = int(self.dendrogram[node, 0]), int(self.dendrogram[node, 1])
+                parent[find(a)] = n + node
+                parent[find(b)] = n + node
+                pos += 1
+            roots = np.array([find(i) for i in range(n)])
+            cuts[t] = self._renumber(roots)
+        return cuts
+
+    def cut(self, threshold: float, min_cluster_size: int,
+            num_clusters=None, min_clusters=None, max_clusters=None) -> np.ndarray:
+        """
+        Hard clusters (chunks x local speakers) for one clustering config
+        """
+        return self.cut_many([threshold], min_cluster_size,
+                             num_clusters, min_clusters, max_clusters)[float(threshold)]
+
+    def cut_many(self, thresholds: Sequence[float], min_cluster_size: int,
+                num_clusters=None, min_clusters=None, max_clusters=None) -> Dict[float, np.ndarray]:
+        """
+        Hard clusters for every threshold (same min_cluster_size / bounds)
+        """
+        clustering = self.clustering
+        num_clusters, min_clusters, max_clusters = clustering.set_num_clusters(
+            self.num_train, num_clusters=num_clusters,
+            min_clusters=min_clusters, max_clusters=max_clusters
+        )
+
+        if max_clusters < 2 or self.dendrogram is None:
+            num_chunks, num_speakers, _ = self.embeddings.shape
+            single = np.zeros((num_chunks, num_speakers), dtype=np.int8)
+            return {float(t): single.copy() for t in thresholds}
+
+        flats = self.flat_cuts(thresholds)
+        result = {}
+        for t, flat in flats.items():
+            train_clusters = self._finalise(flat, t, int(min_cluster_size),
+                                            num_clusters, min_clusters, max_clusters)
+            hard_clusters, _, _ = clustering.assign_embeddings(
+                self.embeddings, self.chunk_idx, self.speaker_idx, train_clusters,
+                constrained=clustering.constrained_assignment,
+            )
+            result[t] = hard_clusters
+        return result
+
+    # ---------- HELPERS ----------
+
+    def _renumber(self, roots: np.ndarray) -> np.ndarray:
+        labels = np.full(len(roots), -1, dtype=np.int64)
+        mapping = {}
+        for leaf in self.leaf_order:
+            root = roots[leaf]
+            if root not in mapping:
+                mapping[root] = len(mapping)
+            labels[leaf] = mapping[root]
+        return labels
+
+    def _finalise(self, clusters: np.ndarray, threshold: float, min_cluster_size: int,
+                  num_clusters, min_clusters, max_clusters) -> np.ndarray:
+        """
+        Same post-processing as AgglomerativeClustering.cluster()
+        """
+        from scipy.cluster.hierarchy import fcluster
+        from scipy.spatial.distance import cdist
+
+        n = self.num_train
+        min_cluster_size = min(min_cluster_size, max(1, round(0.1 * n)))
+        clusters = np.array(clusters)
+
+        cluster_unique, cluster_counts = np.unique(clusters, return_counts=True)
+        large_clusters = cluster_unique[cluster_counts >= min_cluster_size]
+        num_large_clusters = len(large_clusters)
+
+        if num_large_clusters < min_clusters:
+            num_clusters = min_clusters
+        elif num_large_clusters > max_clusters:
+            num_clusters = max_clusters
+
+        if num_clusters is not None:
+            # rare path: look for the cut giving the expected cluster count
+            _dendrogram = np.copy(self.dendrogram)
+            _dendrogram[:, 2] = np.arange(n - 1)
+            best_iteration = n - 1
+            best_num_large_clusters = 1
+
+            for iteration in np.argsort(np.abs(self.dendrogram[:, 2] - threshold)):
+                if _dendrogram[iteration, 3] < min_cluster_size:
+                    continue
+                clusters = fcluster(_dendrogram, iteration, criterion="distance") - 1
+                cluster_unique, cluster_counts = np.unique(clusters, return_counts=True)
+                large_clusters = cluster_unique[cluster_counts >= min_cluster_size]
+                num_large_clusters = len(large_clusters)
+
+                if abs(num_large_clusters - num_clusters) < abs(best_num_large_clusters - num_clusters):
+                    best_iteration = iteration
+                    best_num_large_clusters = num_large_clusters
+                if num_large_clusters == num_clusters:
+                    break
+
+            if best_num_large_clusters != num_clusters:
+                clusters = fcluster(_dendrogram, best_iteration, criterion="distance") - 1
+                cluster_unique, cluster_counts = np.unique(clusters, return_counts=True)
+                large_clusters = cluster_unique[cluster_counts >= min_cluster_size]
+                num_large_clusters = len(large_clusters)
+
+        if num_large_clusters == 0:
+            clusters[:] = 0
+            return clusters
+
+        small_clusters = cluster_unique[cluster_counts < min_cluster_size]
+        if len(small_clusters) == 0:
+            return clusters
+
+        large_centroids = np.vstack([np.mean(self.train[clusters == k], axis=0) for k in large_clusters])
+        small_centroids = np.vstack([np.mean(self.train[clusters == k], axis=0) for k in small_clusters])
+        centroids_cdist = cdist(large_centroids, small_centroids, metric=self.metric)
+        for small_k, large_k in enumerate(np.argmin(centroids_cdist, axis=0)):
+            clusters[clusters == small_clusters[small_k]] = large_clusters[large_k]
+
+        _, clusters = np.unique(clusters, return_inverse=True)
+        return clusters
@@ -0,0 +1,248 @@
+# whisperx_core/vad_cache.py
+"""
+VAD split in two stages:
+    1. neural stage : frame-level speech probabilities (expensive),
+                      persisted per audio on disk
+    2. binarization : hysteresis thresholds + min durations (cheap),
+                      vectorized over many (onset, offset, min_on, min_off)
+                      combinations at once
+"""
+import hashlib
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from whisperx_core.diarization_cache import StageCache
+
+logger = logging.getLogger(__name__)
+
+
+class VADBinarizer:
+    """
+    Hysteresis binarization of a speech probability curve.
+    ------------------------------------------------------
+    Same rules as whisperx's vad Binarize: a region starts at the first
+    frame above `onset` and ends at the first frame below `offset`
+    (timestamps = frame middles). Gaps shorter than `min_duration_off`
+    are filled, regions shorter than `min_duration_on` dropped and,
+    with a finite `max_duration`, long regions are split at their
+    lowest score in the second half (as whisperx does per chunk).
+
+    A combo is a dict with onset / offset and optional
+    min_duration_on / min_duration_off (seconds).
+    """
+
+    def __init__(self, timestamps: np.ndarray):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    @classmethod
+    def from_window(cls, num_frames: int, window: Sequence[float]) -> "VADBinarizer":
+        start, duration, step = window
+        return cls(start + np.arange(num_frames) * step + duration / 2)
+
+    # ---------- PUBLIC API ----------
+
+    @staticmethod
+    def hysteresis(scores: np.ndarray, onsets, offsets) -> np.ndarray:
+        """
+        (K, frames) bool activity for K (onset, offset) pairs
+        """
+        scores = np.asarray(scores, dtype=np.float64)[None, :]
+        onsets = np.asarray(onsets, dtype=np.float64)[:, None]
+        offsets = np.asarray(offsets, dtype=np.float64)[:, None]
+        num_frames = scores.shape[1]
+
+        # 1 = switches on, 0 = switches off, -1 = keeps the previous state
+        decided = np.where(scores > onsets, 1, np.where(scores < offsets, 0, -1)).astype(np.int8)
+        decided[:, 0] = scores[:, 0] > onsets[:, 0]
+
+        last = np.where(decided >= 0, np.arange(num_frames), 0)
+        np.maximum.accumulate(last, axis=1, out=last)
+        return np.take_along_axis(decided, last, axis=1).astype(bool)
+
+    def masks(self, scores: np.ndarray, combos: List[Dict]) -> np.ndarray:
+        """
+        (K, frames) bool activity after min_duration_off / min_duration_on
+        """
+        active = self.hysteresis(scores,
+                                 [c["onset"] for c in combos],
+                                 [c.get("offset", c["onset"]) for c in combos])
+
+        for k, combo in enumerate(combos):
+            min_off = combo.get("min_duration_off") or 0.0
+            min_on = combo.get("min_duration_on") or 0.0
+            if min_off <= 0.0 and min_on <= 0.0:
+                continue
+
+            starts, ends = self._edges(active[k])
+            starts, ends = self._fill_gaps(starts, ends, min_off)
+            keep = self._times(ends) - self.timestamps[starts] >= min_on
+
+            row = np.zeros(active.shape[1] + 1, dtype=np.int32)
+            np.add.at(row, starts[keep], 1)
+            np.add.at(row, ends[keep], -1)
+            active[k] = np.cumsum(row[:-1]) > 0
+
+        return active
+
+    def regions(self, scores: np.ndarray, combos: List[Dict],
+                max_duration: float = float("inf")) -> List[List[tuple]]:
+        """
+        Speech regions [(start, end), ...] in seconds, one list per combo
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        out = []
+        for mask in self.masks(scores, combos):
+            starts, ends = self._edges(mask)
+            regions = []
+            for a, b in zip(starts, ends):
+                regions.extend(self._split(scores, a, b, max_duration))
+            out.append(regions)
+        return out
+
+    # ---------- HELPERS ----------
+
+    @staticmethod
+    def _edges(mask: np.ndarray):
+        """
+        First active frame / first inactive frame of every region
+        """
+        diff = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        return np.flatnonzero(diff == 1), np.flatnonzero(diff == -1)
+
+    def _times(self, ends: np.ndarray) -> np.ndarray:
+        # a region still active on the last frame ends there
+        return self.timestamps[np.minimum(ends, len(self.timestamps) - 1)]
+
+    def _fill_gaps(self, starts: np.ndarray, ends: np.ndarray, min_off: float):
+        if min_off <= 0.0 or len(starts) < 2:
+            return starts, ends
+        gaps = self.timestamps[starts[1:]] - self._times(ends[:-1])
+        new_region = np.concatenate(([True], gaps >= min_off))
+        first = np.flatnonzero(new_region)
+        last = np.concatenate((first[1:], [len(starts)])) - 1
+        return starts[first], ends[last]
+
+    def _split(self, scores: np.ndarray, a: int, b: int, max_duration: float) -> List[tuple]:
+        ts = self.timestamps
+        end_time = self._times(np.array([b]))[0]
+        if end_time - ts[a] <= max_duration:
+            return [(float(ts[a]), float(end_time))]
+
+        regions = []
+        start = a
+        window = a + 1 if a > 0 else a       # whisperx keeps frame 0 in its window
+        for j in range(a + 1, b):
+            if ts[j] - ts[start] > max_duration and j > window:
+                half = window + (j - window) // 2
+                split = half + int(np.argmin(scores[half:j]))
+                regions.append((float(ts[start]), float(ts[split])))
+                start, window = split, split + 1
+        regions.append((float(ts[start]), float(end_time)))
+        return regions
+
+
+class CachedVAD:
+    """
+    Stands in for FasterWhisperPipeline.vad_model (pyannote VAD).
+    -------------------------------------------------------------
+    Speech probabilities are looked up in a StageCache (key = hash of
+    the waveform), then binarized with the current onset / offset /
+    min durations. The returned SlidingWindowFeature encodes the
+    decision around whisperx's own thresholds (active frames above
+    onset, inactive below offset, original scores kept in between), so
+    whisperx's merge_chunks reproduces exactly these regions and still
+    splits long ones at the lowest score.
+    """
+
+    def __init__(self, vad_model, cache: StageCache):
+        self.vad_model = vad_model
+        self.cache = cache
+        self.last_hit = None
+
+        # set by ConfigApplier (vad_onset / vad_offset live in _vad_params)
+        self.onset = 0.5
+        self.offset = 0.363
+        self.min_duration_on = 0.0
+        self.min_duration_off = 0.0
+
+        self._raw = None
+
+    def __getattr__(self, name):
+        if name == "vad_model":
+            raise AttributeError(name)
+        return getattr(self.vad_model, name)
+
+    def __call__(self, inputs: dict):
+        from pyannote.core import SlidingWindowFeature
+
+        stage = self.stage(inputs)
+        if stage is None:
+            return self._raw
+
+        data = np.asarray(stage["scores"], dtype=np.float32)
+        binarizer = VADBinarizer.from_window(data.shape[0], stage["scores_window"])
+        combo = {"onset": self.onset, "offset": self.offset,
+                 "min_duration_on": self.min_duration_on,
+                 "min_duration_off": self.min_duration_off}
+
+        high = max(self.onset, self.offset) + 1.0
+        low = min(self.onset, self.offset) - 1.0
+        encoded = np.empty_like(data)
+        for c in range(data.shape[1]):
+            active = binarizer.masks(data[:, c], [combo])[0]
+            encoded[:, c] = np.where(active, high + data[:, c], low)
+
+        return SlidingWindowFeature(encoded, self._window(stage))
+
+    def stage(self, inputs: dict) -> Optional[dict]:
+        """
+        Frame scores of one waveform, from cache when possible.
+        None when the wrapped model does not output frame scores.
+        """
+        waveform = inputs["waveform"]
+        waveform = waveform.numpy() if hasattr(waveform, "numpy") else np.asarray(waveform)
+        digest = hashlib.sha1(np.ascontiguousarray(waveform, dtype=np.float32).tobytes()).hexdigest()
+        key = self.cache.make_key(digest, {"vad_model": type(self.vad_model).__name__})
+
+        stage = self.cache.load(key)
+        self.last_hit = stage is not None
+        if stage is not None:
+            logger.debug("VAD cache hit")
+            return stage
+
+        logger.debug("VAD cache miss")
+        scores = self.vad_model(inputs)
+        if not hasattr(scores, "sliding_window"):
+            # e.g. silero returns regions: nothing to cache
+            self.last_hit = None
+            self._raw = scores
+            return None
+
+        sw = scores.sliding_window
+        data = np.asarray(scores.data, dtype=np.float32)
+        stage = {
+            "scores": data.reshape(data.shape[0], -1),
+            "scores_window": [sw.start, sw.duration, sw.step],
+        }
+        self.cache.save(key, stage)
+        return stage
+
+    def regions(self, inputs: dict, combos: List[Dict],
+                max_duration: float = float("inf")) -> List[List[tuple]]:
+        """
+        Speech regions of one waveform for many combos (first score
+        column), without touching the VAD network on a cache hit
+        """
+        stage = self.stage(inputs)
+        data = np.asarray(stage["scores"])
+        binarizer = VADBinarizer.from_window(data.shape[0], stage["scores_window"])
+        return binarizer.regions(data[:, 0], combos, max_duration)
+
+    @staticmethod
+    def _window(stage: dict):
+        from pyannote.core import SlidingWindow
+
+        start, duration, step = stage["scores_window"]
+        return SlidingWindow(start=start, duration=duration, step=step)
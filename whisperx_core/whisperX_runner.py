@@ -2,9 +2,13 @@
 This file includes the main working of python's WhisperX Module
 """
 
+import copy
 import json,os
+import logging
 import os
 import sys
+import time
+import numpy as np
 import torch
 import whisperx
 from whisperx.diarize import DiarizationPipeline
@@ -17,6 +21,13 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --------------------------------------------------------------------------
 
+from whisperx_core.config_applier import ConfigApplier
+from whisperx_core.diarization_cache import CachedDiarizer, EmbeddingCache, StageCache
+from whisperx_core.threshold_sweep import LinkageSweep
+from whisperx_core.vad_cache import CachedVAD
+from whisperx_core.alignment_cache import CachedAlignModel
+from whisperx_core.speaker_assign import assign_word_speakers
+
 # ------------ PyTorch 2.6 workaround: force weights_only=False ------------
 _real_torch_load = torch.load
 
@@ -37,74 +48,300 @@ def torch_load_force_weights_false(*args, **kwargs):
 torch.load = torch_load_force_weights_false
 # -------------------------------------------------------------------------
 
+logger = logging.getLogger(__name__)
+
 class WhisperXRunner:
     """
     Runs whisperX transcription +diarization on Audio files
     """
 
-    def __init__(self,model_name = "medium", device = "cuda"):
+    def __init__(self,model_name = "medium", device = "cuda",
+                compute_type = "int8", cpu_threads = None, cache_dir = None):
         self.model_name = model_name
         self.device = device if torch.cuda.is_available()else "cpu"
+        self.compute_type = compute_type
+        # None = leave CTranslate2 / torch thread pools at their defaults
+        self.cpu_threads = int(cpu_threads) if cpu_threads else None
         self.model = None
         self.alignment_model = None
         self.diarize_model = None
         self.result = None
 
+        # per audio caches of the expensive stages (None = disabled)
+        self.cache_dir = cache_dir
+        self.diarizer = None
+        self.cache_events = []
+
+        # run_threshold_sweep timings: shared stages, own cut per config
+        self.shared_time = 0.0
+        self.sweep_times = {}
+
+        # called with the stage name at each stage start (JobProfiler)
+        self.stage_hook = None
+
+        # per config options (see ConfigApplier)
+        self.config = None
+        self.load_options = {}
+        self.diarize_kwargs = {}
+
+    @classmethod
+    def from_config(cls, config: dict, device = "cuda", cache_dir = None):
+        """
+        Runner for an effective WhisperXConfigurator config.
+        Call load_models(); the runtime keys are applied after loading.
+        """
+        config = ConfigApplier.normalize(config)
+        runner = cls(config["whisper_model"], device=device,
+                     compute_type=config["compute_type"],
+                     cpu_threads=config.get("cpu_threads"),
+                     cache_dir=cache_dir)
+        runner.config = config
+        runner.load_options = ConfigApplier.load_options(config)
+        return runner
+
+    def load_key(self) -> tuple:
+        # requested values, so a compute_type fallback does not count as a change
+        if self.config is not None:
+            return ConfigApplier.load_key(self.config)
+        return ConfigApplier.load_key({
+            "whisper_model": self.model_name,
+            "compute_type": self.compute_type,
+            "cpu_threads": self.cpu_threads,
+        })
+
+    def apply_config(self, config: dict):
+        """
+        Switch a loaded runner to another config without reloading.
+        Only valid when the load keys (model, compute_type, threads) match.
+        """
+        if ConfigApplier.load_key(config) != self.load_key():
+            raise ValueError("Config changes the model weights, a new runner is needed")
+        self.config = ConfigApplier.normalize(config)
+        return ConfigApplier.apply(self, self.config)
+
     def load_models(self):
         """"D:\Datasets\Datasets\IOMOCAP\IEMOCAP_full_release\IEMOCAP_full_release\Session1\dialog\wav\Ses01F_impro01.wav"
         Load the Whisperx Model and Diarization Model
         """
-        print(f"[WhisperX] Loading model {self.model_name} on {self.device}")
-        self.model = whisperx.load_model(self.model_name, self.device, compute_type="int8")
+        logger.info("Loading model %s on %s (%s, threads=%s)",
+                    self.model_name, self.device, self.compute_type, self.cpu_threads)
+
+        load_kwargs = {"compute_type": self.compute_type, **self.load_options}
+        if self.cpu_threads:
+            # CTranslate2 cpu_threads for the whisper model, torch intra-op
+            # threads for alignment (wav2vec2) and diarization (pyannote)
+            load_kwargs["threads"] = self.cpu_threads
+            torch.set_num_threads(self.cpu_threads)
+
+        try:
+            self.model = whisperx.load_model(self.model_name, self.device, **load_kwargs)
+        except ValueError as e:
+            # e.g. float16 requested on a CPU without efficient fp16 support
+            if "compute type" not in str(e):
+                raise
+            logger.warning("%s -> falling back to compute_type=int8", e)
+            self.compute_type = load_kwargs["compute_type"] = "int8"
+            self.model = whisperx.load_model(self.model_name, self.device, **load_kwargs)
 
         self.alignment_model, self.alignment_metadata = whisperx.load_align_model(language_code="en",device=self.device)
 
-        print("[WhisperX] Loading diarization model...")
+        logger.info("Loading diarization model...")
         self.diarize_model = DiarizationPipeline(use_auth_token=None, device=self.device)
 
-    def run(self, audio_path: str):
+        if self.cache_dir is not None:
+            self.diarizer = CachedDiarizer(
+                self.diarize_model,
+                EmbeddingCache(os.path.join(self.cache_dir, "embeddings"))
+            )
+
+            self._wrap_vad()
+            self.alignment_model = CachedAlignModel(
+                self.alignment_model, self.alignment_metadata,
+                StageCache(os.path.join(self.cache_dir, "emissions")), device=self.device
+            )
+
+        if self.config is not None:
+            ConfigApplier.apply(self, self.config)
+
+    def _wrap_vad(self):
         """
-        Execute ASR + Alignment + Diarization
+        Cache the pyannote VAD frame scores per audio. Other VAD
+        backends (silero) return regions and are left untouched.
         """
-        if self.model is None:
-            print("[ERROR] Model not loaded. Call load_models() first.")
-            return None
-        
-        #load audio
-        audio = whisperx.load_audio(audio_path)
+        vad_model = getattr(self.model, "vad_model", None)
+        if type(vad_model).__name__ not in ("Pyannote", "VoiceActivitySegmentation"):
+            return
+
+        proxy = CachedVAD(vad_model, StageCache(os.path.join(self.cache_dir, "vad")))
+        vad_params = getattr(self.model, "_vad_params", {})
+        proxy.onset = vad_params.get("vad_onset", proxy.onset)
+        proxy.offset = vad_params.get("vad_offset", proxy.offset)
+        self.model.vad_model = proxy
 
-        print(f"[WhisperX] Transcribing: {audio_path}")
-        result = self.model.transcribe(audio_path)
+    def _align(self, audio_path, audio, segments):
+        """
+        whisperx.align, over cached wav2vec2 emissions when enabled
+        """
+        if isinstance(self.alignment_model, CachedAlignModel):
+            self.alignment_model.prepare(audio_path, audio, segments)
+            self.cache_events.append(("emissions", self.alignment_model.last_hit))
 
-        print("[WhisperX] Running alignment...")
-        aligned = whisperx.align(result["segments"],
+        aligned = whisperx.align(segments,
             self.alignment_model,
             self.alignment_metadata,
             audio,
             self.device)
+        return aligned["segments"]
+
+    def _record_vad_cache(self):
+        if isinstance(getattr(self.model, "vad_model", None), CachedVAD) \
+                and self.model.vad_model.last_hit is not None:
+            self.cache_events.append(("vad", self.model.vad_model.last_hit))
+
+    def _stage(self, name: str):
+        if self.stage_hook is not None:
+            self.stage_hook(name)
+
+    def run(self, audio_path: str, audio=None):
+        """
+        Execute ASR + Alignment + Diarization
+        (audio = waveform already decoded by whisperx.load_audio)
+        """
+        if self.model is None:
+            logger.error("Model not loaded. Call load_models() first.")
+            return None
         
-        result["segments"] = aligned["segments"]
+        self.cache_events = []
+
+        #load audio
+        if audio is None:
+            self._stage("decode")
+            audio = whisperx.load_audio(audio_path)
 
+        logger.debug("Transcribing: %s", audio_path)
+        self._stage("transcribe")
+        result = self.model.transcribe(audio)
+        self._record_vad_cache()
 
-        print("[WhisperX] Running diarization...")
-        diarize_segments = self.diarize_model(audio_path)
+        logger.debug("Running alignment...")
+        self._stage("align")
+        result["segments"] = self._align(audio_path, audio, result["segments"])
 
-        print("[WhisperX] Assigning diarization to text...")
-        result = whisperx.assign_word_speakers(diarize_segments, result)
+
+        logger.debug("Running diarization...")
+        self._stage("diarize")
+        if self.diarizer is not None:
+            diarize_segments = self.diarizer(audio_path, audio, **self.diarize_kwargs)
+            self.cache_events.append(("embeddings", self.diarizer.last_hit))
+        else:
+            diarize_segments = self.diarize_model(audio_path, **self.diarize_kwargs)
+
+        logger.debug("Assigning diarization to text...")
+        self._stage("assign")
+        result = assign_word_speakers(diarize_segments, result)
 
         self.result = result
-        print("[WhisperX] Processing Completed!")
+        logger.debug("Processing Completed!")
         return result
     
-    def save_result(self,output_folder:str,base_name = "result"):
+    def run_threshold_sweep(self, audio_path: str, configs: dict, audio=None) -> dict:
+        """
+        ASR + alignment + segmentation/embeddings once, then one
+        clustering cut per config. `configs` ({cfg_id: effective config})
+        must only differ in threshold_sweep.CLUSTER_KEYS.
+        Returns {cfg_id: result}.
+        """
+        if self.model is None:
+            logger.error("Model not loaded. Call load_models() first.")
+            return None
+
+        self.apply_config(next(iter(configs.values())))
+        self.cache_events = []
+        start = time.time()
+
+        if audio is None:
+            self._stage("decode")
+            audio = whisperx.load_audio(audio_path)
+
+        logger.debug("Transcribing: %s", audio_path)
+        self._stage("transcribe")
+        base = self.model.transcribe(audio)
+        self._record_vad_cache()
+
+        logger.debug("Running alignment...")
+        self._stage("align")
+        base["segments"] = self._align(audio_path, audio, base["segments"])
+
+        logger.debug("Running segmentation + embeddings...")
+        self._stage("diarize")
+        diarizer = self.diarizer or CachedDiarizer(self.diarize_model, None)
+        stage = diarizer.neural_stage(audio_path, audio)
+        if diarizer.cache is not None:
+            self.cache_events.append(("embeddings", diarizer.last_hit))
+
+        pipeline = diarizer.pipeline
+        sweep = None
+        if np.nanmax(np.asarray(stage["count"])) > 0.0:
+            sweep = LinkageSweep(pipeline.clustering, stage["embeddings"],
+                                 diarizer.segmentations(stage))
+        self.shared_time = time.time() - start
+        self._stage("cluster")
+
+        # cuts sharing min_cluster_size / max speakers come out of one pass
+        buckets = {}
+        for cfg_id, config in configs.items():
+            config = ConfigApplier.normalize(config)
+            bucket = (config.get("clustering_min_cluster_size", pipeline.clustering.min_cluster_size),
+                      config.get("max_num_speakers"))
+            threshold = float(config.get("Clustering_threshold", pipeline.clustering.threshold))
+            buckets.setdefault(bucket, []).append((cfg_id, threshold))
+
+        uri = os.path.splitext(os.path.basename(audio_path))[0]
+        results = {}
+        self.sweep_times = {}
+        for (min_cluster_size, max_num_speakers), members in buckets.items():
+            start = time.time()
+            num_speakers, min_speakers, max_speakers = pipeline.set_num_speakers(
+                max_speakers=max_num_speakers
+            )
+            cuts = {}
+            if sweep is not None:
+                cuts = sweep.cut_many([t for _, t in members], min_cluster_size,
+                                      num_speakers, min_speakers, max_speakers)
+            bucket_time = (time.time() - start) / len(members)
+
+            for cfg_id, threshold in members:
+                start = time.time()
+                if sweep is None:
+                    diarize_segments = diarizer.empty_result()
+                else:
+                    hard_clusters = diarizer.mark_inactive(stage, cuts[threshold])
+                    diarize_segments = diarizer.to_dataframe(
+                        stage, hard_clusters, max_speakers, uri=uri)
+                results[cfg_id] = assign_word_speakers(diarize_segments, copy.deepcopy(base))
+                self.sweep_times[cfg_id] = bucket_time + time.time() - start
+
+        logger.debug("Threshold sweep of %d configs completed", len(results))
+        return results
+
+    def save_result(self,output_folder:str,base_name = "result", debug_json: bool = False):
         if self.result is None:
-            print("[ERROR] No results to save. Run run() first")
+            logger.error("No results to save. Run run() first")
             return False
-        save_path = os.path.join(output_folder,f"{base_name}.json")
-        with open(save_path,"w",encoding = "utf-8") as f:
-            json.dump(self.result,f,ensure_ascii= False,indent = 2)
+        return self.write_result(self.result, output_folder, base_name, debug_json)
+
+    @staticmethod
+    def write_result(result: dict, output_folder: str, base_name = "result",
+                     debug_json: bool = False):
+        """
+        Compact <base_name>.npz (HypothesisFile); debug_json also
+        writes the full result as <base_name>.json
+        """
+        from analyser.utils.hypothesis_file import HypothesisFile
+
+        save_path = HypothesisFile.write(result, output_folder, base_name, debug_json)
 
-        print(f"[WhisperX] Result saved at: {save_path}")
+        logger.debug("Result saved at: %s", save_path)
         return True
     
 